@@ -0,0 +1,86 @@
+"""
+Benchmark da atualização mensal de um livro de contas sintético (sem gravação).
+
+Compara o tempo de:
+    - conta a conta: atualizacao_mensal de cada conta (ignorando as inativas)
+    - em lote:       AtualizacaoMensalController.aplicar, com saldos e tipos em arrays NumPy
+
+e confere que os dois dão exatamente os mesmos saldos e transações.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.bench_atualizacao_mensal --contas 1000000
+"""
+import argparse
+import random
+import time
+
+from controller import atualizacao_mensal_controller
+from controller.atualizacao_mensal_controller import AtualizacaoMensalController
+from model.conta_corrente import ContaCorrente
+from model.conta_poupanca import ContaPoupanca
+from model.exceptions import ContaInativaError
+
+MOMENTO = 1_700_000_000
+
+
+def gerar_livro(quantidade: int, semente: int) -> list:
+    """
+    Gera contas correntes e poupanças com saldos sorteados; uma em cada 20 inativa.
+    """
+    sorteio = random.Random(semente)
+    contas = []
+    for indice in range(quantidade):
+        classe = ContaPoupanca if sorteio.random() < 0.5 else ContaCorrente
+        saldo = round(sorteio.uniform(0, 10 ** 6), 2)
+        contas.append(classe.de_armazenamento(str(1001 + indice), saldo, [], sorteio.random() >= 0.05))
+    return contas
+
+
+def resumo(contas: list) -> list:
+    """
+    Retorna, por conta, o saldo e as transações (tipo e valor em centavos).
+    """
+    return [
+        (conta.get_saldo(), [(t.tipo, t.valor_centavos) for t in conta._historico_pendente])
+        for conta in contas
+    ]
+
+
+def conta_a_conta(contas: list) -> None:
+    for conta in contas:
+        try:
+            conta.atualizacao_mensal()
+        except ContaInativaError:
+            pass
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--contas", type=int, default=1_000_000)
+    parser.add_argument("--semente", type=int, default=2024)
+    args = parser.parse_args()
+
+    if atualizacao_mensal_controller.np is None:
+        print("Aviso: NumPy não instalado; o cálculo em lote será feito conta a conta.")
+
+    contas = gerar_livro(args.contas, args.semente)
+    inicio = time.perf_counter()
+    conta_a_conta(contas)
+    duracao_conta_a_conta = time.perf_counter() - inicio
+    esperado = resumo(contas)
+    del contas
+
+    contas = gerar_livro(args.contas, args.semente)
+    inicio = time.perf_counter()
+    atualizadas, inativas, erros = AtualizacaoMensalController.aplicar(contas, MOMENTO)
+    duracao_lote = time.perf_counter() - inicio
+
+    assert not erros, erros[:5]
+    assert resumo(contas) == esperado, "O cálculo em lote diverge do cálculo conta a conta."
+    print(f"{len(atualizadas)} contas atualizadas, {len(inativas)} inativas ignoradas; resultados idênticos")
+    print(f"{'conta a conta':>14}: {duracao_conta_a_conta:8.2f} s")
+    print(f"{'em lote':>14}: {duracao_lote:8.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark da exportação de extratos longos em CSV e OFX.
+
+Monta o ledger de uma conta com muitas operações (10 milhões, por padrão) e exporta
+o histórico inteiro com ExportadorExtrato, a partir de ContaDAO.iterar_transacoes,
+gravando os trechos em um arquivo. Informa o tempo, a vazão e o pico de memória
+alocada (que deve ficar constante, qualquer que seja o tamanho do histórico).
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.bench_exportacao_extrato --entradas 10000000
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+import tracemalloc
+from unittest.mock import patch
+
+from benchmarks.bench_saldo_em import montar_ledger
+from dao.conta_dao import ContaDAO
+from dao.motores.fabrica_motor import descartar_motores
+from model.conta_corrente import ContaCorrente
+from utils.exportacao_extrato import ExportadorExtrato
+
+
+def exportar(dao: ContaDAO, conta: ContaCorrente, formato: str, caminho: str) -> None:
+    """
+    Exporta o extrato inteiro para `caminho`.
+    """
+    transacoes = dao.iterar_transacoes(conta)
+    if formato == "csv":
+        trechos = ExportadorExtrato.gerar_csv(transacoes)
+    else:
+        trechos = ExportadorExtrato.gerar_ofx(conta.get_numero_conta(), False, transacoes, 0, 0, conta.get_saldo())
+    with open(caminho, "w", encoding="utf-8", newline="") as f:
+        for trecho in trechos:
+            f.write(trecho)
+
+
+def medir(dao: ContaDAO, conta: ContaCorrente, formato: str, caminho: str) -> tuple[float, int]:
+    """
+    Exporta duas vezes: uma medindo o tempo e outra, com tracemalloc (que deixa a
+    execução mais lenta), medindo a memória.
+
+    Returns:
+        tuple[float, int]: (segundos, pico de memória alocada em bytes).
+    """
+    inicio = time.perf_counter()
+    exportar(dao, conta, formato, caminho)
+    duracao = time.perf_counter() - inicio
+
+    tracemalloc.start()
+    exportar(dao, conta, formato, caminho)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return duracao, pico
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entradas", type=int, default=10_000_000)
+    parser.add_argument("--diretorio", default=None,
+                        help="Diretório dos arquivos temporários (use um no disco a ser medido).")
+    args = parser.parse_args()
+
+    diretorio = tempfile.mkdtemp(dir=args.diretorio)
+    try:
+        with patch("dao.dao.DIRETORIO_DATABASE", diretorio):
+            descartar_motores()
+            dao = ContaDAO()
+            inicio = time.perf_counter()
+            tamanho, saldo, _ = montar_ledger(dao._ledger, args.entradas)
+            conta = ContaCorrente.de_armazenamento("1001", saldo / 100, None, True)
+            conta._set_ledger(tamanho, args.entradas)
+            print(f"ledger: {args.entradas} operações, {tamanho / 2 ** 20:.1f} MiB, "
+                  f"montado em {time.perf_counter() - inicio:.1f} s")
+
+            for formato in ("csv", "ofx"):
+                caminho = os.path.join(diretorio, f"extrato.{formato}")
+                duracao, pico = medir(dao, conta, formato, caminho)
+                print(f"{formato:>4}: {duracao:8.1f} s, {args.entradas / duracao:10.0f} transações/s, "
+                      f"{os.path.getsize(caminho) / 2 ** 20:8.1f} MiB gerados, pico de memória {pico / 2 ** 20:.1f} MiB")
+                os.remove(caminho)
+            descartar_motores()
+    finally:
+        shutil.rmtree(diretorio, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Benchmark do fechamento mensal com gravação (AtualizacaoMensalController.executar).
+
+Gera uma base sintética de contas e aplica a atualização mensal sobre cópias dela,
+uma para cada tamanho de lote, informando o tempo e a vazão (contas por segundo).
+Os ledgers de um lote são sincronizados com o disco de uma vez, então o tamanho do
+lote define quantas vezes o diretório dos ledgers é sincronizado.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.bench_fechamento_mensal --contas 20000 --lotes 1 50 500
+"""
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import time
+from unittest.mock import patch
+
+from controller.atualizacao_mensal_controller import AtualizacaoMensalController
+from dao.motores.fabrica_motor import descartar_motores
+from dao.registro_dao import RegistroDAO
+from utils.constantes import ARQUIVO_CONTAS, TIPO_CCORRENTE, TIPO_CPOUPANCA
+
+
+def gerar_base(diretorio: str, quantidade: int) -> None:
+    """
+    Gera contas correntes e poupanças alternadas, todas ativas.
+    """
+    contas = [
+        {"numero": str(100000 + i), "saldo": 1000.0, "historico": [], "ativa": True,
+         "tipo": TIPO_CPOUPANCA if i % 2 else TIPO_CCORRENTE}
+        for i in range(quantidade)
+    ]
+    with open(os.path.join(diretorio, ARQUIVO_CONTAS), "w", encoding="utf-8") as f:
+        json.dump(contas, f)
+
+
+def medir(base: str, tamanho_lote: int) -> dict:
+    """
+    Aplica a atualização mensal a uma cópia da base, medindo a duração.
+    """
+    diretorio = tempfile.mkdtemp(dir=os.path.dirname(base))
+    try:
+        shutil.copytree(base, diretorio, dirs_exist_ok=True)
+        with patch("dao.dao.DIRETORIO_DATABASE", diretorio):
+            RegistroDAO.descartar()
+            descartar_motores()
+            inicio = time.perf_counter()
+            resultado = AtualizacaoMensalController.executar(tamanho_lote=tamanho_lote)
+            resultado["duracao"] = time.perf_counter() - inicio
+            RegistroDAO.descartar()
+            descartar_motores()
+    finally:
+        shutil.rmtree(diretorio, ignore_errors=True)
+    return resultado
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--contas", type=int, default=20_000)
+    parser.add_argument("--lotes", type=int, nargs="+", default=[1, 50, 500])
+    parser.add_argument("--diretorio", default=None,
+                        help="Diretório dos arquivos temporários (use um no disco a ser medido).")
+    args = parser.parse_args()
+
+    base = tempfile.mkdtemp(dir=args.diretorio)
+    try:
+        gerar_base(base, args.contas)
+        print(f"{'lote':>8} | {'tempo (s)':>10} | {'contas/s':>10}")
+        for tamanho_lote in args.lotes:
+            resultado = medir(base, tamanho_lote)
+            assert resultado["sucesso"] and resultado["atualizadas"] == args.contas, resultado["erros"][:5]
+            print(f"{tamanho_lote:>8} | {resultado['duracao']:>10.2f} | {args.contas / resultado['duracao']:>10.0f}")
+    finally:
+        shutil.rmtree(base, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Benchmark da hidratação de clientes em ClienteDAO.listar_todos_objetos.
+
+Compara a hidratação em lote (pessoas e contas carregadas uma vez, junção por
+índice) com o caminho antigo, que reconstruía o dicionário de todas as contas
+para cada cliente. O caminho antigo é quadrático, então é medido sobre uma
+amostra de clientes e extrapolado para o total.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.bench_hidratacao_clientes --tamanhos 10000 100000
+"""
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import time
+from unittest.mock import patch
+
+from dao.cliente_dao import ClienteDAO
+from dao.motores.fabrica_motor import descartar_motores
+from model.cliente import Cliente
+from utils.constantes import ARQUIVO_CLIENTES, ARQUIVO_CONTAS, ARQUIVO_PESSOAS, TIPO_CCORRENTE, TIPO_PFISICA
+
+
+def gerar_base(diretorio: str, quantidade: int) -> None:
+    """
+    Gera pessoas, contas e clientes sintéticos (uma conta corrente por cliente).
+    """
+    pessoas, contas, clientes = [], [], []
+    for i in range(quantidade):
+        documento = f"{i:011d}"
+        numero = str(100000 + i)
+        pessoas.append({
+            "nome": "Cliente Sintetico",
+            "email": f"cliente{i}@email.com",
+            "numero_documento": documento,
+            "cep": "30140071",
+            "numero_endereco": "100",
+            "endereco": "Rua Teste, 100 - Centro, Belo Horizonte - MG, 30140071",
+            "telefone": "31999998888",
+            "tipo": TIPO_PFISICA,
+            "data_nascimento": "01/01/1990",
+        })
+        contas.append({"numero": numero, "saldo": 100.0, "historico": [], "ativa": True, "tipo": TIPO_CCORRENTE})
+        clientes.append({"numero_documento": documento, "senha": "senha123", "contas": [numero]})
+
+    for nome, dados in ((ARQUIVO_PESSOAS, pessoas), (ARQUIVO_CONTAS, contas), (ARQUIVO_CLIENTES, clientes)):
+        with open(os.path.join(diretorio, nome), "w", encoding="utf-8") as f:
+            json.dump(dados, f)
+
+
+def hidratar_legado(dao: ClienteDAO, dados: dict) -> Cliente:
+    """
+    Reproduz o ClienteDAO.criar_objeto original (dicionário de contas refeito por cliente).
+    """
+    pessoa = dao._pessoa_dao.buscar_por_id(dados["numero_documento"])
+    todas_contas = {int(c.get_numero_conta()): c for c in dao._conta_dao.listar_todos_objetos()}
+    contas = [todas_contas[int(n)] for n in dados.get("contas", []) if int(n) in todas_contas]
+    return Cliente(pessoa=pessoa, senha=dados["senha"], contas=contas)
+
+
+def medir(quantidade: int, amostra: int) -> tuple[float, float]:
+    """
+    Retorna (segundos do caminho em lote, segundos estimados do caminho legado).
+    """
+    diretorio = tempfile.mkdtemp()
+    try:
+        gerar_base(diretorio, quantidade)
+        with patch("dao.dao.DIRETORIO_DATABASE", diretorio):
+            descartar_motores()
+            dao = ClienteDAO()
+            inicio = time.perf_counter()
+            clientes = dao.listar_todos_objetos()
+            tempo_lote = time.perf_counter() - inicio
+            assert len(clientes) == quantidade
+
+            linhas = dao._ler_dados_do_json()[:amostra]
+            inicio = time.perf_counter()
+            for dados in linhas:
+                hidratar_legado(dao, dados)
+            tempo_legado = (time.perf_counter() - inicio) * quantidade / len(linhas)
+            descartar_motores()
+    finally:
+        shutil.rmtree(diretorio, ignore_errors=True)
+
+    return tempo_lote, tempo_legado
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--amostra", type=int, default=50, help="Clientes medidos no caminho legado.")
+    args = parser.parse_args()
+
+    print(f"{'clientes':>10} | {'lote (s)':>10} | {'legado estimado (s)':>20} | {'ganho':>8}")
+    for quantidade in args.tamanhos:
+        tempo_lote, tempo_legado = medir(quantidade, args.amostra)
+        print(f"{quantidade:>10} | {tempo_lote:>10.2f} | {tempo_legado:>20.1f} | {tempo_legado / tempo_lote:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Benchmark do processamento de arquivos de pagamento em lote.
+
+Gera uma base sintética de clientes (uma conta corrente cada) e um arquivo de
+pagamentos da conta de uma empresa para todas as outras, e compara a vazão
+(linhas por segundo) de:
+    - linha a linha: PagamentoController.processar_pagamento para cada linha
+      (medido sobre uma amostra das linhas)
+    - em lote:       PagamentoLoteController.processar_arquivo
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.bench_pagamentos_lote --linhas 5000
+"""
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import time
+from unittest.mock import patch
+
+from controller.pagamento_controller import PagamentoController
+from controller.pagamento_lote_controller import PagamentoLoteController
+from dao.motores.fabrica_motor import descartar_motores
+from dao.registro_dao import RegistroDAO
+from utils.constantes import ARQUIVO_CLIENTES, ARQUIVO_CONTAS, ARQUIVO_PESSOAS, TIPO_CCORRENTE, TIPO_PFISICA
+
+ORIGEM = 100000  # Conta da empresa pagadora
+
+
+def gerar_base(diretorio: str, quantidade: int) -> list:
+    """
+    Gera pessoas, contas e clientes sintéticos e o arquivo de pagamentos (uma linha
+    para cada conta além da origem).
+
+    Returns:
+        list: Linhas do arquivo de pagamentos, como (documento, conta, valor, descrição).
+    """
+    pessoas, contas, clientes, pagamentos = [], [], [], []
+    for i in range(quantidade + 1):
+        documento = f"{i:011d}"
+        numero = str(ORIGEM + i)
+        pessoas.append({
+            "nome": "Cliente Sintetico",
+            "email": f"cliente{i}@email.com",
+            "numero_documento": documento,
+            "cep": "30140071",
+            "numero_endereco": "100",
+            "endereco": "Rua Teste, 100 - Centro, Belo Horizonte - MG, 30140071",
+            "telefone": "31999998888",
+            "tipo": TIPO_PFISICA,
+            "data_nascimento": "01/01/1990",
+        })
+        saldo = 10.0 ** 9 if i == 0 else 0.0
+        contas.append({"numero": numero, "saldo": saldo, "historico": [], "ativa": True, "tipo": TIPO_CCORRENTE})
+        clientes.append({"numero_documento": documento, "senha": "senha123", "contas": [numero]})
+        if i:
+            pagamentos.append((documento, numero, 1000 + i % 500, "Salário"))
+
+    for nome, dados in ((ARQUIVO_PESSOAS, pessoas), (ARQUIVO_CONTAS, contas), (ARQUIVO_CLIENTES, clientes)):
+        with open(os.path.join(diretorio, nome), "w", encoding="utf-8") as f:
+            json.dump(dados, f)
+    return pagamentos
+
+
+def medir(linhas: int, amostra: int, diretorio_base: str) -> tuple[float, float]:
+    """
+    Retorna (linhas por segundo linha a linha, linhas por segundo em lote).
+    """
+    vazoes = []
+    for em_lote in (False, True):
+        diretorio = tempfile.mkdtemp(dir=diretorio_base)
+        try:
+            pagamentos = gerar_base(diretorio, linhas)
+            with patch("dao.dao.DIRETORIO_DATABASE", diretorio):
+                RegistroDAO.descartar()
+                descartar_motores()
+                if em_lote:
+                    entrada = os.path.join(diretorio, "pagamentos.csv")
+                    with open(entrada, "w", encoding="utf-8") as f:
+                        f.write("documento;conta;valor;descricao\n")
+                        f.writelines(f"{d};{n};{v:.2f};{t}\n" for d, n, v, t in pagamentos)
+                    resultado = PagamentoLoteController.processar_arquivo(
+                        entrada, os.path.join(diretorio, "resultado.csv"), ORIGEM, "senha123"
+                    )
+                    assert resultado["efetivadas"] == linhas, resultado
+                    vazoes.append(resultado["linhas_por_segundo"])
+                else:
+                    medidos = pagamentos[:amostra]
+                    inicio = time.perf_counter()
+                    for documento, numero, valor, descricao in medidos:
+                        resultado = PagamentoController.processar_pagamento(
+                            ORIGEM, documento, valor, descricao, "senha123", int(numero)
+                        )
+                        assert resultado["sucesso"], resultado
+                    vazoes.append(len(medidos) / (time.perf_counter() - inicio))
+                RegistroDAO.descartar()
+                descartar_motores()
+        finally:
+            shutil.rmtree(diretorio, ignore_errors=True)
+    return vazoes[0], vazoes[1]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--linhas", type=int, default=5000)
+    parser.add_argument("--amostra", type=int, default=200, help="Linhas medidas no caminho linha a linha.")
+    parser.add_argument("--diretorio", default=None,
+                        help="Diretório dos arquivos temporários (use um no disco a ser medido).")
+    args = parser.parse_args()
+
+    linha_a_linha, em_lote = medir(args.linhas, args.amostra, args.diretorio)
+    print(f"{'linha a linha':>14}: {linha_a_linha:10.0f} linhas/s")
+    print(f"{'em lote':>14}: {em_lote:10.0f} linhas/s ({em_lote / linha_a_linha:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
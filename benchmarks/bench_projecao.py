@@ -0,0 +1,74 @@
+"""
+Benchmark da projeção de saldos de uma carteira sintética.
+
+Projeta o saldo total de uma carteira (1 milhão de contas, 120 meses e 10 cenários,
+por padrão) com ProjecaoController.projetar_carteira, que calcula blocos de contas
+dentro do limite de memória, e informa o tempo e o pico de memória alocada.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.bench_projecao --contas 1000000 --meses 120 --cenarios 10
+"""
+import argparse
+import random
+import time
+import tracemalloc
+
+from controller import projecao_controller
+from controller.projecao_controller import Cenario, ProjecaoController
+from model.conta_corrente import ContaCorrente
+from model.conta_poupanca import ContaPoupanca
+
+
+def gerar_contas(quantidade: int, semente: int):
+    """
+    Gera, sob demanda, contas correntes e poupanças com saldos sorteados; uma em cada 20 inativa.
+    """
+    sorteio = random.Random(semente)
+    for indice in range(quantidade):
+        classe = ContaPoupanca if sorteio.random() < 0.5 else ContaCorrente
+        saldo = round(sorteio.uniform(0, 10 ** 6), 2)
+        yield classe.de_armazenamento(str(1001 + indice), saldo, [], sorteio.random() >= 0.05)
+
+
+def gerar_cenarios(quantidade: int) -> list:
+    """
+    Cenários com rendimento de 0,3% a 1,2% ao mês e taxa de manutenção de R$ 5 a R$ 30.
+    """
+    passos = max(1, quantidade - 1)
+    return [
+        Cenario(f"cenario {indice}", 0.003 + 0.009 * indice / passos, 5.0 + 25.0 * indice / passos)
+        for indice in range(quantidade)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--contas", type=int, default=1_000_000)
+    parser.add_argument("--meses", type=int, default=120)
+    parser.add_argument("--cenarios", type=int, default=10)
+    parser.add_argument("--memoria", type=int, default=256, help="Memória máxima do bloco em cálculo, em MiB.")
+    parser.add_argument("--semente", type=int, default=2024)
+    args = parser.parse_args()
+
+    if projecao_controller.np is None:
+        print("A projeção de saldos requer o NumPy (pip install numpy).")
+        return
+
+    cenarios = gerar_cenarios(args.cenarios)
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    total = ProjecaoController.projetar_carteira(
+        gerar_contas(args.contas, args.semente), args.meses, cenarios, args.memoria * 2 ** 20
+    )
+    duracao = time.perf_counter() - inicio
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{args.contas} contas × {args.meses} meses × {args.cenarios} cenários "
+          f"em {duracao:.2f} s; pico de memória {pico / 2 ** 20:.1f} MiB")
+    for cenario, saldo in zip(cenarios, total[-1]):
+        print(f"{cenario.nome:>12}: R$ {saldo:,.2f} ao fim de {args.meses} meses")
+
+
+if __name__ == "__main__":
+    main()
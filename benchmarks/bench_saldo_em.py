@@ -0,0 +1,100 @@
+"""
+Benchmark da consulta de saldo em uma data sobre históricos longos.
+
+Monta o ledger de uma conta com muitas operações (1 milhão, por padrão, uma a cada
+poucos minutos) e compara o tempo médio de uma consulta de saldo em datas sorteadas:
+    - checkpoints: LedgerDAO.saldo_em (checkpoint mais próximo + reaplicação do trecho)
+    - reaplicação: leitura de todo o histórico, somando as operações até a data
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.bench_saldo_em --entradas 1000000 --consultas 1000
+"""
+import argparse
+import random
+import shutil
+import tempfile
+import time
+
+from dao.ledger_dao import LedgerDAO
+from model.transacao import TipoOperacao, Transacao
+
+INICIO = 1_600_000_000  # Momento da primeira operação (set/2020)
+LOTE = 10_000           # Operações por gravação ao montar o ledger
+
+
+def montar_ledger(ledger: LedgerDAO, entradas: int) -> tuple[int, int, int]:
+    """
+    Grava `entradas` operações alternando entradas e saídas.
+
+    Returns:
+        tuple[int, int, int]: (bytes confirmados, saldo final em centavos, último momento).
+    """
+    sorteio = random.Random(42)
+    tamanho = saldo = 0
+    momento = INICIO
+    for inicio in range(0, entradas, LOTE):
+        transacoes = []
+        for _ in range(min(LOTE, entradas - inicio)):
+            momento += sorteio.randint(1, 600)
+            recebida = saldo < 50_000 or sorteio.random() < 0.5
+            tipo = TipoOperacao.TRANSFERENCIA_RECEBIDA if recebida else TipoOperacao.TRANSFERENCIA_ENVIADA
+            transacao = Transacao(momento, tipo, sorteio.randint(100, 50_000), "1002")
+            saldo += transacao.efeito_centavos
+            transacoes.append(transacao)
+        tamanho = ledger.anexar("1001", tamanho, transacoes, inicio, saldo)
+    return tamanho, saldo, momento
+
+
+def saldo_por_reaplicacao(ledger: LedgerDAO, tamanho: int, momento: int) -> int:
+    saldo = 0
+    for transacao in ledger.ler("1001", tamanho):
+        if transacao.momento > momento:
+            break
+        saldo += transacao.efeito_centavos
+    return saldo
+
+
+def medir(consulta, momentos: list[int]) -> float:
+    """
+    Retorna o tempo médio de `consulta` por momento, em milissegundos.
+    """
+    inicio = time.perf_counter()
+    for momento in momentos:
+        consulta(momento)
+    return (time.perf_counter() - inicio) / len(momentos) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entradas", type=int, default=1_000_000)
+    parser.add_argument("--consultas", type=int, default=1000)
+    parser.add_argument("--consultas-reaplicacao", type=int, default=3,
+                        help="Consultas medidas sem checkpoints (cada uma lê o histórico inteiro).")
+    parser.add_argument("--diretorio", default=None,
+                        help="Diretório dos arquivos temporários (use um no disco a ser medido).")
+    args = parser.parse_args()
+
+    diretorio = tempfile.mkdtemp(dir=args.diretorio)
+    try:
+        ledger = LedgerDAO(diretorio, sincronizar_disco=False)
+        inicio = time.perf_counter()
+        tamanho, saldo, fim = montar_ledger(ledger, args.entradas)
+        print(f"ledger: {args.entradas} operações, {tamanho / 2 ** 20:.1f} MiB, "
+              f"montado em {time.perf_counter() - inicio:.1f} s")
+
+        sorteio = random.Random(7)
+        momentos = [sorteio.randint(INICIO, fim) for _ in range(args.consultas)]
+        conferir = momentos[:args.consultas_reaplicacao]
+        for momento in conferir:
+            assert ledger.saldo_em("1001", tamanho, saldo, momento) == saldo_por_reaplicacao(ledger, tamanho, momento)
+
+        por_checkpoint = medir(lambda m: ledger.saldo_em("1001", tamanho, saldo, m), momentos)
+        por_reaplicacao = medir(lambda m: saldo_por_reaplicacao(ledger, tamanho, m), conferir)
+        print(f"{'checkpoints':>12}: {por_checkpoint:10.3f} ms/consulta")
+        print(f"{'reaplicação':>12}: {por_reaplicacao:10.3f} ms/consulta")
+    finally:
+        shutil.rmtree(diretorio, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+import math
+import time
+from typing import List
+from dao.registro_dao import RegistroDAO
+from dao.unidade_de_trabalho import UnidadeDeTrabalho
+from model.conta import Conta
+from model.conta_corrente import ContaCorrente
+from model.conta_poupanca import ContaPoupanca
+from model.exceptions import ConflitoVersaoError
+from model.transacao import TipoOperacao, Transacao
+from utils.constantes import TAMANHO_LOTE_ATUALIZACAO_MENSAL, TENTATIVAS_CONFLITO_VERSAO
+from utils.logger import logger
+
+try:
+    import numpy as np
+except ImportError:  # Sem NumPy, o mesmo cálculo é feito conta a conta
+    np = None
+
+
+class AtualizacaoMensalController:
+    """
+    Fechamento do mês: aplica a atualização mensal (taxa de manutenção das contas
+    correntes e rendimento das poupanças) a todas as contas ativas.
+
+    O cálculo é feito de uma vez para um lote de contas ativas, com saldos e tipos em
+    arrays NumPy, e dá os mesmos saldos e transações que atualizacao_mensal conta a
+    conta. Cada lote é gravado em uma única escrita (ver UnidadeDeTrabalho).
+    """
+
+    @staticmethod
+    def executar(momento: int = None, tamanho_lote: int = TAMANHO_LOTE_ATUALIZACAO_MENSAL) -> dict:
+        """
+        Aplica a atualização mensal a todas as contas, em lotes.
+
+        Durante cada lote, as contas ficam travadas para as demais threads, e cada
+        conta mantém seu ledger travado até a gravação (por isso os lotes têm tamanho
+        limitado). Um lote em conflito de versão é relido e recalculado.
+
+        Args:
+            momento (int, opcional): Momento registrado nas transações, em segundos desde
+                a época Unix. Padrão: agora.
+            tamanho_lote (int): Contas por lote.
+
+        Returns:
+            dict: 'sucesso', 'contas' (quantidade), 'atualizadas' (quantidade),
+            'inativas' (números das contas ignoradas) e 'erros' (mensagens das contas
+            não atualizadas).
+        """
+        momento = int(time.time()) if momento is None else momento
+        conta_dao = RegistroDAO.contas()
+        travas = RegistroDAO.travas_contas()
+        numeros = [conta.get_numero_conta() for conta in conta_dao.listar_todos_objetos()]
+        resultado = {"sucesso": True, "contas": len(numeros), "atualizadas": 0, "inativas": [], "erros": []}
+
+        for inicio in range(0, len(numeros), tamanho_lote):
+            lote = numeros[inicio:inicio + tamanho_lote]
+            for tentativa in range(TENTATIVAS_CONFLITO_VERSAO):
+                try:
+                    with travas.travar(*lote, entre_processos=False):
+                        contas = [conta for conta in map(conta_dao.buscar_por_id, lote) if conta]
+                        atualizadas, inativas, erros = AtualizacaoMensalController.aplicar(contas, momento)
+                        with UnidadeDeTrabalho() as unidade:
+                            for conta in atualizadas:
+                                unidade.registrar_alteracao(conta_dao, conta)
+                    break
+                except ConflitoVersaoError as e:
+                    logger.info(f"Conflito na atualização mensal do lote {lote[0]}-{lote[-1]} (tentativa {tentativa + 1}): {e}")
+            else:
+                resultado["sucesso"] = False
+                resultado["erros"].append(f"Lote {lote[0]}-{lote[-1]} em conflito com outras operações; não atualizado.")
+                continue
+
+            resultado["atualizadas"] += len(atualizadas)
+            resultado["inativas"].extend(inativas)
+            resultado["erros"].extend(erros)
+
+        return resultado
+
+    @staticmethod
+    def aplicar(contas: List[Conta], momento: int) -> tuple[List[Conta], List[str], List[str]]:
+        """
+        Aplica a atualização mensal às contas em memória, sem gravar.
+
+        Contas inativas são ignoradas (como em ContaInativaError), e contas cujo saldo
+        resultante seria inválido (como em _set_saldo) não são alteradas.
+        Contas de outras classes (inclusive subclasses) usam o próprio atualizacao_mensal.
+
+        Args:
+            contas (list[Conta]): Contas a atualizar.
+            momento (int): Momento registrado nas transações.
+
+        Returns:
+            tuple: (contas atualizadas, números das inativas, mensagens de erro).
+        """
+        atualizadas, inativas, erros = [], [], []
+        calculaveis, poupancas = [], []
+        for conta in contas:
+            classe = type(conta)
+            if not conta.get_estado_da_conta():
+                inativas.append(conta.get_numero_conta())
+            elif classe is ContaCorrente or classe is ContaPoupanca:
+                calculaveis.append(conta)
+                poupancas.append(classe is ContaPoupanca)
+            else:
+                try:
+                    conta.atualizacao_mensal()
+                    atualizadas.append(conta)
+                except ValueError as e:
+                    erros.append(f"Conta {conta.get_numero_conta()}: {e}")
+
+        novos_saldos, valores_centavos, validos = AtualizacaoMensalController._calcular(
+            [conta.get_saldo() for conta in calculaveis], poupancas
+        )
+
+        tipos = {False: TipoOperacao.TAXA_MANUTENCAO, True: TipoOperacao.RENDIMENTO}
+        for conta, poupanca, saldo, centavos, valido in zip(
+            calculaveis, poupancas, novos_saldos, valores_centavos, validos
+        ):
+            if not valido:
+                erros.append(f"Conta {conta.get_numero_conta()}: saldo resultante inválido ({saldo}).")
+                continue
+            conta._saldo = saldo
+            conta._historico_pendente.append(Transacao(momento, tipos[poupanca], centavos))
+            atualizadas.append(conta)
+
+        return atualizadas, inativas, erros
+
+    @staticmethod
+    def _calcular(saldos: List[float], poupancas: List[bool]) -> tuple[list, list, list]:
+        """
+        Calcula, para cada conta, o novo saldo, o valor da transação em centavos e se o
+        novo saldo é válido, pela regra_mensal de ContaCorrente e ContaPoupanca.
+        """
+        if np is None:
+            novos, centavos, validos = [], [], []
+            for saldo, poupanca in zip(saldos, poupancas):
+                classe = ContaPoupanca if poupanca else ContaCorrente
+                novo, valor = classe.regra_mensal(saldo)
+                valido = math.isfinite(novo) and (classe.SALDO_NEGATIVO_NA_ATUALIZACAO or novo >= 0)
+                novos.append(novo)
+                centavos.append(round(valor * 100) if valido else 0)
+                validos.append(valido)
+            return novos, centavos, validos
+
+        saldos = np.asarray(saldos, dtype=np.float64)
+        poupancas = np.asarray(poupancas, dtype=bool)
+        novos_correntes, taxas = ContaCorrente.regra_mensal(saldos)
+        novos_poupancas, rendimentos = ContaPoupanca.regra_mensal(saldos)
+        novos = np.where(poupancas, novos_poupancas, novos_correntes)
+        negativo_permitido = np.where(
+            poupancas, ContaPoupanca.SALDO_NEGATIVO_NA_ATUALIZACAO, ContaCorrente.SALDO_NEGATIVO_NA_ATUALIZACAO
+        )
+        validos = np.isfinite(novos) & (negativo_permitido | (novos >= 0))
+        valores = np.where(validos, np.where(poupancas, rendimentos, taxas), 0)
+        centavos = np.rint(valores * 100).astype(np.int64)  # Meio a par, como round()
+        return novos.tolist(), centavos.tolist(), validos.tolist()
@@ -1,4 +1,4 @@
-from dao.cliente_dao import ClienteDAO
+from dao.registro_dao import RegistroDAO
 from utils.logger import logger
 
 class AuthController:
@@ -11,7 +11,6 @@ class AuthController:
     """
 
     sessao_ativa = {}
-    _cache_clientes = {}
 
     @staticmethod
     def login(numero_documento: str, senha: str) -> dict:
@@ -21,13 +20,7 @@ class AuthController:
         logger.info(f"Tentando login com documento: {numero_documento}")
 
         try:
-            # Verifica cache antes de acessar o DAO
-            if numero_documento in AuthController._cache_clientes:
-                cliente = AuthController._cache_clientes[numero_documento]
-            else:
-                cliente = ClienteDAO().buscar_por_id(numero_documento)
-                if cliente:
-                    AuthController._cache_clientes[numero_documento] = cliente
+            cliente = RegistroDAO.clientes().buscar_por_id(numero_documento)
 
             if cliente is None:
                 logger.warning(f"Cliente não encontrado: {numero_documento}")
@@ -1,6 +1,5 @@
 from utils.logger import logger
-from dao.pessoa_dao import PessoaDAO
-from dao.cliente_dao import ClienteDAO
+from dao.registro_dao import RegistroDAO
 from model.cliente import Cliente
 
 
@@ -26,8 +25,8 @@ class CadastroController:
 
         logger.info(f"Iniciando cadastro de cliente com documento: {numero_documento}")
 
-        cliente_dao = ClienteDAO()
-        pessoa_dao = PessoaDAO()
+        cliente_dao = RegistroDAO.clientes()
+        pessoa_dao = RegistroDAO.pessoas()
 
         # Verifica se já existe cliente com mesmo documento
         if cliente_dao.buscar_por_id(numero_documento):
@@ -73,7 +72,7 @@ class CadastroController:
         Cria e persiste um objeto Pessoa (física ou jurídica) com base no dicionário recebido.
         """
         from copy import deepcopy
-        pessoa_dao = PessoaDAO()
+        pessoa_dao = RegistroDAO.pessoas()
         dados_pessoa = deepcopy(dados)
 
         # Garante existência de campo opcional
@@ -87,9 +86,9 @@ class CadastroController:
         """
         Cria um cliente a partir do documento e senha informados, associando a uma Pessoa já criada.
         """
-        pessoa = PessoaDAO().buscar_por_id(numero_documento)
+        pessoa = RegistroDAO.pessoas().buscar_por_id(numero_documento)
         if not pessoa:
             raise ValueError(f"Pessoa não encontrada para o documento {numero_documento}.")
 
         cliente = Cliente(pessoa=pessoa, senha=senha)
-        ClienteDAO().salvar_objeto(cliente)
+        RegistroDAO.clientes().salvar_objeto(cliente)
@@ -1,8 +1,19 @@
-from dao.cliente_dao import ClienteDAO
-from dao.conta_dao import ContaDAO
+import os
+from datetime import date, datetime, time
+from itertools import chain
+from dao.registro_dao import RegistroDAO
+from dao.unidade_de_trabalho import UnidadeDeTrabalho
 from model.conta_corrente import ContaCorrente
 from model.conta_poupanca import ContaPoupanca
-from utils.constantes import TIPO_CCORRENTE, TIPO_CPOUPANCA
+from model.exceptions import ConflitoVersaoError
+from utils.constantes import (
+    FORMATO_EXPORTACAO_CSV,
+    FORMATO_EXPORTACAO_OFX,
+    TAMANHO_PAGINA_EXTRATO,
+    TIPO_CCORRENTE,
+    TIPO_CPOUPANCA
+)
+from utils.exportacao_extrato import ExportadorExtrato
 
 
 class ContaController:
@@ -11,8 +22,6 @@ class ContaController:
     criação, reativação, encerramento, extrato, listagem e identificação de destinatários.
     """
 
-    _cache_cliente_por_conta = {}
-
     @staticmethod
     def obter_extrato(numero_conta: int):
         """
@@ -21,13 +30,191 @@ class ContaController:
         Returns:
             tuple: (saldo, conta), None se houver erro.
         """
-        conta = ContaDAO().buscar_por_id(numero_conta)
+        conta = RegistroDAO.contas().buscar_por_id(numero_conta)
         if not conta:
             return None, "Conta não encontrada."
         if not conta.get_estado_da_conta():
             return None, "Conta inativa."
         return (conta.get_saldo(), conta), None
 
+    @staticmethod
+    def obter_extrato_paginado(
+        numero_conta: int,
+        limite: int = TAMANHO_PAGINA_EXTRATO,
+        cursor: int = None,
+        tipos=None
+    ):
+        """
+        Retorna o saldo e uma página do extrato da conta, se ativa, da transação mais
+        recente para a mais antiga. Só a parte do histórico necessária para a página
+        é lida.
+
+        Args:
+            numero_conta (int): Número da conta.
+            limite (int): Máximo de transações na página.
+            cursor (int, opcional): Cursor devolvido pela página anterior; None para
+                a primeira página.
+            tipos (Iterable[TipoOperacao], opcional): Tipos exibidos; None para todos.
+
+        Returns:
+            tuple: ((saldo, transacoes, proximo_cursor), None), com proximo_cursor None
+            ao fim do histórico, ou (None, erro).
+        """
+        if not isinstance(limite, int) or limite <= 0:
+            return None, "Tamanho de página inválido."
+        conta_dao = RegistroDAO.contas()
+        conta = conta_dao.buscar_por_id(numero_conta)
+        if not conta:
+            return None, "Conta não encontrada."
+        if not conta.get_estado_da_conta():
+            return None, "Conta inativa."
+        try:
+            transacoes, proximo_cursor = conta_dao.paginar_transacoes(conta, limite, cursor, tipos)
+        except ValueError as e:
+            return None, str(e)
+        return (conta.get_saldo(), transacoes, proximo_cursor), None
+
+    @staticmethod
+    def obter_extrato_por_periodo(numero_conta: int, inicio: datetime, fim: datetime, tipos=None):
+        """
+        Retorna o saldo e as transações da conta, se ativa, feitas entre `inicio` e `fim`
+        (inclusive), da mais antiga para a mais recente. O período é localizado por
+        busca binária no índice temporal do ledger, sem percorrer o histórico.
+
+        Args:
+            numero_conta (int): Número da conta.
+            inicio (datetime): Início do período.
+            fim (datetime): Fim do período.
+            tipos (Iterable[TipoOperacao], opcional): Tipos exibidos; None para todos.
+
+        Returns:
+            tuple: ((saldo, transacoes), None), ou (None, erro).
+        """
+        if fim < inicio:
+            return None, "Período inválido: o início é posterior ao fim."
+        conta_dao = RegistroDAO.contas()
+        conta = conta_dao.buscar_por_id(numero_conta)
+        if not conta:
+            return None, "Conta não encontrada."
+        if not conta.get_estado_da_conta():
+            return None, "Conta inativa."
+        try:
+            transacoes = conta_dao.transacoes_do_periodo(conta, int(inicio.timestamp()), int(fim.timestamp()))
+        except ValueError as e:
+            return None, str(e)
+        if tipos is not None:
+            tipos = frozenset(tipos)
+            transacoes = [t for t in transacoes if t.tipo in tipos]
+        return (conta.get_saldo(), transacoes), None
+
+    @staticmethod
+    def saldo_em(numero_conta: int, data: date):
+        """
+        Retorna o saldo da conta em uma data, inclusive de contas encerradas.
+        Só as operações desde o checkpoint de saldo mais próximo são reaplicadas.
+
+        Args:
+            numero_conta (int): Número da conta.
+            data (date | datetime): Instante consultado; uma data sem hora
+                considera o fim do dia.
+
+        Returns:
+            tuple: (saldo, None), ou (None, erro).
+        """
+        if not isinstance(data, datetime):
+            data = datetime.combine(data, time.max)
+        conta_dao = RegistroDAO.contas()
+        conta = conta_dao.buscar_por_id(numero_conta)
+        if not conta:
+            return None, "Conta não encontrada."
+        try:
+            return conta_dao.saldo_em(conta, int(data.timestamp())), None
+        except ValueError as e:
+            return None, str(e)
+
+    @staticmethod
+    def exportar_extrato(
+        numero_conta: int,
+        formato: str = FORMATO_EXPORTACAO_CSV,
+        inicio: datetime = None,
+        fim: datetime = None
+    ):
+        """
+        Exporta o extrato da conta (inclusive de contas encerradas) em CSV ou OFX, como
+        um gerador de trechos de texto: o histórico é lido do ledger em blocos à medida
+        que os trechos são consumidos, sem cópias do histórico em memória.
+
+        Args:
+            numero_conta (int): Número da conta.
+            formato (str): FORMATO_EXPORTACAO_CSV ou FORMATO_EXPORTACAO_OFX.
+            inicio (datetime, opcional): Início do período; None para desde o início.
+            fim (datetime, opcional): Fim do período; None para até a última transação.
+
+        Returns:
+            tuple: (gerador de str, None), ou (None, erro). Um ledger corrompido só é
+            detectado durante a iteração (ValueError).
+        """
+        if formato not in (FORMATO_EXPORTACAO_CSV, FORMATO_EXPORTACAO_OFX):
+            return None, f"Formato de exportação inválido: {formato}."
+        if inicio is not None and fim is not None and fim < inicio:
+            return None, "Período inválido: o início é posterior ao fim."
+        conta_dao = RegistroDAO.contas()
+        conta = conta_dao.buscar_por_id(numero_conta)
+        if not conta:
+            return None, "Conta não encontrada."
+
+        momento_inicio = None if inicio is None else int(inicio.timestamp())
+        momento_fim = None if fim is None else int(fim.timestamp())
+        transacoes = conta_dao.iterar_transacoes(conta, momento_inicio, momento_fim)
+        if formato == FORMATO_EXPORTACAO_CSV:
+            return ExportadorExtrato.gerar_csv(transacoes), None
+
+        try:
+            if momento_fim is None:
+                momento_fim, saldo = int(datetime.now().timestamp()), conta.get_saldo()
+            else:
+                saldo = conta_dao.saldo_em(conta, momento_fim)
+            if momento_inicio is None:
+                primeira = next(transacoes, None)
+                momento_inicio = primeira[1].momento if primeira else momento_fim
+                transacoes = chain([primeira] if primeira else [], transacoes)
+        except ValueError as e:
+            return None, str(e)
+        return ExportadorExtrato.gerar_ofx(
+            conta.get_numero_conta(), isinstance(conta, ContaPoupanca), transacoes, momento_inicio, momento_fim, saldo
+        ), None
+
+    @staticmethod
+    def exportar_extrato_para_arquivo(
+        numero_conta: int,
+        caminho: str,
+        formato: str = FORMATO_EXPORTACAO_CSV,
+        inicio: datetime = None,
+        fim: datetime = None
+    ):
+        """
+        Grava o extrato da conta (ver exportar_extrato) em um arquivo, trecho a trecho.
+        O arquivo só aparece em `caminho` depois de completo.
+
+        Returns:
+            tuple: (bytes gravados, None), ou (None, erro).
+        """
+        trechos, erro = ContaController.exportar_extrato(numero_conta, formato, inicio, fim)
+        if erro:
+            return None, erro
+
+        temporario = caminho + ".tmp"
+        try:
+            with open(temporario, 'w', encoding='utf-8', newline='') as f:
+                for trecho in trechos:
+                    f.write(trecho)
+            os.replace(temporario, caminho)
+        except (OSError, ValueError) as e:
+            if os.path.exists(temporario):
+                os.remove(temporario)
+            return None, f"Falha ao exportar o extrato da conta {numero_conta}: {e}"
+        return os.path.getsize(caminho), None
+
     @staticmethod
     def criar_conta(usuario_id: str, tipo_conta: str) -> dict:
         """
@@ -40,8 +227,8 @@ class ContaController:
         Returns:
             dict: Resultado da operação.
         """
-        cliente_dao = ClienteDAO()
-        conta_dao = ContaDAO()
+        cliente_dao = RegistroDAO.clientes()
+        conta_dao = RegistroDAO.contas()
         cliente = cliente_dao.buscar_por_id(usuario_id)
         if not cliente:
             return {"sucesso": False, "mensagem": "Cliente não encontrado."}
@@ -61,14 +248,13 @@ class ContaController:
         if not nova_conta:
             return {"sucesso": False, "mensagem": "Tipo de conta inválido."}
 
-        conta_dao.salvar_objeto(nova_conta)
-
-        cliente_atualizado = cliente_dao.buscar_por_id(usuario_id)
-        if not cliente_atualizado:
-            return {"sucesso": False, "mensagem": "Erro ao recarregar cliente."}
+        cliente.contas.append(nova_conta)
 
-        cliente_atualizado.contas.append(nova_conta)
-        cliente_dao.atualizar_objeto(cliente_atualizado)
+        # Conta antes do cliente: uma falha entre as duas gravações não deixa
+        # o cliente apontando para uma conta inexistente
+        with UnidadeDeTrabalho() as unidade:
+            unidade.registrar_novo(conta_dao, nova_conta)
+            unidade.registrar_alteracao(cliente_dao, cliente)
 
         return {"sucesso": True, "mensagem": f"Conta {novo_numero} criada com sucesso!"}
 
@@ -83,7 +269,7 @@ class ContaController:
         Returns:
             list: Contas atreladas ao cliente.
         """
-        cliente = ClienteDAO().buscar_por_id(usuario_id)
+        cliente = RegistroDAO.clientes().buscar_por_id(usuario_id)
         return cliente.contas if cliente else []
 
     @staticmethod
@@ -94,8 +280,8 @@ class ContaController:
         Returns:
             dict: Resultado com sucesso ou erro.
         """
-        cliente_dao = ClienteDAO()
-        conta_dao = ContaDAO()
+        cliente_dao = RegistroDAO.clientes()
+        conta_dao = RegistroDAO.contas()
 
         cliente = cliente_dao.buscar_por_id(usuario_id)
         if not cliente:
@@ -103,13 +289,21 @@ class ContaController:
         if not cliente.verificar_senha(senha):
             return {"sucesso": False, "mensagem": "Senha incorreta."}
 
-        conta = next((c for c in cliente.contas if str(c.get_numero_conta()) == str(numero_conta)), None)
-        if not conta or not conta.get_estado_da_conta():
+        if not str(numero_conta).strip().isdigit():
             return {"sucesso": False, "mensagem": "Conta não encontrada ou já está inativa."}
 
-        conta.encerrar_conta()
-        conta_dao.atualizar_objeto(conta)
-        cliente_dao.atualizar_objeto(cliente)
+        with RegistroDAO.travas_contas().travar(numero_conta, entre_processos=False):
+            conta = next((c for c in cliente.contas if str(c.get_numero_conta()) == str(numero_conta)), None)
+            if not conta or not conta.get_estado_da_conta():
+                return {"sucesso": False, "mensagem": "Conta não encontrada ou já está inativa."}
+
+            conta.encerrar_conta()
+            try:
+                with UnidadeDeTrabalho() as unidade:
+                    unidade.registrar_alteracao(conta_dao, conta)
+                    unidade.registrar_alteracao(cliente_dao, cliente)
+            except ConflitoVersaoError as e:
+                return {"sucesso": False, "mensagem": str(e)}
 
         return {"sucesso": True, "mensagem": f"Conta {numero_conta} encerrada com sucesso."}
 
@@ -121,8 +315,8 @@ class ContaController:
         Returns:
             dict: Resultado com sucesso ou erro.
         """
-        cliente_dao = ClienteDAO()
-        conta_dao = ContaDAO()
+        cliente_dao = RegistroDAO.clientes()
+        conta_dao = RegistroDAO.contas()
         cliente = cliente_dao.buscar_por_id(usuario_id)
 
         if not cliente:
@@ -130,22 +324,34 @@ class ContaController:
         if not cliente.verificar_senha(senha):
             return {"sucesso": False, "mensagem": "Senha incorreta."}
 
-        conta = next((c for c in cliente.contas if str(c.get_numero_conta()) == str(numero_conta)), None)
-        if not conta:
+        if not str(numero_conta).strip().isdigit():
             return {"sucesso": False, "mensagem": "Conta não encontrada."}
-        if conta.get_estado_da_conta():
-            return {"sucesso": False, "mensagem": "A conta já está ativa."}
 
-        conta._ativa = True
-        conta_dao.atualizar_objeto(conta)
-        cliente_dao.atualizar_objeto(cliente)
+        with RegistroDAO.travas_contas().travar(numero_conta, entre_processos=False):
+            conta = next((c for c in cliente.contas if str(c.get_numero_conta()) == str(numero_conta)), None)
+            if not conta:
+                return {"sucesso": False, "mensagem": "Conta não encontrada."}
+            if conta.get_estado_da_conta():
+                return {"sucesso": False, "mensagem": "A conta já está ativa."}
+
+            conta._ativa = True
+            try:
+                with UnidadeDeTrabalho() as unidade:
+                    unidade.registrar_alteracao(conta_dao, conta)
+                    unidade.registrar_alteracao(cliente_dao, cliente)
+            except ConflitoVersaoError as e:
+                conta._ativa = False
+                return {"sucesso": False, "mensagem": str(e)}
+            except Exception:
+                conta._ativa = False
+                raise
 
         return {"sucesso": True, "mensagem": f"Conta {numero_conta} reativada com sucesso."}
 
 
     @staticmethod
     def contas_ativas_para_dropdown(cliente):
-        cliente_atualizado = ClienteDAO().buscar_por_id(cliente.pessoa.get_numero_documento())
+        cliente_atualizado = RegistroDAO.clientes().buscar_por_id(cliente.pessoa.get_numero_documento())
         return [
             str(conta.get_numero_conta())
             for conta in cliente_atualizado.contas if conta.get_estado_da_conta()
@@ -163,13 +369,7 @@ class ContaController:
         Returns:
             str: Informações de nome, documento e número da conta.
         """
-        if numero_conta in ContaController._cache_cliente_por_conta:
-            cliente = ContaController._cache_cliente_por_conta[numero_conta]
-        else:
-            cliente = ClienteDAO().buscar_cliente_por_numero_conta(numero_conta)
-            if cliente:
-                ContaController._cache_cliente_por_conta[numero_conta] = cliente
-
+        cliente = RegistroDAO.clientes().buscar_cliente_por_numero_conta(numero_conta)
         if not cliente:
             return f"Conta {numero_conta} (cliente não encontrado)"
 
@@ -1,6 +1,14 @@
-from dao.cliente_dao import ClienteDAO
-from dao.conta_dao import ContaDAO
-from model.exceptions import ContaInativaError
+import random
+import time
+from dao.registro_dao import RegistroDAO
+from dao.unidade_de_trabalho import UnidadeDeTrabalho
+from model.exceptions import ContaInativaError, ConflitoVersaoError
+from utils.constantes import (
+    TENTATIVAS_CONFLITO_VERSAO,
+    ESPERA_CONFLITO_VERSAO_BASE,
+    ESPERA_CONFLITO_VERSAO_MAXIMA
+)
+from utils.logger import logger
 
 
 class PagamentoController:
@@ -36,8 +44,57 @@ class PagamentoController:
         if valor <= 0:
             return {"sucesso": False, "erros": ["O valor da transferência deve ser maior que zero."]}
 
-        cliente_dao = ClienteDAO()
-        conta_dao = ContaDAO()
+        # Concorrência otimista: se outro processo gravou uma das contas depois da leitura,
+        # a gravação é recusada (ConflitoVersaoError) e a transferência é refeita com os
+        # dados relidos. As travas por conta, só entre threads, evitam que duas threads
+        # alterem ao mesmo tempo os objetos Conta compartilhados pelo RegistroDAO.
+        travas = RegistroDAO.travas_contas()
+        for tentativa in range(TENTATIVAS_CONFLITO_VERSAO):
+            if tentativa:
+                PagamentoController._aguardar_nova_tentativa(tentativa)
+            try:
+                with travas.travar(conta_origem_num, conta_destino_numero, entre_processos=False):
+                    return PagamentoController._efetivar_pagamento(
+                        conta_origem_num, doc_destino, valor, descricao, senha, conta_destino_numero
+                    )
+            except ConflitoVersaoError as e:
+                logger.info(f"Conflito na transferência da conta {conta_origem_num} (tentativa {tentativa + 1}): {e}")
+
+        return {
+            "sucesso": False,
+            "erros": ["As contas estão sendo movimentadas por outra operação. Tente novamente."]
+        }
+
+    @staticmethod
+    def _aguardar_nova_tentativa(tentativa: int) -> None:
+        """
+        Espera antes de repetir uma transferência em conflito: um tempo sorteado até um
+        teto que dobra a cada tentativa, para que as operações em disputa se desencontrem.
+        """
+        teto = min(ESPERA_CONFLITO_VERSAO_MAXIMA, ESPERA_CONFLITO_VERSAO_BASE * 2 ** tentativa)
+        time.sleep(random.uniform(0, teto))
+
+    @staticmethod
+    def _efetivar_pagamento(
+        conta_origem_num: int,
+        doc_destino: str,
+        valor: float,
+        descricao: str,
+        senha: str,
+        conta_destino_numero: int
+    ) -> dict:
+        """
+        Valida as contas e efetiva a transferência. Deve ser chamado com as duas contas travadas.
+
+        Returns:
+            dict: Resultado com chaves 'sucesso' e 'mensagem' ou 'erros'.
+
+        Raises:
+            ConflitoVersaoError: Se alguma das contas foi gravada por outro processo
+                depois de lida. Nada é gravado.
+        """
+        cliente_dao = RegistroDAO.clientes()
+        conta_dao = RegistroDAO.contas()
 
         # Busca cliente e conta de origem
         cliente_origem = cliente_dao.buscar_cliente_por_numero_conta(conta_origem_num)
@@ -77,12 +134,14 @@ class PagamentoController:
 
         # Efetiva a transferência
         try:
-            conta_origem.transferir(conta_destino, valor)
+            conta_origem.transferir(conta_destino, valor, descricao or "")
         except (ContaInativaError, ValueError) as e:
             return {"sucesso": False, "erros": [str(e)]}
 
-        conta_dao.atualizar_objeto(conta_origem)
-        conta_dao.atualizar_objeto(conta_destino)
+        # Débito e crédito gravados juntos, em uma única escrita atômica
+        with UnidadeDeTrabalho() as unidade:
+            unidade.registrar_alteracao(conta_dao, conta_origem)
+            unidade.registrar_alteracao(conta_dao, conta_destino)
 
         return {
             "sucesso": True,
@@ -0,0 +1,233 @@
+import csv
+import time
+from decimal import Decimal, InvalidOperation
+from typing import List, Optional
+from controller.pagamento_controller import PagamentoController
+from dao.registro_dao import RegistroDAO
+from dao.unidade_de_trabalho import UnidadeDeTrabalho
+from model.exceptions import ContaInativaError, ConflitoVersaoError
+from utils.constantes import COLUNAS_CSV_PAGAMENTOS, SEPARADOR_CSV_PAGAMENTOS, TENTATIVAS_CONFLITO_VERSAO
+from utils.logger import logger
+from utils.validadores.validar_pessoa import ValidarPessoa
+
+
+class PagamentoLoteController:
+    """
+    Processamento de arquivos de pagamento em lote (ex.: folha de pagamento de uma
+    empresa): várias transferências de uma mesma conta de origem, lidas de um CSV.
+
+    O arquivo é lido e validado em uma única passagem; os donos das contas de destino
+    são conferidos com uma única leitura do índice de contas por cliente; as
+    transferências são aplicadas em memória com Conta.transferir (mesmas regras de
+    saldo e limite da transferência avulsa) e todas as contas alteradas são gravadas
+    de uma vez, em uma única UnidadeDeTrabalho.
+
+    Formato do arquivo de entrada (separador SEPARADOR_CSV_PAGAMENTOS, com cabeçalho):
+        documento;conta;valor;descricao
+        12345678900;1002;1500,00;Salário junho
+
+    O arquivo de resultado tem uma linha por transferência:
+        linha;situacao;mensagem
+    """
+
+    SITUACAO_EFETIVADA = "efetivada"
+    SITUACAO_REJEITADA = "rejeitada"
+
+    @staticmethod
+    def processar_arquivo(caminho_entrada: str, caminho_resultado: str, conta_origem_num: int, senha: str) -> dict:
+        """
+        Processa um arquivo de pagamentos e grava o resultado de cada linha.
+
+        Linhas inválidas ou recusadas (saldo insuficiente, limite, conta de destino
+        inexistente...) são rejeitadas sem impedir as demais. Se a gravação entrar em
+        conflito com outras operações mais de TENTATIVAS_CONFLITO_VERSAO vezes, nenhuma
+        transferência é efetivada.
+
+        Args:
+            caminho_entrada (str): Arquivo CSV com as transferências.
+            caminho_resultado (str): Arquivo CSV gerado com o resultado de cada linha.
+            conta_origem_num (int): Conta debitada.
+            senha (str): Senha do cliente dono da conta de origem.
+
+        Returns:
+            dict: 'sucesso', 'linhas', 'efetivadas', 'rejeitadas', 'valor_total' (soma
+            das transferências efetivadas), 'duracao' (segundos) e 'linhas_por_segundo';
+            ou 'sucesso' False e 'erros', se o arquivo inteiro foi recusado.
+        """
+        inicio = time.perf_counter()
+        try:
+            conta_origem_num = int(conta_origem_num)
+        except (TypeError, ValueError):
+            return {"sucesso": False, "erros": ["Número de conta inválido."]}
+
+        cliente_origem = RegistroDAO.clientes().buscar_cliente_por_numero_conta(conta_origem_num)
+        if not cliente_origem:
+            return {"sucesso": False, "erros": ["Cliente de origem não encontrado."]}
+        if not cliente_origem.verificar_senha(senha):
+            return {"sucesso": False, "erros": ["Senha incorreta."]}
+
+        try:
+            pagamentos, mensagens = PagamentoLoteController._ler_arquivo(caminho_entrada)
+        except (OSError, UnicodeDecodeError, csv.Error, ValueError) as e:
+            return {"sucesso": False, "erros": [f"Arquivo de pagamentos inválido: {e}"]}
+
+        sucesso = True
+        travas = RegistroDAO.travas_contas()
+        destinos = {numero for _, _, numero, _, _ in pagamentos}
+        for tentativa in range(TENTATIVAS_CONFLITO_VERSAO):
+            if tentativa:
+                PagamentoController._aguardar_nova_tentativa(tentativa)
+            try:
+                with travas.travar(conta_origem_num, *destinos, entre_processos=False):
+                    mensagens.update(PagamentoLoteController._efetivar(conta_origem_num, pagamentos))
+                break
+            except ConflitoVersaoError as e:
+                logger.info(f"Conflito no lote de pagamentos da conta {conta_origem_num} (tentativa {tentativa + 1}): {e}")
+        else:
+            sucesso = False
+            for linha, _, _, _, _ in pagamentos:
+                mensagens[linha] = "As contas estão sendo movimentadas por outra operação. Tente novamente."
+
+        PagamentoLoteController._gravar_resultado(caminho_resultado, mensagens)
+
+        efetivados = [valor for linha, _, _, valor, _ in pagamentos if mensagens[linha] is None]
+        duracao = time.perf_counter() - inicio
+        return {
+            "sucesso": sucesso,
+            "linhas": len(mensagens),
+            "efetivadas": len(efetivados),
+            "rejeitadas": len(mensagens) - len(efetivados),
+            "valor_total": round(sum(efetivados), 2),
+            "duracao": duracao,
+            "linhas_por_segundo": len(mensagens) / duracao if duracao else 0.0
+        }
+
+    @staticmethod
+    def _ler_arquivo(caminho: str) -> tuple[List[tuple], dict[int, Optional[str]]]:
+        """
+        Lê e valida o arquivo de pagamentos em uma passagem. Linhas em branco são ignoradas.
+
+        Returns:
+            tuple: (pagamentos válidos, como (linha, documento, conta, valor, descrição),
+            e mensagens das linhas inválidas, por número de linha).
+
+        Raises:
+            ValueError: Se o arquivo estiver vazio ou faltar alguma coluna obrigatória.
+        """
+        pagamentos, mensagens = [], {}
+        with open(caminho, 'r', encoding='utf-8-sig', newline='') as f:
+            leitor = csv.reader(f, delimiter=SEPARADOR_CSV_PAGAMENTOS)
+            cabecalho = [coluna.strip().lower() for coluna in next(leitor, [])]
+            faltando = [coluna for coluna in COLUNAS_CSV_PAGAMENTOS[:3] if coluna not in cabecalho]
+            if faltando:
+                raise ValueError(f"colunas ausentes no cabeçalho: {', '.join(faltando)}.")
+            posicoes = [cabecalho.index(coluna) if coluna in cabecalho else None for coluna in COLUNAS_CSV_PAGAMENTOS]
+
+            for campos in leitor:
+                if not any(campo.strip() for campo in campos):
+                    continue
+                try:
+                    pagamentos.append((leitor.line_num,) + PagamentoLoteController._validar_campos(campos, posicoes))
+                except ValueError as e:
+                    mensagens[leitor.line_num] = str(e)
+        return pagamentos, mensagens
+
+    @staticmethod
+    def _validar_campos(campos: List[str], posicoes: List[Optional[int]]) -> tuple[str, str, float, str]:
+        """
+        Valida os campos de uma linha e retorna (documento, conta, valor, descrição).
+
+        Raises:
+            ValueError: Se algum campo for inválido.
+        """
+        documento, conta, valor, descricao = (
+            campos[posicao].strip() if posicao is not None and posicao < len(campos) else ""
+            for posicao in posicoes
+        )
+
+        documento = ValidarPessoa._limpar_numeros(documento)
+        if not documento or not conta or not valor:
+            raise ValueError("Preencha todos os campos obrigatórios.")
+
+        try:
+            conta = str(int(conta))
+        except ValueError:
+            raise ValueError("Número de conta inválido.") from None
+
+        if "," in valor:
+            valor = valor.replace(".", "").replace(",", ".")  # 1.234,56
+        try:
+            quantia = Decimal(valor)
+        except InvalidOperation:
+            raise ValueError(f"Valor inválido: {valor}.") from None
+        if not quantia.is_finite() or quantia <= 0:
+            raise ValueError("O valor da transferência deve ser maior que zero.")
+        if quantia != quantia.quantize(Decimal("0.01")):
+            raise ValueError("O valor da transferência deve ter no máximo duas casas decimais.")
+
+        return documento, conta, float(quantia), descricao
+
+    @staticmethod
+    def _efetivar(conta_origem_num: int, pagamentos: List[tuple]) -> dict[int, Optional[str]]:
+        """
+        Aplica as transferências em memória, na ordem do arquivo, e grava as contas
+        alteradas em uma única UnidadeDeTrabalho. Deve ser chamado com as contas travadas.
+
+        Returns:
+            dict[int, Optional[str]]: Por número de linha, None se a transferência foi
+            efetivada ou a mensagem de recusa.
+
+        Raises:
+            ConflitoVersaoError: Se alguma das contas foi gravada por outro processo
+                depois de lida. Nada é gravado.
+        """
+        conta_dao = RegistroDAO.contas()
+        conta_origem = conta_dao.buscar_por_id(conta_origem_num)
+        if not conta_origem or not conta_origem.get_estado_da_conta():
+            return {linha: "A conta de origem está inativa ou não encontrada." for linha, _, _, _, _ in pagamentos}
+
+        donos = RegistroDAO.clientes().documentos_das_contas(numero for _, _, numero, _, _ in pagamentos)
+        mensagens, alteradas = {}, {}
+        for linha, documento, numero, valor, descricao in pagamentos:
+            dono = donos[numero]
+            if dono is None or ValidarPessoa._limpar_numeros(dono) != documento:
+                mensagens[linha] = f"Conta {numero} não encontrada para o destinatário com documento {documento}."
+                continue
+
+            conta_destino = alteradas.get(numero) or conta_dao.buscar_por_id(numero)
+            if not conta_destino or not conta_destino.get_estado_da_conta():
+                mensagens[linha] = "Conta de destino não encontrada ou está inativa."
+                continue
+            if conta_destino is conta_origem:
+                mensagens[linha] = "Você não pode transferir para a mesma conta."
+                continue
+
+            try:
+                conta_origem.transferir(conta_destino, valor, descricao)
+            except (ContaInativaError, ValueError) as e:
+                mensagens[linha] = str(e)
+                continue
+            mensagens[linha] = None
+            alteradas[numero] = conta_destino
+
+        if alteradas:
+            with UnidadeDeTrabalho() as unidade:
+                unidade.registrar_alteracao(conta_dao, conta_origem)
+                for conta_destino in alteradas.values():
+                    unidade.registrar_alteracao(conta_dao, conta_destino)
+        return mensagens
+
+    @staticmethod
+    def _gravar_resultado(caminho: str, mensagens: dict[int, Optional[str]]) -> None:
+        """
+        Grava o resultado de cada linha do arquivo de entrada, em ordem.
+        """
+        with open(caminho, 'w', encoding='utf-8', newline='') as f:
+            escritor = csv.writer(f, delimiter=SEPARADOR_CSV_PAGAMENTOS)
+            escritor.writerow(("linha", "situacao", "mensagem"))
+            for linha in sorted(mensagens):
+                mensagem = mensagens[linha]
+                if mensagem is None:
+                    escritor.writerow((linha, PagamentoLoteController.SITUACAO_EFETIVADA, ""))
+                else:
+                    escritor.writerow((linha, PagamentoLoteController.SITUACAO_REJEITADA, mensagem))
@@ -1,5 +1,4 @@
-from dao.cliente_dao import ClienteDAO
-from dao.pessoa_dao import PessoaDAO 
+from dao.registro_dao import RegistroDAO
 from model.pessoa_fisica import PessoaFisica
 from model.cliente import Cliente
 from utils.logger import logger
@@ -17,7 +16,7 @@ class PerfilController:
         Busca um cliente pelo número do documento (CPF ou CNPJ).
         """
         logger.info(f"Buscando cliente pelo documento: {doc}")
-        return ClienteDAO().buscar_por_id(doc)
+        return RegistroDAO.clientes().buscar_por_id(doc)
 
     @staticmethod
     def buscar_cliente_por_conta(numero_conta: int) -> Optional[Cliente]:
@@ -25,15 +24,15 @@ class PerfilController:
         Busca um cliente associado a uma conta específica.
         """
         logger.info(f"Buscando cliente pela conta: {numero_conta}")
-        return ClienteDAO().buscar_cliente_por_numero_conta(numero_conta)
+        return RegistroDAO.clientes().buscar_cliente_por_numero_conta(numero_conta)
 
     @staticmethod
     def atualizar_cliente(cliente: Cliente):
         """
         Atualiza os dados persistidos de um cliente.
         """
-        ClienteDAO().atualizar_objeto(cliente)
-        PessoaDAO().atualizar_objeto(cliente.pessoa)
+        RegistroDAO.clientes().atualizar_objeto(cliente)
+        RegistroDAO.pessoas().atualizar_objeto(cliente.pessoa)
 
     @staticmethod
     def obter_dados_perfil(documento: str) -> dict:
@@ -45,7 +44,7 @@ class PerfilController:
         """
         logger.info(f"Buscando dados de perfil para documento: {documento}")
         try:
-            cliente = ClienteDAO().buscar_por_id(documento)
+            cliente = RegistroDAO.clientes().buscar_por_id(documento)
             if cliente is None:
                 return {"status": "erro", "mensagem": "Cliente não encontrado."}
 
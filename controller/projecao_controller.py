@@ -0,0 +1,188 @@
+import sys
+from typing import Iterable, Iterator, List
+from model.conta import Conta
+from model.conta_corrente import ContaCorrente
+from model.conta_poupanca import ContaPoupanca
+from utils.constantes import MEMORIA_MAXIMA_PROJECAO, RENDIMENTO_MENSAL_CPOUPANCA, TAXA_MANUTENCAO_CCORRENTE
+
+try:
+    import numpy as np
+except ImportError:  # As projeções exigem NumPy; o restante do sistema funciona sem ele
+    np = None
+
+
+class Cenario:
+    """
+    Parâmetros da atualização mensal em um cenário de projeção.
+
+    Attributes:
+        nome (str): Identificação do cenário.
+        rendimento_mensal (float): Rendimento mensal das contas poupança (ex.: 0.005).
+        taxa_manutencao (float): Taxa mensal de manutenção das contas correntes, em reais.
+    """
+
+    __slots__ = ("nome", "rendimento_mensal", "taxa_manutencao")
+
+    def __init__(
+        self,
+        nome: str,
+        rendimento_mensal: float = RENDIMENTO_MENSAL_CPOUPANCA,
+        taxa_manutencao: float = TAXA_MANUTENCAO_CCORRENTE
+    ) -> None:
+        self.nome = nome
+        self.rendimento_mensal = rendimento_mensal
+        self.taxa_manutencao = taxa_manutencao
+
+    def __repr__(self) -> str:
+        return (
+            f"Cenario(nome={self.nome!r}, rendimento_mensal={self.rendimento_mensal}, "
+            f"taxa_manutencao={self.taxa_manutencao})"
+        )
+
+
+class ProjecaoController:
+    """
+    Projeção dos saldos da carteira para os próximos meses, em vários cenários de
+    rendimento e taxa, aplicando mês a mês a regra_mensal de cada tipo de conta.
+
+    As contas só são lidas (saldo, tipo e estado): nada é alterado nem gravado.
+    O cálculo é vetorizado sobre um array (contas × meses × cenários), feito em
+    blocos de contas cujo tamanho respeita um limite de memória; os blocos são
+    entregues à medida que ficam prontos. Cada conta lida tem só o número, o saldo,
+    o tipo e o estado copiados para o bloco: os objetos Conta não são retidos.
+    """
+
+    # Número da conta guardado no bloco: string curta mais a referência na lista
+    _BYTES_POR_NUMERO = sys.getsizeof("0" * 16) + 8
+
+    @staticmethod
+    def memoria_por_conta(meses: int, quantidade_cenarios: int) -> int:
+        """
+        Retorna os bytes que cada conta ocupa no bloco em cálculo: a saída do bloco,
+        os arrays de trabalho de um mês (≈ 6 por conta e cenário) e os dados lidos da
+        conta (saldo, tipo, estado e número).
+        """
+        float64 = np.dtype(np.float64).itemsize
+        return (meses + 6) * quantidade_cenarios * float64 + float64 + 3 + ProjecaoController._BYTES_POR_NUMERO
+
+    @staticmethod
+    def projetar(
+        contas: Iterable[Conta],
+        meses: int,
+        cenarios: List[Cenario],
+        memoria_maxima: int = MEMORIA_MAXIMA_PROJECAO
+    ) -> Iterator[tuple[List[str], "np.ndarray"]]:
+        """
+        Projeta os saldos das contas, bloco a bloco.
+
+        Contas inativas mantêm o saldo; um mês cuja atualização deixaria o saldo
+        inválido (ex.: poupança negativa) também o mantém, como em _set_saldo.
+
+        Args:
+            contas (Iterable[Conta]): Contas projetadas (pode ser um gerador).
+            meses (int): Quantidade de meses projetados.
+            cenarios (list[Cenario]): Cenários simulados.
+            memoria_maxima (int): Bytes que o bloco em cálculo pode ocupar.
+
+        Yields:
+            tuple[list[str], np.ndarray]: Números das contas do bloco e os saldos
+            projetados, com forma (contas do bloco, meses, cenários); o índice 0 do
+            segundo eixo é o saldo ao fim do primeiro mês.
+
+        Raises:
+            RuntimeError: Se o NumPy não estiver instalado.
+            ValueError: Se meses, cenários ou memória forem inválidos.
+        """
+        if np is None:
+            raise RuntimeError("A projeção de saldos requer o NumPy (pip install numpy).")
+        if not isinstance(meses, int) or meses <= 0:
+            raise ValueError("A quantidade de meses deve ser um inteiro positivo.")
+        if not cenarios:
+            raise ValueError("Informe ao menos um cenário.")
+
+        por_conta = ProjecaoController.memoria_por_conta(meses, len(cenarios))
+        tamanho_bloco = memoria_maxima // por_conta
+        if tamanho_bloco < 1:
+            raise ValueError(f"Memória insuficiente: cada conta exige {por_conta} bytes.")
+
+        taxas = np.array([cenario.taxa_manutencao for cenario in cenarios], dtype=np.float64)
+        rendimentos = np.array([cenario.rendimento_mensal for cenario in cenarios], dtype=np.float64)
+
+        contas = iter(contas)
+        while True:
+            numeros, saldos, poupancas, correntes, ativas = ProjecaoController._ler_bloco(contas, tamanho_bloco)
+            if not numeros:
+                return
+            yield numeros, ProjecaoController._projetar_bloco(saldos, poupancas, correntes, ativas, meses, taxas, rendimentos)
+
+    @staticmethod
+    def projetar_carteira(
+        contas: Iterable[Conta],
+        meses: int,
+        cenarios: List[Cenario],
+        memoria_maxima: int = MEMORIA_MAXIMA_PROJECAO
+    ) -> "np.ndarray":
+        """
+        Retorna o saldo total projetado da carteira, com forma (meses, cenários),
+        somando os blocos de projetar sem guardá-los.
+        """
+        total = np.zeros((meses, len(cenarios)), dtype=np.float64)
+        for _, saldos in ProjecaoController.projetar(contas, meses, cenarios, memoria_maxima):
+            total += saldos.sum(axis=0)
+        return total
+
+    @staticmethod
+    def _ler_bloco(contas: Iterator[Conta], tamanho_bloco: int) -> tuple:
+        """
+        Lê até tamanho_bloco contas do iterador, copiando número, saldo, tipo e
+        estado de cada uma; a conta é descartada assim que lida.
+        """
+        numeros = []
+        saldos = np.empty(tamanho_bloco, dtype=np.float64)
+        poupancas = np.empty(tamanho_bloco, dtype=bool)
+        correntes = np.empty(tamanho_bloco, dtype=bool)
+        ativas = np.empty(tamanho_bloco, dtype=bool)
+        for indice, conta in enumerate(contas):
+            numeros.append(conta.get_numero_conta())
+            saldos[indice] = conta.get_saldo()
+            poupancas[indice] = isinstance(conta, ContaPoupanca)
+            correntes[indice] = isinstance(conta, ContaCorrente)
+            ativas[indice] = conta.get_estado_da_conta()
+            if indice + 1 == tamanho_bloco:
+                break
+        quantidade = len(numeros)
+        return numeros, saldos[:quantidade], poupancas[:quantidade], correntes[:quantidade], ativas[:quantidade]
+
+    @staticmethod
+    def _projetar_bloco(
+        saldos: "np.ndarray",
+        poupancas: "np.ndarray",
+        correntes: "np.ndarray",
+        ativas: "np.ndarray",
+        meses: int,
+        taxas: "np.ndarray",
+        rendimentos: "np.ndarray"
+    ) -> "np.ndarray":
+        """
+        Projeta um bloco de contas: aplica a regra_mensal de cada tipo a todas as
+        contas e cenários de uma vez, mês a mês.
+        """
+        quantidade = len(saldos)
+        atualizadas = ((poupancas | correntes) & ativas)[:, None]
+        poupancas = poupancas[:, None]
+        negativo_permitido = np.where(
+            poupancas, ContaPoupanca.SALDO_NEGATIVO_NA_ATUALIZACAO, ContaCorrente.SALDO_NEGATIVO_NA_ATUALIZACAO
+        )
+
+        atual = np.repeat(saldos[:, None], len(taxas), axis=1)
+        projecao = np.empty((quantidade, meses, len(taxas)), dtype=np.float64)
+        for mes in range(meses):
+            novos = np.where(
+                poupancas,
+                ContaPoupanca.regra_mensal(atual, rendimentos)[0],
+                ContaCorrente.regra_mensal(atual, taxas)[0]
+            )
+            validos = atualizadas & np.isfinite(novos) & (negativo_permitido | (novos >= 0))
+            atual = np.where(validos, novos, atual)
+            projecao[:, mes, :] = atual
+        return projecao
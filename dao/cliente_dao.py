@@ -1,43 +1,115 @@
-from typing import Optional, List
+import json
+import os
+from contextlib import contextmanager
+from typing import Iterable, Iterator, List, Optional
 from model.cliente import Cliente
 from dao.dao import DAO
 from dao.pessoa_dao import PessoaDAO
 from dao.conta_dao import ContaDAO
-from utils.constantes import ARQUIVO_CLIENTES
+from dao.motores.motor_armazenamento import MotorArmazenamento
+from dao.motores.trava_arquivo import TravaArquivo
+from utils.constantes import ARQUIVO_CLIENTES, ARQUIVO_INDICE_CONTAS_CLIENTES
+from utils.logger import logger
 
 
 class ClienteDAO(DAO):
     """
     DAO responsável pela persistência de objetos Cliente, vinculando
     Pessoa, senha e lista de contas associadas.
+
+    Mantém também um índice reverso número da conta -> documento do cliente,
+    persistido em ARQUIVO_INDICE_CONTAS_CLIENTES, para localizar o dono de uma
+    conta sem carregar todos os clientes.
+
+    O índice guarda a assinatura dos dados de clientes a partir dos quais foi gerado
+    (MotorArmazenamento.assinatura_dados). Cada gravação de clientes e a atualização
+    do índice ficam sob a trava exclusiva do índice; se um processo parar entre as
+    duas, a assinatura não confere e o índice é reconstruído na próxima leitura do
+    arquivo ou na próxima conta não encontrada.
     """
 
-    def __init__(self):
+    def __init__(self, pessoa_dao: Optional[PessoaDAO] = None, conta_dao: Optional[ContaDAO] = None):
         """
         Inicializa o DAO de clientes, bem como os DAOs auxiliares para Pessoa e Conta.
+
+        Args:
+            pessoa_dao (PessoaDAO, opcional): DAO de pessoas a reutilizar. Padrão: um novo.
+            conta_dao (ContaDAO, opcional): DAO de contas a reutilizar. Padrão: um novo.
         """
         super().__init__(ARQUIVO_CLIENTES)
-        self._pessoa_dao = PessoaDAO()
-        self._conta_dao = ContaDAO()
-        self._cache_clientes_objetos = None
+        self._pessoa_dao = pessoa_dao or PessoaDAO()
+        self._conta_dao = conta_dao or ContaDAO()
+        self.arquivo_indice_contas = os.path.join(
+            os.path.dirname(self.arquivo_json), ARQUIVO_INDICE_CONTAS_CLIENTES
+        )
+        self._indice_contas: Optional[dict[str, str]] = None  # numero_conta -> numero_documento
+        self._assinatura_clientes_indice: Optional[list] = None  # Dados de clientes refletidos no índice
+        self._versoes_dependencias = self._versoes_atuais_dependencias()  # Caches usados pelos clientes em cache
+        self._assinatura_indice: Optional[tuple] = None
+        self._trava_indice = TravaArquivo(self.arquivo_indice_contas)
 
     def criar_objeto(self, dados: dict) -> Cliente:
         """
         Constrói um objeto Cliente a partir dos dados do JSON, incluindo as contas vinculadas.
         """
         pessoa = self._pessoa_dao.buscar_por_id(dados["numero_documento"])
-        todas_contas = {c.get_numero_conta(): c for c in self._conta_dao.listar_todos_objetos()}
+        contas = [self._conta_dao.buscar_por_id(n) for n in dados.get("contas", [])]
+        cliente = Cliente(pessoa=pessoa, senha=dados["senha"], contas=[c for c in contas if c is not None])
+        cliente._set_versao(dados.get("versao", 0))
+        return cliente
 
-        contas = []
-        for n in dados.get("contas", []):
-            try:
-                numero = int(n)
-                if numero in todas_contas:
-                    contas.append(todas_contas[numero])
-            except ValueError:
-                continue
+    def _criar_objetos_em_lote(self, dados: List[dict]) -> List[Cliente]:
+        """
+        Hidrata todos os clientes de uma vez: pessoas e contas são carregadas uma
+        única vez e cada cliente é montado com consultas aos índices em memória.
+        """
+        self._pessoa_dao.listar_todos_objetos()
+        self._conta_dao.listar_todos_objetos()
+        pessoas = self._pessoa_dao._indice_objetos
+        contas = self._conta_dao._indice_objetos
+        normalizar = self._normalizar_id
+
+        clientes = []
+        for item in dados:
+            contas_cliente = []
+            for numero in item.get("contas", []):
+                conta = contas.get(normalizar(numero))
+                if conta is not None:
+                    contas_cliente.append(conta)
 
-        return Cliente(pessoa=pessoa, senha=dados["senha"], contas=contas)
+            pessoa = pessoas.get(normalizar(item["numero_documento"]))
+            cliente = Cliente(pessoa=pessoa, senha=item["senha"], contas=contas_cliente)
+            cliente._set_versao(item.get("versao", 0))
+            clientes.append(cliente)
+        return clientes
+
+    def _verificar_coerencia(self) -> bool:
+        """
+        Descarta o cache de clientes também quando o cache de pessoas ou de contas foi
+        descartado (por qualquer caminho, desde que os clientes foram montados), já que
+        os clientes em cache referenciam aqueles objetos.
+        """
+        with self._trava:
+            self._pessoa_dao._verificar_coerencia()
+            self._conta_dao._verificar_coerencia()
+            if super()._verificar_coerencia():
+                return True
+            if self._versoes_dependencias != self._versoes_atuais_dependencias():
+                self.limpar_cache()
+                return True
+            return False
+
+    def _versoes_atuais_dependencias(self) -> tuple[int, int]:
+        return self._pessoa_dao.versao_cache, self._conta_dao.versao_cache
+
+    def limpar_cache(self) -> None:
+        """
+        Descarta os clientes em cache e o índice reverso em memória (relido do disco sob demanda).
+        """
+        with self._trava:
+            super().limpar_cache()
+            self._indice_contas = None
+            self._versoes_dependencias = self._versoes_atuais_dependencias()
 
     def extrair_dados_do_objeto(self, obj: Cliente) -> dict:
         """
@@ -47,6 +119,7 @@ class ClienteDAO(DAO):
             "numero_documento": obj.pessoa.get_numero_documento(),
             "senha": obj._senha,
             "contas": [str(c.get_numero_conta()) for c in obj.contas],
+            "versao": obj.get_versao(),
         }
 
     def tipo_de_id(self) -> str:
@@ -55,51 +128,201 @@ class ClienteDAO(DAO):
         """
         return "numero_documento"
 
-    def listar_todos_objetos(self) -> List[Cliente]:
+    @contextmanager
+    def _gravacao_de_clientes(self) -> Iterator[None]:
         """
-        Retorna todos os clientes armazenados, com suporte a cache.
+        Mantém a trava exclusiva do índice reverso durante uma gravação de clientes e
+        a atualização do índice que a segue. O índice é carregado (e validado contra
+        os dados de clientes) antes da gravação, que altera a assinatura dos dados.
         """
-        if self._cache_clientes_objetos is not None:
-            return self._cache_clientes_objetos
-
-        dados_raw = self._ler_dados_do_json()
-        self._cache_clientes_objetos = [self.criar_objeto(d) for d in dados_raw]
-        return self._cache_clientes_objetos
-
-    def buscar_por_id(self, id_valor: str) -> Optional[Cliente]:
-        """
-        Retorna o cliente com o documento informado.
-        """
-        return super().buscar_por_id(id_valor)
+        with self._trava, self._trava_indice.exclusiva():
+            self._obter_indice_contas()
+            yield
 
     def salvar_objeto(self, obj: Cliente) -> None:
         """
-        Salva um novo cliente e limpa o cache.
+        Salva um novo cliente e registra suas contas no índice reverso.
         """
-        super().salvar_objeto(obj)
-        self._cache_clientes_objetos = None
+        with self._gravacao_de_clientes():
+            super().salvar_objeto(obj)
+            self._reindexar_contas_do_cliente(obj.numero_documento, [], obj.contas)
 
     def atualizar_objeto(self, obj: Cliente) -> bool:
         """
-        Atualiza um cliente existente e limpa o cache.
+        Atualiza um cliente existente e sincroniza suas contas no índice reverso.
         """
-        resultado = super().atualizar_objeto(obj)
-        self._cache_clientes_objetos = None
-        return resultado
+        with self._gravacao_de_clientes():
+            anterior = self._motor.buscar(obj.numero_documento)
+            atualizado = super().atualizar_objeto(obj)
+            if atualizado:
+                contas_anteriores = anterior.get("contas", []) if anterior else []
+                self._reindexar_contas_do_cliente(obj.numero_documento, contas_anteriores, obj.contas)
+            return atualizado
 
     def deletar_objeto(self, id_valor: str) -> bool:
         """
-        Remove um cliente com base no número do documento e limpa o cache.
+        Remove um cliente e retira suas contas do índice reverso.
+        """
+        with self._gravacao_de_clientes():
+            anterior = self._motor.buscar(id_valor)
+            deletado = super().deletar_objeto(id_valor)
+            if deletado and anterior:
+                self._reindexar_contas_do_cliente(anterior["numero_documento"], anterior.get("contas", []), [])
+            return deletado
+
+    def aplicar_lote(self, operacoes: List[tuple]) -> None:
+        """
+        Persiste o lote de clientes e sincroniza o índice reverso com o estado final de cada um.
         """
-        resultado = super().deletar_objeto(id_valor)
-        self._cache_clientes_objetos = None
-        return resultado
+        with self._gravacao_de_clientes():
+            def documento(operacao, alvo) -> str:
+                return self._normalizar_id(alvo if operacao == MotorArmazenamento.OP_REMOVER else alvo.numero_documento)
+
+            anteriores = {}
+            for operacao, alvo in operacoes:
+                doc = documento(operacao, alvo)
+                if doc not in anteriores:
+                    registro = self._motor.buscar(doc)
+                    anteriores[doc] = registro.get("contas", []) if registro else []
+
+            super().aplicar_lote(operacoes)
+
+            finais = {
+                documento(operacao, alvo): [] if operacao == MotorArmazenamento.OP_REMOVER else alvo.contas
+                for operacao, alvo in operacoes
+            }
+            for doc, contas in finais.items():
+                self._reindexar_contas_do_cliente(doc, anteriores[doc], contas)
 
     def buscar_cliente_por_numero_conta(self, numero_conta: int) -> Optional[Cliente]:
         """
-        Retorna o cliente associado à conta informada.
+        Retorna o cliente associado à conta informada, consultando o índice reverso.
+        """
+        with self._trava:
+            numero_conta = self._normalizar_id(numero_conta)
+            documento = self._obter_indice_contas().get(numero_conta)
+            if documento is None and not self._indice_reflete_clientes():
+                # Clientes gravados sem o índice (ex.: processo interrompido entre os dois)
+                self.reconstruir_indice_contas()
+                documento = self._indice_contas.get(numero_conta)
+            if documento is None:
+                return None
+
+            dados = self._motor.buscar(documento)
+            if dados is None or numero_conta not in {self._normalizar_id(n) for n in dados.get("contas", [])}:
+                # Índice desatualizado (ex.: arquivo de clientes alterado fora do DAO)
+                self.reconstruir_indice_contas()
+                documento = self._indice_contas.get(numero_conta)
+                if documento is None:
+                    return None
+
+            return self.buscar_por_id(documento)
+
+    def documentos_das_contas(self, numeros_contas: Iterable) -> dict[str, Optional[str]]:
+        """
+        Retorna o documento do dono de cada conta informada, com uma única leitura do
+        índice reverso e sem carregar os clientes. Usado no processamento em lote.
+
+        Returns:
+            dict[str, Optional[str]]: Número normalizado da conta -> documento (None se
+            nenhum cliente tiver a conta).
+        """
+        with self._trava:
+            numeros = [self._normalizar_id(numero) for numero in numeros_contas]
+            indice = self._obter_indice_contas()
+            if any(numero not in indice for numero in numeros) and not self._indice_reflete_clientes():
+                self.reconstruir_indice_contas()
+                indice = self._indice_contas
+            return {numero: indice.get(numero) for numero in numeros}
+
+    # === Índice reverso conta -> cliente ===
+
+    def _obter_indice_contas(self) -> dict[str, str]:
+        """
+        Retorna o índice reverso, carregando do disco ou reconstruindo se necessário.
+        O índice em memória é relido quando o arquivo foi alterado por outro processo;
+        o arquivo é descartado se não corresponder aos dados de clientes atuais.
+        """
+        with self._trava_indice.compartilhada():
+            assinatura = self._motor.assinatura_arquivo(self.arquivo_indice_contas)
+            if self._indice_contas is not None and assinatura == self._assinatura_indice:
+                return self._indice_contas
+            try:
+                with open(self.arquivo_indice_contas, 'r', encoding='utf-8') as f:
+                    armazenado = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                armazenado = None
+
+            if isinstance(armazenado, dict) and armazenado.get("assinatura_clientes") == self._assinatura_clientes():
+                self._indice_contas = armazenado["contas"]
+                self._assinatura_clientes_indice = armazenado["assinatura_clientes"]
+                self._assinatura_indice = assinatura
+                return self._indice_contas
+
+        self.reconstruir_indice_contas()
+        return self._indice_contas
+
+    def _assinatura_clientes(self) -> list:
+        """
+        Retorna a assinatura atual dos dados de clientes, no formato gravado no índice (JSON).
+        """
+        return json.loads(json.dumps(self._motor.assinatura_dados()))
+
+    def _indice_reflete_clientes(self) -> bool:
+        """
+        Indica se o índice em memória foi gerado a partir dos dados de clientes atuais.
+        """
+        with self._trava_indice.compartilhada():
+            return self._assinatura_clientes_indice == self._assinatura_clientes()
+
+    def reconstruir_indice_contas(self) -> None:
+        """
+        Reconstrói o índice reverso a partir dos registros brutos de clientes e o persiste.
+        """
+        logger.info("Reconstruindo índice de contas por cliente.")
+        with self._trava_indice.exclusiva():
+            self._assinatura_clientes_indice = self._assinatura_clientes()
+            self._indice_contas = {
+                self._normalizar_id(numero): dados["numero_documento"]
+                for dados in self._ler_dados_do_json()
+                for numero in dados.get("contas", [])
+            }
+            self._salvar_indice_contas()
+
+    def _reindexar_contas_do_cliente(self, documento: str, contas_anteriores: list, contas_atuais: list) -> None:
+        """
+        Atualiza no índice reverso as contas de um cliente e persiste o resultado,
+        com a assinatura dos dados de clientes já gravados. Chamado sob a trava
+        exclusiva do índice, obtida antes da gravação dos clientes, para não perder
+        alterações feitas ao mesmo tempo por outro processo.
+
+        Se as contas do cliente não mudaram, o índice não é regravado; a assinatura
+        antiga faz com que ele seja reconstruído quando uma conta não for encontrada.
+        """
+        atuais = {self._normalizar_id(c.get_numero_conta()) for c in contas_atuais}
+        anteriores = {self._normalizar_id(n) for n in contas_anteriores}
+
+        with self._trava_indice.exclusiva():
+            indice = self._obter_indice_contas()
+            if atuais == anteriores and all(indice.get(n) == documento for n in atuais):
+                return
+
+            for numero in anteriores - atuais:
+                if indice.get(numero) == documento:
+                    del indice[numero]
+            for numero in atuais:
+                indice[numero] = documento
+
+            self._assinatura_clientes_indice = self._assinatura_clientes()
+            self._salvar_indice_contas()
+
+    def _salvar_indice_contas(self) -> None:
+        """
+        Grava o índice reverso em disco de forma atômica, com a mesma durabilidade
+        (fsync do arquivo e do diretório) configurada no motor de clientes.
         """
-        for cliente in self.listar_todos_objetos():
-            if any(str(c.get_numero_conta()) == str(numero_conta) for c in cliente.contas):
-                return cliente
-        return None
\ No newline at end of file
+        armazenado = {"assinatura_clientes": self._assinatura_clientes_indice, "contas": self._indice_contas}
+        temporario = self.arquivo_indice_contas + ".tmp"
+        self._motor._gravar_temporario(temporario, lambda f: json.dump(armazenado, f))
+        self._motor._instalar_arquivo(temporario, self.arquivo_indice_contas)
+        self._assinatura_indice = self._motor.assinatura_arquivo(self.arquivo_indice_contas)
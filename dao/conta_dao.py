@@ -1,27 +1,54 @@
+import os
+from contextlib import ExitStack
+from functools import partial
+from typing import Any, Callable, Iterable, Iterator, List, Optional
 from model.conta import Conta
+from model.transacao import TipoOperacao, Transacao
 from mapper.conta_mapper import ContaMapper
 from dao.dao import DAO
-from utils.constantes import ARQUIVO_CONTAS
+from dao.ledger_dao import LedgerDAO
+from utils.constantes import ARQUIVO_CONTAS, DIRETORIO_LEDGERS
+from utils.logger import logger
 
 
 class ContaDAO(DAO):
     """
     DAO responsável pela persistência de objetos do tipo Conta,
     como ContaCorrente e ContaPoupanca, no arquivo JSON de contas.
+
+    O histórico de cada conta fica fora do arquivo de contas, em um ledger
+    append-only (ver LedgerDAO): o registro guarda apenas a posição confirmada
+    no ledger, e o histórico é lido só quando get_historico é chamado.
+    Ao gravar uma conta, as operações pendentes são anexadas ao ledger antes do
+    registro; se a gravação do registro falhar, o trecho anexado é descartado.
+    O extrato pode ser lido em páginas, do fim do ledger para o início
+    (ver paginar_transacoes), ou por período, pelo índice temporal do ledger
+    (ver transacoes_do_periodo), ou percorrido sem cópias, para exportação (ver
+    iterar_transacoes). O saldo em uma data vem dos checkpoints de saldo
+    do ledger (ver saldo_em).
     """
 
     def __init__(self):
         """
-        Inicializa o DAO com cache local e caminho do arquivo JSON.
+        Inicializa o DAO com o caminho do arquivo JSON de contas e o diretório dos ledgers.
         """
         super().__init__(ARQUIVO_CONTAS)
-        self._cache_contas = None
+        self._ledger = LedgerDAO(
+            os.path.join(os.path.dirname(self.arquivo_json), DIRETORIO_LEDGERS),
+            self._motor.sincronizar_disco
+        )
 
     def criar_objeto(self, dados: dict) -> Conta:
         """
         Constrói uma instância de Conta a partir de um dicionário.
         """
-        return ContaMapper.from_dict(dados)
+        return self._ligar_ledger(ContaMapper.from_dict(dados))
+
+    def criar_objeto_armazenado(self, dados: dict) -> Conta:
+        """
+        Reconstrói uma instância de Conta persistida, sem revalidar os dados.
+        """
+        return self._ligar_ledger(ContaMapper.from_dict_armazenado(dados))
 
     def extrair_dados_do_objeto(self, conta: Conta) -> dict:
         """
@@ -35,45 +62,243 @@ class ContaDAO(DAO):
         """
         return "numero"
 
-    def listar_todos_objetos(self) -> list[Conta]:
+    def _ligar_ledger(self, conta: Conta) -> Conta:
         """
-        Retorna todas as contas armazenadas, com suporte a cache local.
+        Faz a conta ler seu histórico do ledger quando ele for pedido.
         """
-        if self._cache_contas is not None:
-            return self._cache_contas
+        conta._carregar_historico = partial(self._ledger.ler, conta.get_numero_conta())
+        return conta
 
-        dados = self._ler_dados_do_json()
-        self._cache_contas = [self.criar_objeto(d) for d in dados]
-        return self._cache_contas
+    def salvar_objeto(self, conta: Conta) -> None:
+        """
+        Salva uma nova conta, gravando seu histórico no ledger.
+        """
+        self._gravar_com_historico([conta], partial(super().salvar_objeto, conta))
 
-    def buscar_por_id(self, id_valor: str) -> Conta | None:
+    def atualizar_objeto(self, conta: Conta) -> bool:
         """
-        Retorna a conta correspondente ao número informado.
+        Atualiza uma conta existente, anexando ao ledger as operações pendentes.
         """
-        return next(
-            (c for c in self.listar_todos_objetos() if str(c.get_numero_conta()) == str(id_valor)),
-            None
-        )
+        return self._gravar_com_historico([conta], partial(super().atualizar_objeto, conta))
 
-    def salvar_objeto(self, conta: Conta) -> None:
+    def deletar_objeto(self, id_valor) -> bool:
         """
-        Salva uma nova conta e limpa o cache.
+        Remove uma conta e seu ledger.
         """
-        super().salvar_objeto(conta)
-        self._cache_contas = None
+        return self._gravar_com_historico([], partial(super().deletar_objeto, id_valor), [id_valor])
 
-    def atualizar_objeto(self, conta: Conta) -> bool:
+    def aplicar_lote(self, operacoes: List[tuple]) -> None:
+        """
+        Persiste o lote de contas, anexando antes aos ledgers as operações pendentes.
+        """
+        contas = [alvo for operacao, alvo in operacoes if operacao != self._motor.OP_REMOVER]
+        removidas = [alvo for operacao, alvo in operacoes if operacao == self._motor.OP_REMOVER]
+        self._gravar_com_historico(contas, partial(super().aplicar_lote, operacoes), removidas)
+
+    def migrar_historicos(self, tamanho_lote: int = 500) -> int:
+        """
+        Move para os ledgers os históricos ainda embutidos no arquivo de contas
+        (registros anteriores aos ledgers), gravando as contas em lotes.
+
+        Args:
+            tamanho_lote (int): Contas por lote (cada uma mantém um ledger travado).
+
+        Returns:
+            int: Quantidade de contas migradas.
+        """
+        legadas = [conta for conta in self.listar_todos_objetos() if conta._historico_pendente]
+        for inicio in range(0, len(legadas), tamanho_lote):
+            self.aplicar_lote([
+                (self._motor.OP_ATUALIZAR, conta) for conta in legadas[inicio:inicio + tamanho_lote]
+            ])
+        return len(legadas)
+
+    def paginar_transacoes(
+        self,
+        conta: Conta,
+        limite: int,
+        cursor: Optional[int] = None,
+        tipos: Optional[Iterable[TipoOperacao]] = None
+    ) -> tuple[List[Transacao], Optional[int]]:
+        """
+        Retorna uma página do histórico da conta, da transação mais recente para a
+        mais antiga, lendo o ledger de trás para frente só até completar a página.
+
+        O cursor é opaco: a posição da última transação da página no histórico (início
+        da linha no ledger ou, para operações ainda não gravadas, o tamanho confirmado
+        mais o índice na lista de pendentes).
+
+        Args:
+            conta (Conta): Conta consultada.
+            limite (int): Máximo de transações na página.
+            cursor (int, opcional): Cursor devolvido pela página anterior; None para
+                começar pela transação mais recente.
+            tipos (Iterable[TipoOperacao], opcional): Tipos incluídos; None para todos.
+
+        Returns:
+            tuple[list[Transacao], int | None]: Transações da página e o cursor da
+            próxima, ou None se o histórico terminou.
+
+        Raises:
+            ValueError: Se o cursor não corresponder a uma posição do histórico.
+        """
+        tipos = None if tipos is None else frozenset(tipos)
+        pagina = []
+        for posicao, transacao in self._transacoes_recentes(conta, cursor):
+            if tipos is None or transacao.tipo in tipos:
+                pagina.append(transacao)
+                if len(pagina) == limite:
+                    return pagina, posicao
+        return pagina, None
+
+    def transacoes_do_periodo(self, conta: Conta, inicio: int, fim: int) -> List[Transacao]:
+        """
+        Retorna as transações da conta com momento entre `inicio` e `fim` (inclusive),
+        em ordem: as gravadas, por busca binária no índice temporal do ledger, seguidas
+        das pendentes.
+
+        Args:
+            conta (Conta): Conta consultada.
+            inicio (int): Início do período, em segundos desde a época Unix.
+            fim (int): Fim do período, em segundos desde a época Unix.
+        """
+        tamanho, entradas = conta.get_ledger()
+        gravadas = self._ledger.ler_periodo(conta.get_numero_conta(), tamanho, entradas, inicio, fim)
+        return gravadas + [t for t in list(conta._historico_pendente) if inicio <= t.momento <= fim]
+
+    def iterar_transacoes(
+        self,
+        conta: Conta,
+        inicio: Optional[int] = None,
+        fim: Optional[int] = None
+    ) -> Iterator[tuple[int, Transacao]]:
+        """
+        Percorre, em ordem, as transações da conta com momento entre `inicio` e `fim`
+        (inclusive): as gravadas, lidas do ledger em blocos (ver LedgerDAO.iterar_periodo),
+        seguidas das pendentes. O histórico não é copiado para a memória, e a posição
+        confirmada é a do início da iteração.
+
+        Args:
+            conta (Conta): Conta consultada.
+            inicio (int, opcional): Início do período, em segundos desde a época Unix.
+                None para desde a primeira transação.
+            fim (int, opcional): Fim do período, em segundos desde a época Unix.
+                None para até a última transação.
+
+        Yields:
+            tuple[int, Transacao]: Número da operação no histórico da conta (a partir
+            de 0, estável entre consultas) e a transação.
+        """
+        tamanho, entradas = conta.get_ledger()
+        pendentes = list(conta._historico_pendente)
+        inicio = -2 ** 63 if inicio is None else inicio
+        fim = 2 ** 63 - 1 if fim is None else fim
+
+        yield from self._ledger.iterar_periodo(conta.get_numero_conta(), tamanho, entradas, inicio, fim)
+        for operacao, transacao in enumerate(pendentes, entradas):
+            if inicio <= transacao.momento <= fim:
+                yield operacao, transacao
+
+    def saldo_em(self, conta: Conta, momento: int) -> float:
+        """
+        Retorna o saldo da conta ao fim do segundo `momento`, a partir do checkpoint de
+        saldo mais próximo no ledger (ver LedgerDAO.saldo_em), considerando também as
+        operações pendentes.
+
+        Args:
+            conta (Conta): Conta consultada.
+            momento (int): Instante consultado, em segundos desde a época Unix.
+        """
+        pendentes = list(conta._historico_pendente)
+        confirmado = round(conta.get_saldo() * 100) - sum(t.efeito_centavos for t in pendentes)
+        saldo = self._ledger.saldo_em(conta.get_numero_conta(), conta.get_ledger()[0], confirmado, momento)
+        return (saldo + sum(t.efeito_centavos for t in pendentes if t.momento <= momento)) / 100
+
+    def _transacoes_recentes(self, conta: Conta, antes: Optional[int]) -> Iterator[tuple[int, Transacao]]:
+        """
+        Percorre o histórico da conta, da transação mais recente para a mais antiga,
+        a partir da posição `antes` (exclusiva): primeiro as operações pendentes,
+        depois o ledger. Gera (posição, transação); ver paginar_transacoes.
+        """
+        tamanho = conta.get_ledger()[0]
+        pendentes = list(conta._historico_pendente)
+        if antes is None:
+            antes = tamanho + len(pendentes)
+        elif not 0 <= antes <= tamanho + len(pendentes):
+            raise ValueError(f"Cursor inválido para o histórico da conta {conta.get_numero_conta()}: {antes}.")
+
+        for indice in range(antes - tamanho - 1, -1, -1):
+            yield tamanho + indice, pendentes[indice]
+        yield from self._ledger.ler_recentes(conta.get_numero_conta(), min(antes, tamanho))
+
+    def _gravar_com_historico(self, contas: List[Conta], gravar: Callable[[], Any], removidas: Iterable = ()) -> Any:
+        """
+        Anexa aos ledgers as operações pendentes das contas e então executa `gravar`,
+        que grava os registros com as novas posições. Todos os ledgers são gravados
+        antes de serem sincronizados com o disco, de uma vez (ver LedgerDAO.sincronizar_anexos). As travas dos ledgers envolvidos
+        são obtidas em ordem crescente de número e mantidas até o fim.
+
+        Se `gravar` falhar ou retornar False, os trechos anexados são descartados e as
+        contas voltam às posições anteriores; senão, os ledgers das contas `removidas`
+        são apagados.
+        """
+        pendentes = {
+            self._normalizar_id(conta.get_numero_conta()): conta
+            for conta in contas if conta._historico_pendente
+        }
+        removidas = {self._normalizar_id(numero) for numero in removidas}
+
+        with ExitStack() as travas:
+            for numero in sorted(pendentes.keys() | removidas, key=int):
+                travas.enter_context(self._ledger.trava(numero).exclusiva())
+
+            anexados = []  # (numero, conta, posição anterior da conta, início do trecho anexado)
+            try:
+                if pendentes:
+                    self._motor.sincronizar()  # Posições confirmadas por outros processos
+                for numero, conta in pendentes.items():
+                    tamanho, entradas = self._posicao_armazenada(numero)
+                    fim = self._ledger.anexar(
+                        numero, tamanho, conta._historico_pendente, entradas, round(conta.get_saldo() * 100),
+                        sincronizar=False
+                    )
+                    anexados.append((numero, conta, conta.get_ledger(), tamanho))
+                    conta._set_ledger(fim, entradas + len(conta._historico_pendente))
+                self._ledger.sincronizar_anexos(numero for numero, _, _, _ in anexados)
+
+                resultado = gravar()
+            except BaseException:
+                self._desfazer_anexos(anexados)
+                raise
+
+            if resultado is False:
+                self._desfazer_anexos(anexados)
+                return resultado
+
+            for _, conta, _, _ in anexados:
+                conta._confirmar_historico()
+                self._ligar_ledger(conta)
+            for numero in removidas:
+                self._ledger.remover(numero)
+            return resultado
+
+    def _posicao_armazenada(self, numero: str) -> tuple[int, int]:
         """
-        Atualiza uma conta existente e limpa o cache.
+        Retorna a posição do ledger gravada no registro da conta: (bytes, operações).
+        Registros antigos, com o histórico embutido, e contas novas começam em (0, 0).
         """
-        atualizado = super().atualizar_objeto(conta)
-        self._cache_contas = None
-        return atualizado
+        registro = self._motor.buscar(numero) or {}
+        ledger = registro.get("ledger") or {}
+        return int(ledger.get("tamanho", 0)), int(ledger.get("entradas", 0))
 
-    def deletar_objeto(self, id_valor: str) -> bool:
+    def _desfazer_anexos(self, anexados: List[tuple]) -> None:
         """
-        Remove uma conta com base no número e limpa o cache.
+        Descarta os trechos anexados e devolve as contas às posições anteriores.
+        Falhas aqui só deixam bytes além da posição confirmada, ignorados na leitura.
         """
-        deletado = super().deletar_objeto(id_valor)
-        self._cache_contas = None
-        return deletado
\ No newline at end of file
+        for numero, conta, posicao_anterior, inicio in anexados:
+            conta._set_ledger(*posicao_anterior)
+            try:
+                self._ledger.truncar(numero, inicio)
+            except OSError as e:
+                logger.warning(f"Falha ao descartar trecho não confirmado do ledger da conta {numero}: {e}")
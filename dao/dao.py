@@ -1,7 +1,11 @@
 from abc import ABC, abstractmethod
-import json
 import os
+import threading
 from typing import List, Optional, TypeVar, Generic
+from dao.motores.fabrica_motor import obter_motor
+from dao.motores.motor_armazenamento import MotorArmazenamento
+from model.exceptions import ConflitoVersaoError
+from utils.constantes import DIRETORIO_DATABASE
 
 T = TypeVar("T")  # Tipo genérico para entidades manipuladas pelo DAO
 
@@ -10,14 +14,43 @@ class DAO(ABC, Generic[T]):
     """
     Classe abstrata genérica para DAOs com persistência em arquivos JSON.
     Define a estrutura comum para salvar, buscar, atualizar e deletar entidades.
+
+    A leitura e a escrita dos registros são delegadas a um motor de armazenamento
+    (ver dao/motores), escolhido em MOTOR_ARMAZENAMENTO.
+
+    O DAO funciona como mapa de identidade: enquanto o cache não é limpo, cada
+    identificador corresponde a um único objeto, seja ele obtido por buscar_por_id
+    ou por listar_todos_objetos. Para compartilhar esses objetos entre controladores,
+    use as instâncias de RegistroDAO.
+
+    Antes de reutilizar o cache, o DAO pede ao motor que verifique alterações externas
+    (outro processo ou outra instância de DAO) e compara a geração do motor com a do
+    cache; se mudou por obra de outro autor, o cache é descartado e recarregado sob demanda.
+
+    As operações públicas são protegidas por uma trava reentrante, já que as
+    instâncias compartilhadas do RegistroDAO são usadas por várias threads. A trava
+    não é mantida durante a gravação no motor, para que escritas simultâneas possam
+    ser agrupadas (DURABILIDADE_GRUPO); as gerações produzidas pelo próprio DAO
+    (autor=self) são reconhecidas e não invalidam o cache.
+
+    Cada registro gravado leva uma versão (MotorArmazenamento.CAMPO_VERSAO), lida
+    para o objeto pelo mapper. Ao gravar, o DAO envia a versão seguinte e o motor só
+    aceita se a armazenada ainda for a lida; senão lança ConflitoVersaoError, o cache
+    é descartado e quem chamou pode reler os objetos e repetir a operação.
     """
 
     def __init__(self, arquivo_json: str):
         """
         Inicializa o DAO com o caminho do arquivo JSON de armazenamento.
         """
-        self.arquivo_json = os.path.join("database", arquivo_json)
-        self._cache_local = None  # Cache opcional de leitura
+        self.arquivo_json = os.path.join(DIRETORIO_DATABASE, arquivo_json)
+        self._motor = obter_motor(self.arquivo_json, self.tipo_de_id())
+        self._trava = threading.RLock()
+        self._cache_local = None  # Lista de objetos carregados (None = não carregado)
+        self._indice_objetos: dict[str, T] = {}    # id normalizado -> objeto (mapa de identidade)
+        self._indice_posicoes: dict[str, int] = {}  # id normalizado -> posição em _cache_local
+        self._geracao_cache = self._motor.geracao   # Geração do motor refletida no cache
+        self.versao_cache = 0  # Incrementada sempre que o cache é descartado
 
     @abstractmethod
     def criar_objeto(self, data: dict) -> T:
@@ -26,6 +59,15 @@ class DAO(ABC, Generic[T]):
         """
         pass
 
+    def criar_objeto_armazenado(self, data: dict) -> T:
+        """
+        Converte um registro lido do armazenamento em uma instância da entidade.
+
+        Por padrão equivale a criar_objeto; subclasses podem sobrescrever para
+        confiar nos dados persistidos e pular validações.
+        """
+        return self.criar_objeto(data)
+
     @abstractmethod
     def extrair_dados_do_objeto(self, obj: T) -> dict:
         """
@@ -42,80 +84,264 @@ class DAO(ABC, Generic[T]):
 
     def _ler_dados_do_json(self) -> List[dict]:
         """
-        Lê o conteúdo do JSON, retornando uma lista de dicionários.
-        Retorna lista vazia se o arquivo não existir ou estiver corrompido.
+        Retorna todos os registros armazenados, como lista de dicionários.
+        Retorna lista vazia se não houver dados.
         """
-        try:
-            with open(self.arquivo_json, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
+        return self._motor.listar()
 
     def _salvar_no_arquivo_json(self, dados: List[dict]) -> None:
         """
-        Salva uma lista de dicionários no arquivo JSON.
+        Substitui todos os registros armazenados pela lista informada.
         """
-        with open(self.arquivo_json, 'w', encoding='utf-8') as f:
-            json.dump(dados, f, indent=4)
+        self._motor.substituir_todos(dados)
 
-    def listar_todos_objetos(self) -> List[T]:
+    def _dados_para_gravacao(self, obj: T) -> dict:
+        """
+        Converte a entidade para persistência, com a versão seguinte à lida do armazenamento.
+        """
+        dados = self.extrair_dados_do_objeto(obj)
+        dados[MotorArmazenamento.CAMPO_VERSAO] = dados.get(MotorArmazenamento.CAMPO_VERSAO, 0) + 1
+        return dados
+
+    def _normalizar_id(self, id_valor) -> str:
+        """
+        Normaliza um identificador para uso como chave dos índices.
         """
-        Retorna todas as entidades salvas no JSON.
+        return self._motor.normalizar_id(id_valor)
+
+    def _verificar_coerencia(self) -> bool:
         """
+        Descarta o cache se os dados do motor mudaram desde que ele foi montado.
+
+        Returns:
+            bool: True se o cache foi descartado.
+        """
+        self._motor.sincronizar()
+        geracao = self._motor.geracao
+        if geracao == self._geracao_cache:
+            return False
+        descartar = not self._motor.alterado_apenas_por(self, self._geracao_cache)
+        if descartar:
+            self.limpar_cache()
+        self._geracao_cache = geracao
+        return descartar
+
+    def _carregar_cache(self) -> None:
+        """
+        Carrega todos os objetos e constrói os índices por identificador.
+        Objetos já entregues por buscar_por_id são reaproveitados, preservando a identidade.
+        """
+        chave = self.tipo_de_id()
         dados = self._ler_dados_do_json()
-        return [self.criar_objeto(item) for item in dados]
+        ids = [self._normalizar_id(item.get(chave)) for item in dados]
+        existentes = self._indice_objetos
+
+        novos = iter(self._criar_objetos_em_lote(
+            [item for item, id_valor in zip(dados, ids) if id_valor not in existentes]
+        ))
+        objetos = [existentes[id_valor] if id_valor in existentes else next(novos) for id_valor in ids]
+
+        indice_objetos = {}
+        indice_posicoes = {}
+        for posicao, (id_valor, obj) in enumerate(zip(ids, objetos)):
+            indice_objetos[id_valor] = obj
+            indice_posicoes[id_valor] = posicao
+
+        self._cache_local = objetos
+        self._indice_objetos = indice_objetos
+        self._indice_posicoes = indice_posicoes
+
+    def _criar_objetos_em_lote(self, dados: List[dict]) -> List[T]:
+        """
+        Converte todos os registros em objetos, na mesma ordem.
+        Subclasses podem sobrescrever para carregar dependências uma única vez.
+        """
+        return [self.criar_objeto_armazenado(item) for item in dados]
+
+    def limpar_cache(self) -> None:
+        """
+        Descarta os objetos carregados e os índices.
+        """
+        with self._trava:
+            self._cache_local = None
+            self._indice_objetos = {}
+            self._indice_posicoes = {}
+            self.versao_cache += 1
+
+    def listar_todos_objetos(self) -> List[T]:
+        """
+        Retorna todas as entidades salvas, com suporte a cache.
+        """
+        with self._trava:
+            self._verificar_coerencia()
+            if self._cache_local is None:
+                self._carregar_cache()
+            return self._cache_local
 
     def buscar_por_id(self, id_valor) -> Optional[T]:
         """
         Retorna a entidade correspondente ao identificador fornecido.
+
+        Com o cache carregado, a busca é feita no índice em memória; caso contrário,
+        apenas o registro pedido é lido do motor de armazenamento e o objeto criado
+        passa a ser devolvido nas próximas buscas pelo mesmo identificador.
         """
-        for item in self._ler_dados_do_json():
-            if str(item.get(self.tipo_de_id())) == str(id_valor):
-                return self.criar_objeto(item)
-        return None
+        with self._trava:
+            self._verificar_coerencia()
+            id_normalizado = self._normalizar_id(id_valor)
+            obj = self._indice_objetos.get(id_normalizado)
+            if obj is not None or self._cache_local is not None:
+                return obj
+
+            item = self._motor.buscar(id_normalizado)
+            if item is None:
+                return None
+
+            obj = self.criar_objeto_armazenado(item)
+            self._indice_objetos[id_normalizado] = obj
+            return obj
 
     def salvar_objeto(self, obj: T) -> None:
         """
-        Salva um novo objeto no JSON, desde que não haja duplicação de ID.
+        Salva um novo objeto, desde que não haja duplicação de ID.
+
+        Raises:
+            ValueError: Se já existir objeto com o mesmo identificador.
         """
-        dados = self._ler_dados_do_json()
-        novo = self.extrair_dados_do_objeto(obj)
-        chave = self.tipo_de_id()
+        with self._trava:
+            self._verificar_coerencia()
+            dados = self._dados_para_gravacao(obj)
 
-        if any(item.get(chave) == novo[chave] for item in dados):
-            raise ValueError(f"Objeto com {chave} = '{novo[chave]}' já existe.")
+        self._motor.inserir(dados, autor=self)
 
-        dados.append(novo)
-        self._salvar_no_arquivo_json(dados)
+        with self._trava:
+            obj._set_versao(dados[MotorArmazenamento.CAMPO_VERSAO])
+            self._verificar_coerencia()
+            self._cache_inserir(self._normalizar_id(dados[self.tipo_de_id()]), obj)
 
     def atualizar_objeto(self, obj: T) -> bool:
         """
         Atualiza um objeto existente com base em seu identificador.
         Retorna True se atualizado com sucesso, False se não encontrado.
+
+        Raises:
+            ConflitoVersaoError: Se o registro foi gravado por outra operação depois que
+                o objeto foi lido. O cache é descartado; releia o objeto antes de repetir.
         """
-        dados = self._ler_dados_do_json()
-        id_chave = self.tipo_de_id()
-        novo_dado = self.extrair_dados_do_objeto(obj)
-        id_valor = novo_dado[id_chave]
+        with self._trava:
+            self._verificar_coerencia()
+            dados = self._dados_para_gravacao(obj)
 
-        for i, item in enumerate(dados):
-            if item.get(id_chave) == id_valor:
-                dados[i] = novo_dado
-                self._salvar_no_arquivo_json(dados)
-                return True
+        try:
+            if not self._motor.atualizar(dados, autor=self):
+                return False
+        except ConflitoVersaoError:
+            self.limpar_cache()
+            raise
 
-        return False
+        with self._trava:
+            obj._set_versao(dados[MotorArmazenamento.CAMPO_VERSAO])
+            self._verificar_coerencia()
+            self._cache_atualizar(self._normalizar_id(dados[self.tipo_de_id()]), obj)
+            return True
 
     def deletar_objeto(self, id_valor) -> bool:
         """
         Remove um objeto com o ID fornecido.
         Retorna True se a exclusão for bem-sucedida, False se não encontrado.
         """
-        dados = self._ler_dados_do_json()
-        novo_dados = [item for item in dados if item.get(self.tipo_de_id()) != id_valor]
-
-        if len(novo_dados) == len(dados):
+        if not self._motor.remover(id_valor, autor=self):
             return False
 
-        self._salvar_no_arquivo_json(novo_dados)
-        return True
+        with self._trava:
+            self._verificar_coerencia()
+            self._cache_remover(self._normalizar_id(id_valor))
+            return True
+
+    def aplicar_lote(self, operacoes: List[tuple]) -> None:
+        """
+        Persiste várias alterações em uma única escrita atômica do motor.
+        Normalmente chamado pela UnidadeDeTrabalho, não diretamente.
+
+        Args:
+            operacoes (list[tuple]): Pares (operação, objeto) para OP_INSERIR e OP_ATUALIZAR,
+                ou (OP_REMOVER, identificador), com as constantes do motor de armazenamento.
+
+        Raises:
+            ValueError: Se o lote for inválido (ver MotorArmazenamento.aplicar_lote).
+                Nesse caso nada é gravado e o cache não é alterado.
+            ConflitoVersaoError: Se algum objeto foi gravado por outra operação depois
+                de lido. Nada é gravado e o cache é descartado.
+        """
+        with self._trava:
+            self._verificar_coerencia()
+            lote = []
+            for operacao, alvo in operacoes:
+                if operacao == self._motor.OP_REMOVER:
+                    lote.append((operacao, alvo))
+                else:
+                    lote.append((operacao, self._dados_para_gravacao(alvo)))
+
+        try:
+            self._motor.aplicar_lote(lote, autor=self)
+        except ConflitoVersaoError:
+            self.limpar_cache()
+            raise
+
+        with self._trava:
+            self._verificar_coerencia()
+            for (operacao, alvo), (_, dado) in zip(operacoes, lote):
+                if operacao == self._motor.OP_REMOVER:
+                    self._cache_remover(self._normalizar_id(dado))
+                    continue
+                alvo._set_versao(dado[MotorArmazenamento.CAMPO_VERSAO])
+                if operacao == self._motor.OP_ATUALIZAR:
+                    self._cache_atualizar(self._normalizar_id(dado[self.tipo_de_id()]), alvo)
+                else:
+                    self._cache_inserir(self._normalizar_id(dado[self.tipo_de_id()]), alvo)
+
+    # === Manutenção do cache após escritas ===
+
+    def _cache_inserir(self, id_valor: str, obj: T) -> None:
+        """
+        Acrescenta um objeto recém-salvo ao mapa de identidade e, se carregado, ao cache.
+        Se o cache foi recarregado depois da gravação, o registro já está nele e só o
+        objeto é substituído.
+        """
+        if id_valor in self._indice_posicoes:
+            self._cache_atualizar(id_valor, obj)
+            return
+        self._indice_objetos[id_valor] = obj
+        if self._cache_local is not None:
+            self._indice_posicoes[id_valor] = len(self._cache_local)
+            self._cache_local.append(obj)
+
+    def _cache_atualizar(self, id_valor: str, obj: T) -> None:
+        """
+        Substitui o objeto atualizado no mapa de identidade e, se carregado, no cache.
+        """
+        if self._cache_local is None:
+            self._indice_objetos[id_valor] = obj
+            return
+
+        posicao = self._indice_posicoes.get(id_valor)
+        if posicao is None:
+            self.limpar_cache()
+        else:
+            self._cache_local[posicao] = obj
+            self._indice_objetos[id_valor] = obj
+
+    def _cache_remover(self, id_valor: str) -> None:
+        """
+        Retira o objeto removido do mapa de identidade e, se carregado, do cache.
+        """
+        self._indice_objetos.pop(id_valor, None)
+        if self._cache_local is not None:
+            posicao = self._indice_posicoes.pop(id_valor, None)
+            if posicao is None:
+                self.limpar_cache()
+            else:
+                del self._cache_local[posicao]
+                for id_seguinte, pos in self._indice_posicoes.items():
+                    if pos > posicao:
+                        self._indice_posicoes[id_seguinte] = pos - 1
@@ -0,0 +1,550 @@
+import json
+import os
+import struct
+import threading
+from datetime import date
+from bisect import bisect_left, bisect_right
+from typing import BinaryIO, Iterable, Iterator, List
+from dao.motores.motor_armazenamento import MotorArmazenamento
+from dao.motores.trava_arquivo import TravaArquivo
+from mapper.transacao_mapper import TransacaoMapper
+from model.transacao import Transacao
+from utils.constantes import OPERACOES_POR_CHECKPOINT_SALDO
+from utils.logger import logger
+
+
+class LedgerDAO:
+    """
+    Ledgers append-only com o histórico das contas: um arquivo por conta
+    ("<numero>.ledger" no diretório de ledgers), com uma transação por linha, em JSON
+    (ver TransacaoMapper).
+
+    O registro da conta guarda a posição confirmada no ledger (bytes e operações).
+    Só vale o que está antes dela: bytes além da posição são de uma gravação que
+    falhou ou foi interrompida, e a próxima gravação da conta os descarta. Como o
+    trecho confirmado nunca é alterado, a leitura não usa trava.
+
+    As gravações de uma mesma conta são serializadas, entre threads e processos,
+    pela trava do ledger (ver trava()), que deve ser mantida até o registro da
+    conta com a nova posição ser gravado.
+
+    Cada ledger tem um índice temporal ("<numero>.indice"): um registro binário de
+    tamanho fixo por transação, com o momento e o início da linha no ledger, na
+    mesma ordem. Como o histórico é anexado em ordem de tempo, consultas por período
+    fazem busca binária no índice (ver ler_periodo). O índice é atualizado junto com
+    o ledger e, se estiver ausente ou incompleto, é reconstruído a partir dele.
+
+    Os checkpoints de saldo ("<numero>.saldos") guardam o saldo antes da primeira
+    operação de cada dia e a cada OPERACOES_POR_CHECKPOINT operações, para que o
+    saldo em uma data seja calculado reaplicando só as operações desde o checkpoint
+    mais próximo (ver saldo_em).
+    """
+
+    EXTENSAO = ".ledger"
+    EXTENSAO_INDICE = ".indice"
+    REGISTRO_INDICE = struct.Struct("<qq")  # (momento, início da linha no ledger)
+    EXTENSAO_SALDOS = ".saldos"
+    REGISTRO_SALDO = struct.Struct("<qqqq")  # (momento, início da linha, nº da operação, saldo em centavos)
+    OPERACOES_POR_CHECKPOINT = OPERACOES_POR_CHECKPOINT_SALDO
+    TAMANHO_BLOCO = 64 * 1024  # Bytes lidos por vez na leitura de trás para frente
+
+    def __init__(self, diretorio: str, sincronizar_disco: bool = True):
+        """
+        Args:
+            diretorio (str): Diretório dos ledgers (criado se necessário).
+            sincronizar_disco (bool): Se True, cada gravação é confirmada com fsync.
+        """
+        self.diretorio = diretorio
+        self.sincronizar_disco = sincronizar_disco
+        self._travas: dict[str, TravaArquivo] = {}
+        self._trava_dicionario = threading.Lock()
+        os.makedirs(diretorio, exist_ok=True)
+
+    def caminho(self, numero) -> str:
+        """
+        Retorna o caminho do ledger da conta.
+        """
+        return os.path.join(self.diretorio, f"{MotorArmazenamento.normalizar_id(numero)}{self.EXTENSAO}")
+
+    def caminho_indice(self, numero) -> str:
+        """
+        Retorna o caminho do índice temporal do ledger da conta.
+        """
+        return os.path.join(self.diretorio, f"{MotorArmazenamento.normalizar_id(numero)}{self.EXTENSAO_INDICE}")
+
+    def caminho_saldos(self, numero) -> str:
+        """
+        Retorna o caminho dos checkpoints de saldo do ledger da conta.
+        """
+        return os.path.join(self.diretorio, f"{MotorArmazenamento.normalizar_id(numero)}{self.EXTENSAO_SALDOS}")
+
+    def trava(self, numero) -> TravaArquivo:
+        """
+        Retorna a trava de gravação do ledger da conta.
+        """
+        numero = MotorArmazenamento.normalizar_id(numero)
+        with self._trava_dicionario:
+            trava = self._travas.get(numero)
+            if trava is None:
+                trava = self._travas[numero] = TravaArquivo(self.caminho(numero))
+            return trava
+
+    def ler(self, numero, tamanho: int) -> List[Transacao]:
+        """
+        Retorna as transações confirmadas do ledger, em ordem.
+
+        Args:
+            numero: Número da conta.
+            tamanho (int): Bytes confirmados (posição guardada no registro da conta).
+
+        Raises:
+            ValueError: Se o ledger tiver menos bytes do que a posição confirmada.
+        """
+        if tamanho == 0:
+            return []
+        try:
+            with open(self.caminho(numero), 'rb') as f:
+                conteudo = f.read(tamanho)
+        except FileNotFoundError:
+            conteudo = b""
+        if len(conteudo) < tamanho:
+            raise ValueError(f"Ledger da conta {numero} incompleto: {len(conteudo)} de {tamanho} bytes.")
+        return [TransacaoMapper.from_registro(json.loads(linha)) for linha in conteudo.decode('utf-8').splitlines()]
+
+    def ler_recentes(self, numero, fim: int) -> Iterator[tuple[int, Transacao]]:
+        """
+        Percorre as transações do ledger da mais recente para a mais antiga, a partir
+        de `fim`, lendo o arquivo em blocos de trás para frente: quem para no meio
+        (ex.: uma página do extrato) não lê o início do ledger.
+
+        Args:
+            numero: Número da conta.
+            fim (int): Posição (em bytes) onde começar: a confirmada, ou o início de
+                uma linha já percorrida.
+
+        Yields:
+            tuple[int, Transacao]: Posição do início da linha e a transação.
+
+        Raises:
+            ValueError: Se o ledger tiver menos bytes do que `fim` ou se `fim`
+                não estiver no fim de uma linha.
+        """
+        if fim == 0:
+            return
+        try:
+            arquivo = open(self.caminho(numero), 'rb')
+        except FileNotFoundError:
+            raise ValueError(f"Ledger da conta {numero} incompleto: 0 de {fim} bytes.")
+
+        with arquivo:
+            posicao = fim
+            resto = b""  # Início da linha que começa no bloco anterior do arquivo
+            while posicao > 0:
+                inicio = max(0, posicao - self.TAMANHO_BLOCO)
+                arquivo.seek(inicio)
+                bloco = arquivo.read(posicao - inicio)
+                if len(bloco) < posicao - inicio:
+                    raise ValueError(f"Ledger da conta {numero} incompleto: {inicio + len(bloco)} de {fim} bytes.")
+                if posicao == fim and not bloco.endswith(b"\n"):
+                    raise ValueError(f"Posição {fim} não é o fim de uma linha do ledger da conta {numero}.")
+
+                linhas = (bloco + resto).split(b"\n")
+                inicios = [inicio]
+                for linha in linhas[:-1]:
+                    inicios.append(inicios[-1] + len(linha) + 1)
+
+                primeira = 1 if inicio > 0 else 0
+                for indice in range(len(linhas) - 1, primeira - 1, -1):
+                    if linhas[indice]:
+                        yield inicios[indice], TransacaoMapper.from_registro(json.loads(linhas[indice]))
+                resto = linhas[0] if inicio > 0 else b""
+                posicao = inicio
+
+    def ler_periodo(self, numero, tamanho: int, entradas: int, inicio: int, fim: int) -> List[Transacao]:
+        """
+        Retorna as transações confirmadas com momento entre `inicio` e `fim` (inclusive),
+        em ordem (ver iterar_periodo).
+
+        Raises:
+            ValueError: Se o ledger tiver menos bytes do que a posição confirmada.
+        """
+        return [transacao for _, transacao in self.iterar_periodo(numero, tamanho, entradas, inicio, fim)]
+
+    def iterar_periodo(self, numero, tamanho: int, entradas: int, inicio: int, fim: int) -> Iterator[tuple[int, Transacao]]:
+        """
+        Percorre, em ordem, as transações confirmadas com momento entre `inicio` e `fim`
+        (inclusive). A busca binária no índice temporal faz O(log n) leituras de
+        registros do índice; do ledger, só o trecho do período é lido, em blocos, de
+        modo que a memória usada não depende do tamanho do período.
+
+        Args:
+            numero: Número da conta.
+            tamanho (int): Bytes confirmados (posição guardada no registro da conta).
+            entradas (int): Operações confirmadas no ledger.
+            inicio (int): Início do período, em segundos desde a época Unix.
+            fim (int): Fim do período, em segundos desde a época Unix.
+
+        Yields:
+            tuple[int, Transacao]: Número da operação no ledger (a partir de 0) e a transação.
+
+        Raises:
+            ValueError: Se o ledger tiver menos bytes do que a posição confirmada.
+        """
+        if entradas == 0 or inicio > fim:
+            return
+        indice = self._abrir_indice(numero, tamanho, entradas)
+        with indice:
+            momentos = _ColunaIndice(indice, self.REGISTRO_INDICE, 0, entradas)
+            posicoes = _ColunaIndice(indice, self.REGISTRO_INDICE, 1, entradas)
+            primeira = bisect_left(momentos, inicio)
+            ultima = bisect_right(momentos, fim, primeira)
+            if primeira == ultima:
+                return
+            de = posicoes[primeira]
+            ate = posicoes[ultima] if ultima < entradas else tamanho
+
+        for operacao, transacao in enumerate(self._ler_a_partir(numero, de, ate), primeira):
+            if inicio <= transacao.momento <= fim:
+                yield operacao, transacao
+
+    def saldo_em(self, numero, tamanho: int, saldo_centavos: int, momento: int) -> int:
+        """
+        Retorna o saldo da conta ao fim do segundo `momento`, em centavos.
+
+        Parte do último checkpoint de saldo anterior a `momento` e reaplica as operações
+        seguintes até ele. Se não houver checkpoint anterior (ex.: ledgers gravados antes
+        dos checkpoints), desfaz as operações posteriores a `momento`, de trás para
+        frente, a partir do primeiro checkpoint ou do fim do trecho confirmado.
+
+        Args:
+            numero: Número da conta.
+            tamanho (int): Bytes confirmados (posição guardada no registro da conta).
+            saldo_centavos (int): Saldo após a última operação confirmada.
+            momento (int): Instante consultado, em segundos desde a época Unix.
+        """
+        posicao, saldo = tamanho, saldo_centavos
+        try:
+            arquivo = open(self.caminho_saldos(numero), 'rb')
+        except FileNotFoundError:
+            arquivo = None
+
+        if arquivo is not None:
+            with arquivo:
+                validos = self._registros_antes(arquivo, tamanho, self.REGISTRO_SALDO)
+                anterior = bisect_right(_ColunaIndice(arquivo, self.REGISTRO_SALDO, 0, validos), momento) - 1
+                if anterior >= 0:
+                    _, posicao, _, saldo = _ler_registro(arquivo, self.REGISTRO_SALDO, anterior)
+                    for transacao in self._ler_a_partir(numero, posicao, tamanho):
+                        if transacao.momento > momento:
+                            break
+                        saldo += transacao.efeito_centavos
+                    return saldo
+                if validos:
+                    _, posicao, _, saldo = _ler_registro(arquivo, self.REGISTRO_SALDO, 0)
+
+        for _, transacao in self.ler_recentes(numero, posicao):
+            if transacao.momento <= momento:
+                break
+            saldo -= transacao.efeito_centavos
+        return saldo
+
+    def anexar(
+        self,
+        numero,
+        inicio: int,
+        transacoes: List[Transacao],
+        entradas: int,
+        saldo_centavos: int,
+        sincronizar: bool = True
+    ) -> int:
+        """
+        Grava as transações a partir da posição confirmada `inicio`, descartando o que
+        houver depois dela, e as acrescenta ao índice temporal e aos checkpoints de
+        saldo. Deve ser chamado com a trava exclusiva do ledger.
+
+        Com sincronizar=False, nada é sincronizado com o disco: quem grava vários
+        ledgers de uma vez chama sincronizar_anexos ao fim, antes de gravar as novas
+        posições nos registros das contas.
+
+        Args:
+            numero: Número da conta.
+            inicio (int): Posição confirmada (em bytes).
+            transacoes (list[Transacao]): Operações a gravar.
+            entradas (int): Operações confirmadas antes de `inicio`.
+            saldo_centavos (int): Saldo da conta após a última das transações.
+            sincronizar (bool): Se False, não faz fsync (ver sincronizar_anexos).
+
+        Returns:
+            int: Nova posição (em bytes), a ser gravada no registro da conta.
+
+        Raises:
+            ValueError: Se o ledger tiver menos bytes do que a posição confirmada.
+        """
+        caminho = self.caminho(numero)
+        sincronizar = sincronizar and self.sincronizar_disco
+        linhas = [
+            (json.dumps(TransacaoMapper.to_registro(t), ensure_ascii=False) + "\n").encode('utf-8')
+            for t in transacoes
+        ]
+        conteudo = b"".join(linhas)
+        novo = not os.path.exists(caminho)
+
+        descritor = os.open(caminho, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            tamanho_atual = os.fstat(descritor).st_size
+            if tamanho_atual < inicio:
+                raise ValueError(f"Ledger da conta {numero} incompleto: {tamanho_atual} de {inicio} bytes.")
+            if tamanho_atual > inicio:
+                os.ftruncate(descritor, inicio)
+            os.lseek(descritor, inicio, os.SEEK_SET)
+            while conteudo:
+                conteudo = conteudo[os.write(descritor, conteudo):]
+            if sincronizar:
+                os.fsync(descritor)
+            fim = os.lseek(descritor, 0, os.SEEK_CUR)
+        finally:
+            os.close(descritor)
+
+        posicoes = []
+        posicao = inicio
+        for linha in linhas:
+            posicoes.append(posicao)
+            posicao += len(linha)
+        anterior = self._anexar_ao_indice(
+            numero, inicio, [(t.momento, p) for t, p in zip(transacoes, posicoes)], sincronizar
+        )
+        self._anexar_checkpoints(numero, inicio, entradas, transacoes, posicoes, saldo_centavos, anterior, sincronizar)
+
+        if novo and sincronizar:
+            MotorArmazenamento.sincronizar_diretorio(caminho)
+        return fim
+
+    def sincronizar_anexos(self, numeros: Iterable) -> None:
+        """
+        Sincroniza com o disco os ledgers gravados por anexar com sincronizar=False:
+        um fsync por arquivo (ledger, índice temporal e checkpoints de saldo) e um
+        único fsync do diretório, para os ledgers criados.
+        """
+        if not self.sincronizar_disco:
+            return
+        numeros = list(numeros)
+        for numero in numeros:
+            for caminho in (self.caminho(numero), self.caminho_indice(numero), self.caminho_saldos(numero)):
+                descritor = os.open(caminho, os.O_RDONLY)
+                try:
+                    os.fsync(descritor)
+                finally:
+                    os.close(descritor)
+        if numeros:
+            MotorArmazenamento.sincronizar_diretorio(self.caminho(numeros[0]))
+
+    def truncar(self, numero, tamanho: int) -> None:
+        """
+        Descarta o que houver após `tamanho` (ex.: gravação cujo registro não foi confirmado),
+        no ledger, no índice temporal e nos checkpoints de saldo. Deve ser chamado com a
+        trava exclusiva do ledger.
+        """
+        try:
+            with open(self.caminho(numero), 'r+b') as f:
+                f.truncate(tamanho)
+        except FileNotFoundError:
+            return
+        for caminho, registro in (
+            (self.caminho_indice(numero), self.REGISTRO_INDICE),
+            (self.caminho_saldos(numero), self.REGISTRO_SALDO)
+        ):
+            try:
+                with open(caminho, 'r+b') as f:
+                    f.truncate(self._registros_antes(f, tamanho, registro) * registro.size)
+            except FileNotFoundError:
+                pass
+
+    def remover(self, numero) -> None:
+        """
+        Apaga o ledger da conta, seu índice e seus checkpoints de saldo.
+        Deve ser chamado com a trava exclusiva do ledger.
+        """
+        for caminho in (self.caminho(numero), self.caminho_indice(numero), self.caminho_saldos(numero)):
+            try:
+                os.remove(caminho)
+            except FileNotFoundError:
+                pass
+
+    def _anexar_ao_indice(self, numero, inicio: int, registros: List[tuple[int, int]], sincronizar: bool) -> int:
+        """
+        Descarta do índice os registros a partir de `inicio` (posição no ledger) e grava
+        os novos (momento, posição). As chaves do índice nunca decrescem: uma transação
+        com momento anterior ao da última (relógio ajustado para trás) é indexada com o
+        momento da última.
+
+        Returns:
+            int: Chave do último registro anterior a `inicio` (0 se não houver).
+        """
+        descritor = os.open(self.caminho_indice(numero), os.O_RDWR | os.O_CREAT, 0o644)
+        with os.fdopen(descritor, 'r+b') as f:
+            validos = self._registros_antes(f, inicio)
+            anterior = _ler_registro(f, self.REGISTRO_INDICE, validos - 1)[0] if validos else 0
+            chave_inicial = anterior
+            dados = bytearray()
+            for momento, posicao in registros:
+                anterior = max(anterior, momento)
+                dados += self.REGISTRO_INDICE.pack(anterior, posicao)
+            f.truncate(validos * self.REGISTRO_INDICE.size)
+            f.seek(validos * self.REGISTRO_INDICE.size)
+            f.write(dados)
+            f.flush()
+            if sincronizar:
+                os.fsync(f.fileno())
+        return chave_inicial
+
+    def _anexar_checkpoints(
+        self,
+        numero,
+        inicio: int,
+        entradas: int,
+        transacoes: List[Transacao],
+        posicoes: List[int],
+        saldo_centavos: int,
+        anterior: int,
+        sincronizar: bool
+    ) -> None:
+        """
+        Descarta os checkpoints a partir de `inicio` e grava os das novas transações:
+        o saldo antes da primeira operação de cada dia e a cada OPERACOES_POR_CHECKPOINT
+        operações. Os saldos intermediários são obtidos desfazendo, a partir do saldo
+        final, as operações seguintes do lote.
+
+        Cada checkpoint tem como chave o momento da operação anterior (`anterior`, para a
+        primeira do lote): ele vale para qualquer instante a partir dela.
+        """
+        saldos = []
+        for transacao in reversed(transacoes):
+            saldo_centavos -= transacao.efeito_centavos
+            saldos.append(saldo_centavos)
+        saldos.reverse()  # Saldo antes de cada transação
+
+        descritor = os.open(self.caminho_saldos(numero), os.O_RDWR | os.O_CREAT, 0o644)
+        with os.fdopen(descritor, 'r+b') as f:
+            validos = self._registros_antes(f, inicio, self.REGISTRO_SALDO)
+            ultimo = _ler_registro(f, self.REGISTRO_SALDO, validos - 1)[2] if validos else None
+            dados = bytearray()
+            for deslocamento, (transacao, posicao, saldo) in enumerate(zip(transacoes, posicoes, saldos)):
+                entrada = entradas + deslocamento
+                if (ultimo is None or entrada - ultimo >= self.OPERACOES_POR_CHECKPOINT
+                        or date.fromtimestamp(transacao.momento) != date.fromtimestamp(anterior)):
+                    dados += self.REGISTRO_SALDO.pack(anterior, posicao, entrada, saldo)
+                    ultimo = entrada
+                anterior = max(anterior, transacao.momento)
+            f.truncate(validos * self.REGISTRO_SALDO.size)
+            f.seek(validos * self.REGISTRO_SALDO.size)
+            f.write(dados)
+            f.flush()
+            if sincronizar:
+                os.fsync(f.fileno())
+
+    def _ler_a_partir(self, numero, inicio: int, fim: int) -> Iterator[Transacao]:
+        """
+        Percorre as transações do ledger entre as posições `inicio` e `fim`, em ordem,
+        lendo o arquivo em blocos: quem para no meio não lê o restante.
+        """
+        with open(self.caminho(numero), 'rb') as f:
+            f.seek(inicio)
+            posicao = inicio
+            resto = b""
+            while posicao < fim:
+                bloco = f.read(min(self.TAMANHO_BLOCO, fim - posicao))
+                if not bloco:
+                    raise ValueError(f"Ledger da conta {numero} incompleto: {posicao} de {fim} bytes.")
+                posicao += len(bloco)
+                linhas = (resto + bloco).split(b"\n")
+                resto = linhas.pop()
+                for linha in linhas:
+                    yield TransacaoMapper.from_registro(json.loads(linha))
+
+    @staticmethod
+    def _registros_antes(arquivo: BinaryIO, posicao: int, registro: struct.Struct = REGISTRO_INDICE) -> int:
+        """
+        Retorna quantos registros de um arquivo auxiliar (índice temporal ou checkpoints
+        de saldo, com a posição no ledger no segundo campo) apontam para antes de `posicao`.
+        """
+        total = os.fstat(arquivo.fileno()).st_size // registro.size
+        return bisect_left(_ColunaIndice(arquivo, registro, 1, total), posicao)
+
+    def _abrir_indice(self, numero, tamanho: int, entradas: int) -> BinaryIO:
+        """
+        Abre o índice temporal para leitura, reconstruindo-o se não cobrir as
+        `entradas` operações confirmadas.
+        """
+        for tentativa in range(2):
+            try:
+                arquivo = open(self.caminho_indice(numero), 'rb')
+            except FileNotFoundError:
+                arquivo = None
+            if arquivo is not None:
+                if (os.fstat(arquivo.fileno()).st_size >= entradas * self.REGISTRO_INDICE.size
+                        and _ColunaIndice(arquivo, self.REGISTRO_INDICE, 1, entradas)[entradas - 1] < tamanho):
+                    return arquivo
+                arquivo.close()
+            if tentativa == 0:
+                self._reconstruir_indice(numero, tamanho, entradas)
+        raise ValueError(f"Índice temporal do ledger da conta {numero} não pôde ser reconstruído.")
+
+    def _reconstruir_indice(self, numero, tamanho: int, entradas: int) -> None:
+        """
+        Regrava o índice temporal a partir do trecho confirmado do ledger
+        (ex.: ledgers anteriores ao índice ou índice de uma gravação interrompida).
+        """
+        logger.info(f"Reconstruindo o índice temporal do ledger da conta {numero}.")
+        with self.trava(numero).exclusiva():
+            with open(self.caminho(numero), 'rb') as f:
+                conteudo = f.read(tamanho)
+            if len(conteudo) < tamanho:
+                raise ValueError(f"Ledger da conta {numero} incompleto: {len(conteudo)} de {tamanho} bytes.")
+
+            dados = bytearray()
+            anterior = posicao = 0
+            for linha in conteudo.splitlines(keepends=True):
+                anterior = max(anterior, TransacaoMapper.from_registro(json.loads(linha)).momento)
+                dados += self.REGISTRO_INDICE.pack(anterior, posicao)
+                posicao += len(linha)
+            if len(dados) != entradas * self.REGISTRO_INDICE.size:
+                raise ValueError(f"Ledger da conta {numero} não corresponde às {entradas} operações confirmadas.")
+
+            caminho = self.caminho_indice(numero)
+            with open(caminho + ".tmp", 'wb') as f:
+                f.write(dados)
+                f.flush()
+                if self.sincronizar_disco:
+                    os.fsync(f.fileno())
+            os.replace(caminho + ".tmp", caminho)
+
+
+class _ColunaIndice:
+    """
+    Sequência somente leitura com um campo dos registros de tamanho fixo de um
+    arquivo auxiliar do ledger (índice temporal ou checkpoints de saldo), lidos sob
+    demanda: a busca binária (bisect) lê só os registros visitados.
+    """
+
+    def __init__(self, arquivo: BinaryIO, registro: struct.Struct, campo: int, tamanho: int):
+        self._arquivo = arquivo
+        self._registro = registro
+        self._campo = campo
+        self._tamanho = tamanho
+
+    def __len__(self) -> int:
+        return self._tamanho
+
+    def __getitem__(self, indice: int) -> int:
+        return _ler_registro(self._arquivo, self._registro, indice)[self._campo]
+
+
+def _ler_registro(arquivo: BinaryIO, registro: struct.Struct, indice: int) -> tuple:
+    """
+    Lê o registro de número `indice` de um arquivo de registros de tamanho fixo.
+    """
+    arquivo.seek(indice * registro.size)
+    dados = arquivo.read(registro.size)
+    if len(dados) < registro.size:
+        raise IndexError(indice)
+    return registro.unpack(dados)
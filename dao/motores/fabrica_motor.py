@@ -0,0 +1,63 @@
+import os
+import threading
+from dao.motores.motor_armazenamento import MotorArmazenamento
+from dao.motores.motor_json import MotorJson
+from dao.motores.motor_journal import MotorJournal
+from dao.motores.motor_sqlite import MotorSqlite
+from utils.constantes import (
+    MOTOR_ARMAZENAMENTO,
+    MOTOR_JSON,
+    MOTOR_JOURNAL,
+    MOTOR_SQLITE,
+    ARQUIVO_SQLITE
+)
+
+_motores: dict[tuple[str, str], MotorArmazenamento] = {}
+_trava = threading.Lock()
+
+
+def obter_motor(caminho: str, chave: str, tipo: str = None) -> MotorArmazenamento:
+    """
+    Retorna o motor de armazenamento do arquivo informado.
+
+    Os motores são compartilhados por caminho dentro do processo, para que
+    várias instâncias de DAO não reconstruam o mesmo estado a cada criação.
+
+    Args:
+        caminho (str): Caminho do arquivo de dados.
+        chave (str): Campo identificador dos registros.
+        tipo (str, opcional): Tipo do motor. Padrão: MOTOR_ARMAZENAMENTO.
+
+    Raises:
+        ValueError: Se o tipo de motor for desconhecido.
+    """
+    tipo = tipo or MOTOR_ARMAZENAMENTO
+    identificador = (os.path.abspath(caminho), tipo)
+
+    with _trava:
+        motor = _motores.get(identificador)
+        if motor is None:
+            if tipo == MOTOR_JOURNAL:
+                motor = MotorJournal(caminho, chave)
+            elif tipo == MOTOR_JSON:
+                motor = MotorJson(caminho, chave)
+            elif tipo == MOTOR_SQLITE:
+                caminho_banco = os.path.join(os.path.dirname(caminho), ARQUIVO_SQLITE)
+                motor = MotorSqlite(caminho, chave, caminho_banco)
+            else:
+                raise ValueError(f"Motor de armazenamento desconhecido: {tipo}")
+            _motores[identificador] = motor
+        return motor
+
+
+def descartar_motores() -> None:
+    """
+    Descarta os motores em cache (usado em testes e ao trocar de diretório de dados).
+    """
+    with _trava:
+        for motor in _motores.values():
+            if isinstance(motor, MotorJournal):
+                motor.aguardar_compactacao()
+            elif isinstance(motor, MotorSqlite):
+                motor.fechar()
+        _motores.clear()
@@ -0,0 +1,76 @@
+import threading
+import time
+from typing import Any, Callable, List, Optional
+
+
+class PedidoEscrita:
+    """
+    Uma operação de escrita submetida a um motor de armazenamento, com seu resultado.
+    """
+
+    __slots__ = ("operacao", "autor", "resultado", "erro", "concluido")
+
+    def __init__(self, operacao: Callable[[], Any], autor=None):
+        self.operacao = operacao
+        self.autor = autor
+        self.resultado = None
+        self.erro: Optional[BaseException] = None
+        self.concluido = threading.Event()
+
+    def obter(self) -> Any:
+        """
+        Retorna o resultado da operação, ou relança a exceção que ela produziu.
+        """
+        if self.erro is not None:
+            raise self.erro
+        return self.resultado
+
+
+class GravacaoEmGrupo:
+    """
+    Agrupa escritas simultâneas de várias threads em uma única gravação (group commit).
+
+    A primeira thread que chega com um pedido vira líder do grupo: espera `janela`
+    segundos para que outras se juntem e então aplica todos os pedidos de uma vez,
+    com uma única gravação e um único fsync. As demais threads apenas aguardam o
+    resultado do próprio pedido. Pedidos que chegam enquanto o líder grava formam
+    o grupo seguinte.
+    """
+
+    def __init__(self, janela: float, aplicar: Callable[[List[PedidoEscrita]], None]):
+        """
+        Args:
+            janela (float): Segundos que o líder espera antes de gravar.
+            aplicar (Callable): Aplica e persiste uma lista de pedidos, preenchendo
+                o resultado ou o erro de cada um.
+        """
+        self.janela = janela
+        self._aplicar = aplicar
+        self._trava = threading.Lock()
+        self._fila: List[PedidoEscrita] = []
+
+    def executar(self, pedido: PedidoEscrita) -> None:
+        """
+        Submete o pedido e retorna quando ele tiver sido aplicado (ou recusado).
+        """
+        with self._trava:
+            self._fila.append(pedido)
+            lider = len(self._fila) == 1
+
+        if not lider:
+            pedido.concluido.wait()
+            return
+
+        time.sleep(self.janela)
+        with self._trava:
+            pedidos, self._fila = self._fila, []
+
+        try:
+            self._aplicar(pedidos)
+        except BaseException as e:
+            for outro in pedidos:
+                if outro.erro is None:
+                    outro.erro = e
+        finally:
+            for outro in pedidos:
+                outro.concluido.set()
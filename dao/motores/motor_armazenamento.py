@@ -0,0 +1,387 @@
+import os
+import threading
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Any, Callable, Iterator, List, Optional
+from dao.motores.gravacao_em_grupo import GravacaoEmGrupo, PedidoEscrita
+from model.exceptions import ConflitoVersaoError
+from utils.constantes import (
+    DURABILIDADE,
+    DURABILIDADE_NENHUMA,
+    DURABILIDADE_FSYNC,
+    DURABILIDADE_GRUPO,
+    JANELA_GRAVACAO_EM_GRUPO
+)
+
+
+class MotorArmazenamento(ABC):
+    """
+    Classe abstrata para os motores de armazenamento usados pelo DAO.
+
+    O motor guarda registros (dicionários) identificados pelo campo `chave`
+    e esconde do DAO a forma como eles são persistidos em disco.
+
+    O atributo `geracao` é incrementado a cada alteração do conteúdo, feita por este
+    motor ou detectada em disco por sincronizar(). Quem guarda objetos derivados dos
+    registros (o cache do DAO) compara a geração para saber se eles ainda valem.
+    As escritas podem informar um `autor` (o DAO), registrado com a geração produzida,
+    para que ele reconheça as próprias alterações (ver alterado_apenas_por).
+
+    Todas as escritas passam por _escrever: cada uma é uma operação que valida e prepara
+    a alteração dentro da transação de escrita do motor, seguida de uma única gravação.
+    A durabilidade (DURABILIDADE_*) define se a gravação é sincronizada com o disco
+    (fsync) e se escritas simultâneas de várias threads são agrupadas (group commit).
+
+    Controle de concorrência otimista: um registro gravado com o campo CAMPO_VERSAO
+    só substitui o armazenado se este estiver na versão imediatamente anterior
+    (ausente conta como 0). A comparação e a gravação são atômicas em cada motor;
+    se outra operação gravou antes, ConflitoVersaoError é lançada e nada é gravado.
+    Registros sem o campo são gravados sem verificação.
+    """
+
+    CAMPO_VERSAO = "versao"
+    HISTORICO_GERACOES = 1024  # Gerações recentes cujo autor é lembrado
+
+    # Operações aceitas por aplicar_lote
+    OP_INSERIR = "inserir"
+    OP_ATUALIZAR = "atualizar"
+    OP_REMOVER = "remover"
+
+    def __init__(self, caminho: str, chave: str, durabilidade: str = None):
+        """
+        Inicializa o motor com o caminho do arquivo principal e o nome do campo identificador.
+
+        Args:
+            durabilidade (str, opcional): Uma das constantes DURABILIDADE_*. Padrão: DURABILIDADE.
+
+        Raises:
+            ValueError: Se a durabilidade for desconhecida.
+        """
+        self.caminho = caminho
+        self.chave = chave
+        self.durabilidade = durabilidade or DURABILIDADE
+        if self.durabilidade not in (DURABILIDADE_NENHUMA, DURABILIDADE_FSYNC, DURABILIDADE_GRUPO):
+            raise ValueError(f"Durabilidade desconhecida: {self.durabilidade}")
+
+        self.geracao = 0
+        self._trava_geracao = threading.Lock()
+        self._autores_geracoes: deque = deque(maxlen=self.HISTORICO_GERACOES)  # (geração, autor)
+        self._autor_atual = None          # Autor da operação em andamento na transação de escrita
+        self._alteracoes_preparadas = 0   # Alterações preparadas na transação em andamento
+        self._grupo = (
+            GravacaoEmGrupo(JANELA_GRAVACAO_EM_GRUPO, self._aplicar_pedidos)
+            if self.durabilidade == DURABILIDADE_GRUPO else None
+        )
+
+    @property
+    def sincronizar_disco(self) -> bool:
+        """
+        Indica se as gravações devem ser confirmadas com fsync.
+        """
+        return self.durabilidade != DURABILIDADE_NENHUMA
+
+    @staticmethod
+    def assinatura_arquivo(caminho: str) -> Optional[tuple]:
+        """
+        Retorna (st_mtime_ns, st_size, st_ino) do arquivo, ou None se ele não existir.
+        Qualquer escrita ou substituição do arquivo altera ao menos um dos três valores.
+        """
+        try:
+            estado = os.stat(caminho)
+        except FileNotFoundError:
+            return None
+        return estado.st_mtime_ns, estado.st_size, estado.st_ino
+
+    def assinatura_dados(self) -> tuple:
+        """
+        Retorna uma assinatura dos dados persistidos, que muda a cada escrita gravada
+        (por qualquer processo). Serve para saber se um arquivo derivado, como um
+        índice, foi gerado a partir do estado atual dos dados.
+        """
+        return (self.assinatura_arquivo(self.caminho),)
+
+    def sincronizar(self) -> bool:
+        """
+        Verifica, com uma consulta barata ao disco, se outro processo (ou outra instância
+        de motor) alterou os dados; se sim, atualiza o estado e incrementa a geração.
+
+        Returns:
+            bool: True se uma alteração externa foi detectada.
+        """
+        return False
+
+    # === Gerações ===
+
+    def _marcar_alteracao(self, autor=None) -> None:
+        """
+        Avança a geração, registrando quem a produziu (None = alteração externa).
+        """
+        with self._trava_geracao:
+            self.geracao += 1
+            self._autores_geracoes.append((self.geracao, autor))
+
+    def alterado_apenas_por(self, autor, desde: int) -> bool:
+        """
+        Indica se todas as gerações posteriores a `desde` foram produzidas por `autor`.
+        Retorna False se alguma delas já saiu do histórico.
+        """
+        with self._trava_geracao:
+            if self.geracao - desde > len(self._autores_geracoes):
+                return False
+            for geracao, autor_geracao in reversed(self._autores_geracoes):
+                if geracao <= desde:
+                    break
+                if autor_geracao is not autor:
+                    return False
+            return True
+
+    # === Escrita ===
+
+    def _escrever(self, operacao: Callable[[], Any], autor=None) -> Any:
+        """
+        Executa uma operação de escrita e retorna seu resultado.
+
+        A operação roda dentro da transação de escrita do motor (travas obtidas e estado
+        sincronizado), deve validar tudo antes de preparar qualquer alteração e chamar
+        _alterou() para cada alteração preparada. Com DURABILIDADE_GRUPO, ela pode ser
+        executada pela thread líder do grupo, junto com operações de outras threads.
+
+        Raises:
+            Exception: A exceção lançada pela operação ou pela gravação.
+        """
+        pedido = PedidoEscrita(operacao, autor)
+        if self._grupo is not None:
+            self._grupo.executar(pedido)
+        else:
+            self._aplicar_pedidos([pedido])
+        return pedido.obter()
+
+    def _aplicar_pedidos(self, pedidos: List[PedidoEscrita]) -> None:
+        """
+        Executa as operações em uma única transação de escrita e grava uma única vez.
+        Uma operação recusada não afeta as demais; se a gravação falhar, todas as
+        operações aceitas recebem o erro e o estado em memória é descartado.
+        """
+        with self._transacao_escrita():
+            self._alteracoes_preparadas = 0
+            aceitos = []
+            for pedido in pedidos:
+                self._autor_atual = pedido.autor
+                try:
+                    pedido.resultado = pedido.operacao()
+                except Exception as e:
+                    pedido.erro = e
+                else:
+                    aceitos.append(pedido)
+            self._autor_atual = None
+
+            if not self._alteracoes_preparadas:
+                return
+            try:
+                self._persistir_alteracoes()
+            except Exception as e:
+                self._descartar_alteracoes()
+                self._marcar_alteracao()
+                for pedido in aceitos:
+                    pedido.erro = e
+
+    def _alterou(self) -> None:
+        """
+        Registra, dentro de uma operação de escrita, uma alteração preparada.
+        """
+        self._alteracoes_preparadas += 1
+        self._marcar_alteracao(self._autor_atual)
+
+    @abstractmethod
+    def _transacao_escrita(self) -> Iterator[None]:
+        """
+        Context manager da transação de escrita: obtém as travas, sincroniza o estado
+        e prepara a área onde as operações acumulam as alterações.
+        """
+        pass
+
+    @abstractmethod
+    def _persistir_alteracoes(self) -> None:
+        """
+        Grava as alterações preparadas na transação (respeitando sincronizar_disco).
+        """
+        pass
+
+    @abstractmethod
+    def _descartar_alteracoes(self) -> None:
+        """
+        Desfaz em memória as alterações preparadas, após uma falha de gravação.
+        """
+        pass
+
+    # === Arquivos ===
+
+    def _gravar_temporario(self, temporario: str, escrever: Callable) -> None:
+        """
+        Grava um arquivo temporário com a função `escrever(f)` e, se a durabilidade
+        exigir, sincroniza seu conteúdo com o disco.
+        """
+        with open(temporario, 'w', encoding='utf-8') as f:
+            escrever(f)
+            if self.sincronizar_disco:
+                f.flush()
+                os.fsync(f.fileno())
+
+    def _instalar_arquivo(self, temporario: str, caminho: str) -> None:
+        """
+        Substitui `caminho` por `temporario` atomicamente e, se a durabilidade exigir,
+        sincroniza o diretório para que a troca sobreviva a uma queda de energia.
+        """
+        os.replace(temporario, caminho)
+        if self.sincronizar_disco:
+            self.sincronizar_diretorio(caminho)
+
+    @staticmethod
+    def sincronizar_diretorio(caminho: str) -> None:
+        """
+        Faz fsync do diretório que contém `caminho` (sem efeito onde não é suportado).
+        """
+        try:
+            descritor = os.open(os.path.dirname(os.path.abspath(caminho)), os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(descritor)
+        except OSError:
+            pass
+        finally:
+            os.close(descritor)
+
+    @staticmethod
+    def normalizar_id(id_valor) -> str:
+        """
+        Normaliza um identificador para comparação (ex.: 1001 e "1001" são o mesmo id).
+        """
+        return str(id_valor).strip()
+
+    def id_do_registro(self, registro: dict) -> str:
+        """
+        Retorna o identificador normalizado de um registro.
+        """
+        return self.normalizar_id(registro.get(self.chave))
+
+    @abstractmethod
+    def listar(self) -> List[dict]:
+        """
+        Retorna todos os registros, na ordem de inserção.
+        Os dicionários retornados não devem ser alterados por quem os recebe.
+        """
+        pass
+
+    @abstractmethod
+    def buscar(self, id_valor) -> Optional[dict]:
+        """
+        Retorna o registro com o identificador informado, ou None.
+        """
+        pass
+
+    @abstractmethod
+    def inserir(self, registro: dict, autor=None) -> None:
+        """
+        Insere um novo registro. `autor`, nesta e nas demais escritas, identifica quem
+        pediu a alteração (ver alterado_apenas_por).
+
+        Raises:
+            ValueError: Se já existir registro com o mesmo identificador.
+        """
+        pass
+
+    @abstractmethod
+    def atualizar(self, registro: dict, autor=None) -> bool:
+        """
+        Substitui um registro existente. Retorna False se ele não existir.
+
+        Raises:
+            ConflitoVersaoError: Se o registro armazenado não estiver na versão anterior à informada.
+        """
+        pass
+
+    @abstractmethod
+    def remover(self, id_valor, autor=None) -> bool:
+        """
+        Remove o registro com o identificador informado. Retorna False se ele não existir.
+        """
+        pass
+
+    @abstractmethod
+    def substituir_todos(self, registros: List[dict]) -> None:
+        """
+        Substitui todo o conteúdo armazenado pela lista informada.
+        """
+        pass
+
+    @abstractmethod
+    def aplicar_lote(self, operacoes: List[tuple], autor=None) -> None:
+        """
+        Aplica várias operações de forma atômica: ou todas são persistidas, ou nenhuma.
+
+        Args:
+            operacoes (list[tuple]): Pares (operação, dado), onde operação é OP_INSERIR
+                ou OP_ATUALIZAR (dado = registro) ou OP_REMOVER (dado = identificador).
+
+        Raises:
+            ValueError: Se uma inserção duplicar um identificador, se uma atualização ou
+                remoção apontar para um registro inexistente, ou se a operação for desconhecida.
+                Nesse caso nada é gravado.
+            ConflitoVersaoError: Se alguma atualização não estiver na versão esperada
+                (ver CAMPO_VERSAO). Nesse caso nada é gravado.
+        """
+        pass
+
+    def _validar_lote(self, operacoes: List[tuple], buscar_atual: Callable[[str], Optional[dict]]) -> List[tuple]:
+        """
+        Valida um lote antes de qualquer escrita, considerando o efeito das operações anteriores.
+
+        Args:
+            operacoes (list[tuple]): Lote recebido por aplicar_lote.
+            buscar_atual (Callable): Retorna o registro armazenado com o id normalizado, ou None.
+
+        Returns:
+            list[tuple]: Triplas (operação, id normalizado, registro ou None), na ordem recebida.
+        """
+        atuais: dict[str, Optional[dict]] = {}
+        validadas = []
+
+        for operacao, dado in operacoes:
+            if operacao == self.OP_REMOVER:
+                id_valor, registro = self.normalizar_id(dado), None
+            elif operacao in (self.OP_INSERIR, self.OP_ATUALIZAR):
+                id_valor, registro = self.id_do_registro(dado), dado
+            else:
+                raise ValueError(f"Operação desconhecida no lote: {operacao}")
+
+            atual = atuais[id_valor] if id_valor in atuais else buscar_atual(id_valor)
+            if operacao == self.OP_INSERIR and atual is not None:
+                raise self._erro_duplicado(dado)
+            if operacao != self.OP_INSERIR and atual is None:
+                raise ValueError(f"Objeto com {self.chave} = '{id_valor}' não encontrado.")
+            if operacao == self.OP_ATUALIZAR:
+                self._verificar_versao(atual, registro)
+
+            atuais[id_valor] = registro
+            validadas.append((operacao, id_valor, registro))
+
+        return validadas
+
+    def _verificar_versao(self, atual: dict, registro: dict) -> None:
+        """
+        Confere se o registro armazenado está na versão anterior à do registro novo.
+
+        Raises:
+            ConflitoVersaoError: Se outra operação gravou o registro desde que ele foi lido.
+        """
+        if self.CAMPO_VERSAO not in registro:
+            return
+        if atual.get(self.CAMPO_VERSAO, 0) != registro[self.CAMPO_VERSAO] - 1:
+            raise ConflitoVersaoError(self.id_do_registro(registro))
+
+    def _erro_duplicado(self, registro: dict) -> ValueError:
+        """
+        Monta o erro padrão para inserção de identificador duplicado.
+        """
+        return ValueError(f"Objeto com {self.chave} = '{registro.get(self.chave)}' já existe.")
@@ -0,0 +1,394 @@
+import json
+import os
+import threading
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
+from dao.motores.motor_armazenamento import MotorArmazenamento
+from dao.motores.trava_arquivo import TravaArquivo
+from utils.constantes import LIMITE_COMPACTACAO_JOURNAL
+from utils.logger import logger
+
+
+class MotorJournal(MotorArmazenamento):
+    """
+    Motor de armazenamento com journal (diário) append-only.
+
+    Arquivos usados (exemplo para "contas.json"):
+        - contas.json: snapshot, no mesmo formato de lista JSON do motor original.
+        - contas.journal: uma linha JSON por alteração feita após o snapshot.
+        - contas.journal.compactando: journal congelado durante uma compactação em andamento.
+
+    Na inicialização o snapshot é carregado e os journals são reaplicados em memória.
+    Cada escrita acrescenta apenas uma linha ao journal; quando ele passa de
+    LIMITE_COMPACTACAO_JOURNAL linhas, uma thread em segundo plano grava um novo snapshot.
+    Conforme a durabilidade, cada acréscimo é seguido de fsync; com DURABILIDADE_GRUPO,
+    as linhas de todas as escritas de um grupo são acrescentadas com um único fsync.
+
+    Um lote (aplicar_lote) é gravado como uma única linha {"lote": [entradas]}; se a
+    escrita for interrompida, a linha fica inválida e o lote inteiro é descartado no replay.
+
+    Vários processos podem usar os mesmos arquivos: sincronizar() compara a assinatura
+    do snapshot e do journal com a da última leitura. Se apenas o journal cresceu, só
+    as linhas novas são aplicadas; se o snapshot foi trocado, o estado é recarregado.
+    Escritas e compactações usam a trava exclusiva do arquivo ("contas.json.lock") e
+    as releituras, a compartilhada; cada escrita sincroniza o estado antes de validar.
+    """
+
+    OP_UPSERT = "upsert"
+    OP_DELETE = "delete"
+
+    def __init__(
+        self, caminho: str, chave: str,
+        limite_compactacao: int = LIMITE_COMPACTACAO_JOURNAL, durabilidade: str = None
+    ):
+        """
+        Inicializa o motor e reconstrói o estado a partir do snapshot e do journal.
+        """
+        super().__init__(caminho, chave, durabilidade)
+        self.caminho_journal = os.path.splitext(caminho)[0] + ".journal"
+        self.caminho_compactando = self.caminho_journal + ".compactando"
+        self.limite_compactacao = limite_compactacao
+
+        self._trava = threading.RLock()
+        self._trava_arquivo = TravaArquivo(caminho)
+        self._registros: dict[str, dict] = {}
+        self._entradas_journal = 0
+        self._thread_compactacao: Optional[threading.Thread] = None
+
+        self._assinatura_snapshot: Optional[tuple] = None
+        self._assinatura_journal: Optional[tuple] = None
+        self._posicao_journal = 0  # Bytes do journal já aplicados (até a última linha completa)
+        self._entradas_preparadas: List[dict] = []  # Entradas da transação de escrita em andamento
+
+        with self._trava_arquivo.compartilhada():
+            self._carregar()
+
+    def assinatura_dados(self) -> tuple:
+        return (
+            self.assinatura_arquivo(self.caminho),
+            self.assinatura_arquivo(self.caminho_compactando),
+            self.assinatura_arquivo(self.caminho_journal),
+        )
+
+    # === Carga e replay ===
+
+    def _carregar(self) -> None:
+        """
+        Carrega o snapshot e reaplica os journals pendentes, nesta ordem.
+        As assinaturas são lidas antes dos arquivos: uma alteração concorrente à
+        leitura é detectada no próximo sincronizar().
+        """
+        self._assinatura_snapshot = self.assinatura_arquivo(self.caminho)
+        self._registros = {}
+        try:
+            with open(self.caminho, 'r', encoding='utf-8') as f:
+                for registro in json.load(f):
+                    self._registros[self.id_do_registro(registro)] = registro
+        except (FileNotFoundError, json.JSONDecodeError):
+            pass
+
+        self._reaplicar(self.caminho_compactando)
+        self._assinatura_journal = self.assinatura_arquivo(self.caminho_journal)
+        self._entradas_journal, self._posicao_journal = self._reaplicar(self.caminho_journal)
+
+    def _reaplicar(self, caminho: str, inicio: int = 0) -> tuple[int, int]:
+        """
+        Aplica em memória as entradas de um arquivo de journal, a partir do byte `inicio`.
+        Linhas corrompidas são ignoradas. Uma última linha sem quebra de linha (escrita
+        interrompida ou ainda em andamento) não é aplicada.
+
+        Returns:
+            tuple[int, int]: Quantidade de entradas aplicadas e posição do fim da
+            última linha completa.
+        """
+        aplicadas = 0
+        posicao = inicio
+        try:
+            with open(caminho, 'rb') as f:
+                f.seek(inicio)
+                for linha in f:
+                    if not linha.endswith(b"\n"):
+                        break
+                    posicao += len(linha)
+                    if not linha.strip():
+                        continue
+                    try:
+                        entrada = json.loads(linha)
+                    except (json.JSONDecodeError, UnicodeDecodeError):
+                        logger.warning(f"Entrada inválida ignorada no journal {caminho}.")
+                        continue
+                    self._aplicar_entrada(entrada)
+                    aplicadas += 1
+        except FileNotFoundError:
+            pass
+        return aplicadas, posicao
+
+    def sincronizar(self) -> bool:
+        with self._trava, self._trava_arquivo.compartilhada():
+            snapshot = self.assinatura_arquivo(self.caminho)
+            journal = self.assinatura_arquivo(self.caminho_journal)
+            if snapshot == self._assinatura_snapshot and journal == self._assinatura_journal:
+                return False
+
+            if self._assinatura_journal is None:
+                mesmo_journal = journal is not None and self._posicao_journal == 0  # Journal novo
+            else:
+                mesmo_journal = (
+                    journal is not None and journal[2] == self._assinatura_journal[2]
+                    and journal[1] >= self._posicao_journal
+                )
+            if snapshot == self._assinatura_snapshot and mesmo_journal:
+                # Outro processo apenas acrescentou linhas: aplica só o trecho novo
+                self._assinatura_journal = journal
+                aplicadas, self._posicao_journal = self._reaplicar(self.caminho_journal, self._posicao_journal)
+                self._entradas_journal += aplicadas
+            else:
+                self._carregar()
+
+            self._marcar_alteracao()
+            return True
+
+    def _aplicar_entrada(self, entrada: dict) -> None:
+        """
+        Aplica uma entrada do journal ao estado em memória.
+        """
+        if "lote" in entrada:
+            for subentrada in entrada["lote"]:
+                self._aplicar_entrada(subentrada)
+            return
+
+        id_valor = self.normalizar_id(entrada["id"])
+        if entrada["op"] == self.OP_DELETE:
+            self._registros.pop(id_valor, None)
+        else:
+            self._registros[id_valor] = entrada["dados"]
+
+    # === Transação de escrita ===
+
+    @contextmanager
+    def _transacao_escrita(self) -> Iterator[None]:
+        with self._trava, self._trava_arquivo.exclusiva():
+            self.sincronizar()
+            self._entradas_preparadas = []
+            try:
+                yield
+            finally:
+                self._entradas_preparadas = []
+
+    def _preparar(self, entrada: dict) -> None:
+        """
+        Aplica uma entrada em memória e a guarda para ser acrescentada ao journal.
+        """
+        self._aplicar_entrada(entrada)
+        self._entradas_preparadas.append(entrada)
+        self._alterou()
+
+    def _persistir_alteracoes(self) -> None:
+        """
+        Acrescenta as entradas preparadas ao journal (uma linha por escrita, em um único
+        write e um único fsync) e dispara a compactação se necessário.
+        """
+        dados = b"".join(
+            (json.dumps(entrada, ensure_ascii=False) + "\n").encode("utf-8")
+            for entrada in self._entradas_preparadas
+        )
+        tamanho_anterior = self._assinatura_journal[1] if self._assinatura_journal else 0
+        if tamanho_anterior > self._posicao_journal:
+            dados = b"\n" + dados  # Isola o resto de uma escrita interrompida em uma linha própria
+
+        novo = not os.path.exists(self.caminho_journal)
+        with open(self.caminho_journal, 'ab') as f:
+            f.write(dados)
+            if self.sincronizar_disco:
+                f.flush()
+                os.fsync(f.fileno())
+        if novo and self.sincronizar_disco:
+            self.sincronizar_diretorio(self.caminho_journal)
+
+        # Sob a trava exclusiva, o journal contém exatamente o que já foi aplicado mais estas linhas
+        self._assinatura_journal = self.assinatura_arquivo(self.caminho_journal)
+        self._posicao_journal = self._assinatura_journal[1]
+        self._entradas_journal += len(self._entradas_preparadas)
+
+        if self._entradas_journal >= self.limite_compactacao:
+            self.compactar(em_segundo_plano=True)
+
+    def _descartar_alteracoes(self) -> None:
+        """
+        Recarrega o estado do disco, desfazendo as entradas aplicadas só em memória.
+        """
+        self._carregar()
+
+    # === Leitura e escrita ===
+
+    def listar(self) -> List[dict]:
+        with self._trava:
+            return list(self._registros.values())
+
+    def buscar(self, id_valor) -> Optional[dict]:
+        with self._trava:
+            return self._registros.get(self.normalizar_id(id_valor))
+
+    def inserir(self, registro: dict, autor=None) -> None:
+        def operacao():
+            id_valor = self.id_do_registro(registro)
+            if id_valor in self._registros:
+                raise self._erro_duplicado(registro)
+            self._preparar({"op": self.OP_UPSERT, "id": id_valor, "dados": registro})
+
+        self._escrever(operacao, autor)
+
+    def atualizar(self, registro: dict, autor=None) -> bool:
+        def operacao() -> bool:
+            id_valor = self.id_do_registro(registro)
+            atual = self._registros.get(id_valor)
+            if atual is None:
+                return False
+            self._verificar_versao(atual, registro)
+            self._preparar({"op": self.OP_UPSERT, "id": id_valor, "dados": registro})
+            return True
+
+        return self._escrever(operacao, autor)
+
+    def remover(self, id_valor, autor=None) -> bool:
+        def operacao() -> bool:
+            id_normalizado = self.normalizar_id(id_valor)
+            if id_normalizado not in self._registros:
+                return False
+            self._preparar({"op": self.OP_DELETE, "id": id_normalizado})
+            return True
+
+        return self._escrever(operacao, autor)
+
+    def aplicar_lote(self, operacoes: List[tuple], autor=None) -> None:
+        def operacao():
+            validadas = self._validar_lote(operacoes, self._registros.get)
+            if not validadas:
+                return
+            entradas = [
+                {"op": self.OP_DELETE, "id": id_valor} if tipo == self.OP_REMOVER
+                else {"op": self.OP_UPSERT, "id": id_valor, "dados": registro}
+                for tipo, id_valor, registro in validadas
+            ]
+            self._preparar({"lote": entradas})
+
+        self._escrever(operacao, autor)
+
+    def substituir_todos(self, registros: List[dict]) -> None:
+        # Uma compactação em andamento percebe a troca do snapshot e é abandonada
+        with self._trava, self._trava_arquivo.exclusiva():
+            self._registros = {self.id_do_registro(r): r for r in registros}
+            self._gravar_snapshot(list(self._registros.values()))
+            self._remover_arquivos(self.caminho_compactando, self.caminho_journal)
+            self._entradas_journal = 0
+            self._assinatura_snapshot = self.assinatura_arquivo(self.caminho)
+            self._assinatura_journal = None
+            self._posicao_journal = 0
+            self._marcar_alteracao()
+
+    # === Compactação ===
+
+    def compactar(self, em_segundo_plano: bool = False) -> None:
+        """
+        Grava um novo snapshot com o estado atual e descarta o journal já incorporado.
+
+        O journal atual é congelado (renomeado para ".compactando") antes da gravação,
+        de modo que novas escritas continuam indo para um journal novo enquanto o
+        snapshot é gerado. Se o processo cair no meio, o replay do journal congelado
+        sobre o snapshot (antigo ou novo) produz o mesmo estado.
+
+        O novo snapshot só é instalado se, ao final, o snapshot e o journal congelado
+        ainda forem os mesmos do congelamento; caso contrário outro processo (ou
+        substituir_todos) avançou o estado, e esta compactação é descartada.
+        """
+        with self._trava, self._trava_arquivo.exclusiva():
+            if self._thread_compactacao is not None and self._thread_compactacao.is_alive():
+                return
+            self.sincronizar()
+            if self._entradas_journal == 0 and not os.path.exists(self.caminho_compactando):
+                return
+
+            self._congelar_journal()
+            registros = list(self._registros.values())
+            esperado = (self.assinatura_arquivo(self.caminho), self.assinatura_arquivo(self.caminho_compactando))
+
+            if em_segundo_plano:
+                self._thread_compactacao = threading.Thread(
+                    target=self._finalizar_compactacao, args=(registros, esperado), daemon=True
+                )
+                self._thread_compactacao.start()
+                return
+
+        self._finalizar_compactacao(registros, esperado)
+
+    def aguardar_compactacao(self) -> None:
+        """
+        Bloqueia até que a compactação em segundo plano (se houver) termine.
+        """
+        thread = self._thread_compactacao
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+    def _congelar_journal(self) -> None:
+        """
+        Move o journal atual para o arquivo ".compactando" (concatenando, se já existir).
+        """
+        if os.path.exists(self.caminho_compactando):
+            if os.path.exists(self.caminho_journal):
+                with open(self.caminho_journal, 'r', encoding='utf-8') as origem, \
+                        open(self.caminho_compactando, 'a', encoding='utf-8') as destino:
+                    destino.write(origem.read())
+                    if self.sincronizar_disco:
+                        destino.flush()
+                        os.fsync(destino.fileno())
+                os.remove(self.caminho_journal)
+        elif os.path.exists(self.caminho_journal):
+            os.replace(self.caminho_journal, self.caminho_compactando)
+
+        self._entradas_journal = 0
+        self._assinatura_journal = None
+        self._posicao_journal = 0
+
+    def _finalizar_compactacao(self, registros: List[dict], esperado: tuple) -> None:
+        """
+        Grava o snapshot em arquivo temporário e, sob a trava exclusiva, o instala e
+        remove o journal congelado, se ninguém os alterou desde o congelamento.
+        """
+        temporario = f"{self.caminho}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            self._gravar_temporario(temporario, lambda f: json.dump(registros, f, indent=4))
+
+            with self._trava, self._trava_arquivo.exclusiva():
+                atual = (self.assinatura_arquivo(self.caminho), self.assinatura_arquivo(self.caminho_compactando))
+                if atual != esperado:
+                    logger.info(f"Compactação de {self.caminho} descartada: os arquivos mudaram durante a gravação.")
+                    os.remove(temporario)
+                    return
+
+                # O snapshot precisa estar em disco antes de o journal que ele incorpora sumir
+                self._instalar_arquivo(temporario, self.caminho)
+                self._remover_arquivos(self.caminho_compactando)
+                self._assinatura_snapshot = self.assinatura_arquivo(self.caminho)
+        except OSError as e:
+            logger.error(f"Falha ao compactar o journal de {self.caminho}: {e}")
+
+    def _gravar_snapshot(self, registros: List[dict]) -> None:
+        """
+        Grava o snapshot em arquivo temporário e o substitui atomicamente.
+        """
+        temporario = self.caminho + ".tmp"
+        self._gravar_temporario(temporario, lambda f: json.dump(registros, f, indent=4))
+        self._instalar_arquivo(temporario, self.caminho)
+
+    def _remover_arquivos(self, *caminhos: str) -> None:
+        """
+        Remove os arquivos existentes e, se a durabilidade exigir, sincroniza o diretório:
+        um journal já incorporado ao snapshot não pode reaparecer após uma queda.
+        """
+        removidos = False
+        for caminho in caminhos:
+            if os.path.exists(caminho):
+                os.remove(caminho)
+                removidos = True
+        if removidos and self.sincronizar_disco:
+            self.sincronizar_diretorio(self.caminho)
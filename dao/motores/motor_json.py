@@ -0,0 +1,136 @@
+import json
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
+from dao.motores.motor_armazenamento import MotorArmazenamento
+from dao.motores.trava_arquivo import TravaArquivo
+
+
+class MotorJson(MotorArmazenamento):
+    """
+    Motor de armazenamento original: um único arquivo JSON com a lista de registros.
+    Toda escrita relê e regrava o arquivo inteiro, em um arquivo temporário que
+    substitui o original atomicamente (com fsync do arquivo e do diretório, conforme
+    a durabilidade). Uma queda no meio da gravação deixa o arquivo anterior intacto.
+
+    Como toda operação lê o arquivo, o motor não guarda estado; a assinatura do
+    arquivo serve apenas para informar a geração aos caches dos DAOs.
+
+    Leituras usam a trava compartilhada do arquivo e cada ciclo ler-alterar-gravar
+    usa a exclusiva, para que escritas concorrentes não se sobrescrevam. Com
+    DURABILIDADE_GRUPO, as escritas de um grupo compartilham uma única regravação.
+    """
+
+    def __init__(self, caminho: str, chave: str, durabilidade: str = None):
+        super().__init__(caminho, chave, durabilidade)
+        self._trava_arquivo = TravaArquivo(caminho)
+        self._assinatura = self.assinatura_arquivo(caminho)
+        self._preparados: Optional[dict[str, dict]] = None  # Registros da transação de escrita
+
+    def sincronizar(self) -> bool:
+        with self._trava_arquivo.compartilhada():
+            assinatura = self.assinatura_arquivo(self.caminho)
+            if assinatura == self._assinatura:
+                return False
+            self._assinatura = assinatura
+            self._marcar_alteracao()
+            return True
+
+    def _ler(self) -> List[dict]:
+        """
+        Lê o conteúdo do JSON. Retorna lista vazia se o arquivo não existir ou estiver corrompido.
+        """
+        with self._trava_arquivo.compartilhada():
+            try:
+                with open(self.caminho, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                return []
+
+    def _gravar(self, registros: List[dict]) -> None:
+        """
+        Regrava o arquivo JSON com a lista informada.
+        """
+        temporario = self.caminho + ".tmp"
+        self._gravar_temporario(temporario, lambda f: json.dump(registros, f, indent=4))
+        self._instalar_arquivo(temporario, self.caminho)
+        self._assinatura = self.assinatura_arquivo(self.caminho)
+
+    # === Transação de escrita ===
+
+    @contextmanager
+    def _transacao_escrita(self) -> Iterator[None]:
+        with self._trava_arquivo.exclusiva():
+            self.sincronizar()
+            self._preparados = {self.id_do_registro(r): r for r in self._ler()}
+            try:
+                yield
+            finally:
+                self._preparados = None
+
+    def _persistir_alteracoes(self) -> None:
+        self._gravar(list(self._preparados.values()))
+
+    def _descartar_alteracoes(self) -> None:
+        pass  # O arquivo não foi alterado; os registros preparados são descartados ao fim da transação
+
+    # === Leitura e escrita ===
+
+    def listar(self) -> List[dict]:
+        return self._ler()
+
+    def buscar(self, id_valor) -> Optional[dict]:
+        id_valor = self.normalizar_id(id_valor)
+        return next((r for r in self._ler() if self.id_do_registro(r) == id_valor), None)
+
+    def inserir(self, registro: dict, autor=None) -> None:
+        def operacao():
+            id_valor = self.id_do_registro(registro)
+            if id_valor in self._preparados:
+                raise self._erro_duplicado(registro)
+            self._preparados[id_valor] = registro
+            self._alterou()
+
+        self._escrever(operacao, autor)
+
+    def atualizar(self, registro: dict, autor=None) -> bool:
+        def operacao() -> bool:
+            id_valor = self.id_do_registro(registro)
+            atual = self._preparados.get(id_valor)
+            if atual is None:
+                return False
+            self._verificar_versao(atual, registro)
+            self._preparados[id_valor] = registro
+            self._alterou()
+            return True
+
+        return self._escrever(operacao, autor)
+
+    def remover(self, id_valor, autor=None) -> bool:
+        def operacao() -> bool:
+            if self._preparados.pop(self.normalizar_id(id_valor), None) is None:
+                return False
+            self._alterou()
+            return True
+
+        return self._escrever(operacao, autor)
+
+    def substituir_todos(self, registros: List[dict]) -> None:
+        def operacao():
+            self._preparados = {self.id_do_registro(r): r for r in registros}
+            self._alterou()
+
+        self._escrever(operacao)
+
+    def aplicar_lote(self, operacoes: List[tuple], autor=None) -> None:
+        def operacao():
+            validadas = self._validar_lote(operacoes, self._preparados.get)
+            if not validadas:
+                return
+            for tipo, id_valor, registro in validadas:
+                if tipo == self.OP_REMOVER:
+                    del self._preparados[id_valor]
+                else:
+                    self._preparados[id_valor] = registro
+            self._alterou()
+
+        self._escrever(operacao, autor)
@@ -0,0 +1,277 @@
+import json
+import os
+import re
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, List, Optional
+from dao.motores.motor_armazenamento import MotorArmazenamento
+from utils.logger import logger
+
+
+class MotorSqlite(MotorArmazenamento):
+    """
+    Motor de armazenamento em SQLite.
+
+    Cada arquivo de dados (contas.json, pessoas.json, clientes.json) vira uma tabela
+    no banco informado, com chave primária no campo identificador e o registro
+    completo serializado em JSON na coluna "dados". A ordem de inserção é a do rowid.
+
+    Na primeira abertura, se a tabela ainda não foi populada, os registros do arquivo
+    JSON original são importados.
+
+    Alterações de outras conexões são detectadas por PRAGMA data_version, que muda
+    quando qualquer outra conexão confirma uma transação no banco. Como o banco é
+    compartilhado pelas tabelas, cada tabela tem também um contador de gerações
+    persistido (_geracoes), incrementado na mesma transação das suas escritas.
+
+    A durabilidade é aplicada por PRAGMA synchronous: OFF com DURABILIDADE_NENHUMA e
+    FULL nas demais. Com DURABILIDADE_GRUPO, escritas simultâneas são confirmadas
+    em um único COMMIT.
+    """
+
+    def __init__(self, caminho: str, chave: str, caminho_banco: str, durabilidade: str = None):
+        """
+        Inicializa o motor, criando a tabela se necessário.
+
+        Args:
+            caminho (str): Caminho do arquivo JSON correspondente (define o nome da tabela).
+            chave (str): Campo identificador, usado como chave primária.
+            caminho_banco (str): Caminho do arquivo SQLite.
+            durabilidade (str, opcional): Uma das constantes DURABILIDADE_*.
+
+        Raises:
+            ValueError: Se o nome da tabela ou da chave não for um identificador válido.
+        """
+        super().__init__(caminho, chave, durabilidade)
+        self.caminho_banco = caminho_banco
+        self.tabela = os.path.splitext(os.path.basename(caminho))[0]
+
+        for nome in (self.tabela, self.chave):
+            if not re.fullmatch(r"[A-Za-z_][A-Za-z0-9_]*", nome):
+                raise ValueError(f"Identificador inválido para SQLite: {nome}")
+
+        self._trava = threading.RLock()
+        self._conexao = sqlite3.connect(caminho_banco, check_same_thread=False)
+        self._conexao.execute(f"PRAGMA synchronous = {'FULL' if self.sincronizar_disco else 'OFF'}")
+        self._criar_tabela()
+        self._importar_json_original()
+        self._versao_dados = self._consultar_versao_dados()
+
+    def _consultar_versao_dados(self) -> int:
+        return self._conexao.execute("PRAGMA data_version").fetchone()[0]
+
+    def assinatura_dados(self) -> tuple:
+        with self._trava:
+            linha = self._conexao.execute(
+                "SELECT geracao FROM _geracoes WHERE tabela = ?", (self.tabela,)
+            ).fetchone()
+        return (linha[0] if linha else 0,)
+
+    def sincronizar(self) -> bool:
+        with self._trava:
+            versao = self._consultar_versao_dados()
+            if versao == self._versao_dados:
+                return False
+            self._versao_dados = versao
+            self._marcar_alteracao()
+            return True
+
+    def _criar_tabela(self) -> None:
+        with self._trava, self._conexao:
+            self._conexao.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.tabela} ("
+                f"{self.chave} TEXT PRIMARY KEY, dados TEXT NOT NULL)"
+            )
+            self._conexao.execute(
+                "CREATE TABLE IF NOT EXISTS _importacoes (tabela TEXT PRIMARY KEY)"
+            )
+            self._conexao.execute(
+                "CREATE TABLE IF NOT EXISTS _geracoes (tabela TEXT PRIMARY KEY, geracao INTEGER NOT NULL)"
+            )
+
+    def _importar_json_original(self) -> None:
+        """
+        Importa, uma única vez, os registros do arquivo JSON original para a tabela.
+        """
+        with self._trava, self._conexao:
+            ja_importado = self._conexao.execute(
+                "SELECT 1 FROM _importacoes WHERE tabela = ?", (self.tabela,)
+            ).fetchone()
+            if ja_importado:
+                return
+
+            try:
+                with open(self.caminho, 'r', encoding='utf-8') as f:
+                    registros = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                registros = []
+
+            self._conexao.executemany(
+                f"INSERT OR REPLACE INTO {self.tabela} ({self.chave}, dados) VALUES (?, ?)",
+                [(self.id_do_registro(r), json.dumps(r, ensure_ascii=False)) for r in registros]
+            )
+            self._conexao.execute("INSERT INTO _importacoes (tabela) VALUES (?)", (self.tabela,))
+            self._incrementar_geracao()
+
+            if registros:
+                logger.info(f"{len(registros)} registros importados de {self.caminho} para SQLite.")
+
+    def listar(self) -> List[dict]:
+        with self._trava:
+            linhas = self._conexao.execute(
+                f"SELECT dados FROM {self.tabela} ORDER BY rowid"
+            ).fetchall()
+        return [json.loads(dados) for (dados,) in linhas]
+
+    def buscar(self, id_valor) -> Optional[dict]:
+        with self._trava:
+            linha = self._conexao.execute(
+                f"SELECT dados FROM {self.tabela} WHERE {self.chave} = ?",
+                (self.normalizar_id(id_valor),)
+            ).fetchone()
+        return json.loads(linha[0]) if linha else None
+
+    def inserir(self, registro: dict, autor=None) -> None:
+        def operacao():
+            try:
+                self._executar_isolado(lambda: self._conexao.execute(
+                    f"INSERT INTO {self.tabela} ({self.chave}, dados) VALUES (?, ?)",
+                    (self.id_do_registro(registro), json.dumps(registro, ensure_ascii=False))
+                ))
+            except sqlite3.IntegrityError:
+                raise self._erro_duplicado(registro)
+            self._alterou()
+
+        self._escrever(operacao, autor)
+
+    def atualizar(self, registro: dict, autor=None) -> bool:
+        id_valor = self.id_do_registro(registro)
+
+        def operacao():
+            atual = self._buscar_armazenado(id_valor)
+            if atual is None:
+                return False
+            self._verificar_versao(atual, registro)
+            self._executar_isolado(lambda: self._conexao.execute(
+                f"UPDATE {self.tabela} SET dados = ? WHERE {self.chave} = ?",
+                (json.dumps(registro, ensure_ascii=False), id_valor)
+            ))
+            self._alterou()
+            return True
+
+        return self._escrever(operacao, autor)
+
+    def remover(self, id_valor, autor=None) -> bool:
+        def operacao():
+            cursor = self._executar_isolado(lambda: self._conexao.execute(
+                f"DELETE FROM {self.tabela} WHERE {self.chave} = ?",
+                (self.normalizar_id(id_valor),)
+            ))
+            if cursor.rowcount == 0:
+                return False
+            self._alterou()
+            return True
+
+        return self._escrever(operacao, autor)
+
+    def aplicar_lote(self, operacoes: List[tuple], autor=None) -> None:
+        def operacao():
+            validadas = self._validar_lote(operacoes, self._buscar_armazenado)
+            self._executar_isolado(lambda: self._gravar_lote(validadas))
+            self._alterou()
+
+        self._escrever(operacao, autor)
+
+    def _alterou(self) -> None:
+        """
+        Registra a alteração e incrementa a geração persistida da tabela, na mesma transação.
+        """
+        self._incrementar_geracao()
+        super()._alterou()
+
+    def _incrementar_geracao(self) -> None:
+        self._conexao.execute(
+            "INSERT INTO _geracoes (tabela, geracao) VALUES (?, 1) "
+            "ON CONFLICT(tabela) DO UPDATE SET geracao = geracao + 1",
+            (self.tabela,)
+        )
+
+    def _gravar_lote(self, validadas: List[tuple]) -> None:
+        for operacao, id_valor, registro in validadas:
+            if operacao == self.OP_REMOVER:
+                self._conexao.execute(
+                    f"DELETE FROM {self.tabela} WHERE {self.chave} = ?", (id_valor,)
+                )
+            elif operacao == self.OP_ATUALIZAR:
+                self._conexao.execute(
+                    f"UPDATE {self.tabela} SET dados = ? WHERE {self.chave} = ?",
+                    (json.dumps(registro, ensure_ascii=False), id_valor)
+                )
+            else:
+                self._conexao.execute(
+                    f"INSERT INTO {self.tabela} ({self.chave}, dados) VALUES (?, ?)",
+                    (id_valor, json.dumps(registro, ensure_ascii=False))
+                )
+
+    def _executar_isolado(self, gravar: Callable[[], Any]) -> Any:
+        """
+        Executa as instruções de uma operação dentro de um SAVEPOINT: se alguma falhar,
+        só as dessa operação são desfeitas, e as demais do grupo seguem na transação.
+        """
+        self._conexao.execute("SAVEPOINT operacao")
+        try:
+            resultado = gravar()
+        except BaseException:
+            self._conexao.execute("ROLLBACK TO operacao")
+            self._conexao.execute("RELEASE operacao")
+            raise
+        self._conexao.execute("RELEASE operacao")
+        return resultado
+
+    @contextmanager
+    def _transacao_escrita(self) -> Iterator[None]:
+        """
+        Abre uma transação que já reserva a escrita no banco (BEGIN IMMEDIATE), para que
+        as validações e gravações das operações não se intercalem com outra conexão.
+        """
+        with self._trava:
+            self._conexao.execute("BEGIN IMMEDIATE")
+            try:
+                self.sincronizar()
+                yield
+            finally:
+                if self._conexao.in_transaction:
+                    self._conexao.rollback()
+
+    def _persistir_alteracoes(self) -> None:
+        self._conexao.commit()
+
+    def _descartar_alteracoes(self) -> None:
+        self._conexao.rollback()
+
+    def _buscar_armazenado(self, id_valor: str) -> Optional[dict]:
+        """
+        Retorna o registro com o identificador (já normalizado) informado, ou None.
+        """
+        linha = self._conexao.execute(
+            f"SELECT dados FROM {self.tabela} WHERE {self.chave} = ?", (id_valor,)
+        ).fetchone()
+        return json.loads(linha[0]) if linha else None
+
+    def substituir_todos(self, registros: List[dict]) -> None:
+        with self._trava, self._conexao:
+            self._conexao.execute(f"DELETE FROM {self.tabela}")
+            self._conexao.executemany(
+                f"INSERT OR REPLACE INTO {self.tabela} ({self.chave}, dados) VALUES (?, ?)",
+                [(self.id_do_registro(r), json.dumps(r, ensure_ascii=False)) for r in registros]
+            )
+            self._incrementar_geracao()
+            self._marcar_alteracao()
+
+    def fechar(self) -> None:
+        """
+        Fecha a conexão com o banco.
+        """
+        with self._trava:
+            self._conexao.close()
@@ -0,0 +1,74 @@
+import os
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+from utils.logger import logger
+
+try:
+    import fcntl
+except ImportError:  # Windows: sem fcntl, a exclusão fica restrita ao processo atual
+    fcntl = None
+
+
+class TravaArquivo:
+    """
+    Trava de leitura/escrita entre processos, feita com flock sobre um arquivo auxiliar
+    (ex.: "contas.json.lock"), ao lado do arquivo de dados.
+
+    - compartilhada(): vários leitores ao mesmo tempo, nenhum escritor.
+    - exclusiva(): um único escritor, nenhum leitor.
+
+    A trava é reentrante dentro da mesma thread: blocos aninhados (ex.: uma leitura
+    compartilhada dentro de uma escrita exclusiva) reaproveitam a trava já obtida.
+    Dentro do processo, as threads também se excluem mutuamente.
+
+    Sem fcntl (Windows), apenas a exclusão entre threads do processo é garantida.
+    """
+
+    _aviso_emitido = False
+
+    def __init__(self, caminho_dados: str):
+        """
+        Args:
+            caminho_dados (str): Caminho do arquivo protegido; a trava usa caminho_dados + ".lock".
+        """
+        self.caminho = caminho_dados + ".lock"
+        self._trava_threads = threading.RLock()
+        self._profundidade = 0
+        self._descritor = None
+
+        if fcntl is None and not TravaArquivo._aviso_emitido:
+            logger.warning("fcntl indisponível: travas de arquivo valem apenas dentro deste processo.")
+            TravaArquivo._aviso_emitido = True
+
+    @contextmanager
+    def compartilhada(self) -> Iterator[None]:
+        """
+        Mantém a trava de leitura durante o bloco.
+        """
+        with self._travar(fcntl.LOCK_SH if fcntl else None):
+            yield
+
+    @contextmanager
+    def exclusiva(self) -> Iterator[None]:
+        """
+        Mantém a trava de escrita durante o bloco.
+        """
+        with self._travar(fcntl.LOCK_EX if fcntl else None):
+            yield
+
+    @contextmanager
+    def _travar(self, modo) -> Iterator[None]:
+        with self._trava_threads:
+            if self._profundidade == 0 and fcntl is not None:
+                self._descritor = os.open(self.caminho, os.O_RDWR | os.O_CREAT, 0o644)
+                fcntl.flock(self._descritor, modo)
+            self._profundidade += 1
+            try:
+                yield
+            finally:
+                self._profundidade -= 1
+                if self._profundidade == 0 and self._descritor is not None:
+                    fcntl.flock(self._descritor, fcntl.LOCK_UN)
+                    os.close(self._descritor)
+                    self._descritor = None
@@ -0,0 +1,95 @@
+import os
+import threading
+from dao import dao as modulo_dao
+from dao.dao import DAO
+from dao.cliente_dao import ClienteDAO
+from dao.conta_dao import ContaDAO
+from dao.pessoa_dao import PessoaDAO
+from dao.travas_contas import TravasContas
+from utils.constantes import DIRETORIO_TRAVAS_CONTAS
+
+
+class RegistroDAO:
+    """
+    Registro das instâncias de DAO compartilhadas pelo processo.
+
+    Controladores e telas devem obter os DAOs por aqui, em vez de instanciá-los a
+    cada chamada: assim os caches e os mapas de identidade sobrevivem entre as
+    chamadas e existe um único objeto Conta, Pessoa ou Cliente por identificador.
+    O ClienteDAO compartilhado usa os mesmos PessoaDAO e ContaDAO do registro, de
+    modo que as contas de um cliente são os próprios objetos do ContaDAO.
+
+    As escritas feitas pelos DAOs atualizam seus caches. As instâncias são separadas
+    por diretório de dados (DIRETORIO_DATABASE).
+
+    O registro também guarda o gerenciador de travas por conta do processo.
+    """
+
+    _instancias: dict[tuple[str, str], DAO] = {}
+    _travas_contas: dict[str, TravasContas] = {}
+    _trava = threading.RLock()
+
+    @staticmethod
+    def contas() -> ContaDAO:
+        """
+        Retorna o ContaDAO compartilhado.
+        """
+        return RegistroDAO._obter(ContaDAO, ContaDAO)
+
+    @staticmethod
+    def pessoas() -> PessoaDAO:
+        """
+        Retorna o PessoaDAO compartilhado.
+        """
+        return RegistroDAO._obter(PessoaDAO, PessoaDAO)
+
+    @staticmethod
+    def clientes() -> ClienteDAO:
+        """
+        Retorna o ClienteDAO compartilhado, ligado aos PessoaDAO e ContaDAO compartilhados.
+        """
+        return RegistroDAO._obter(
+            ClienteDAO, lambda: ClienteDAO(pessoa_dao=RegistroDAO.pessoas(), conta_dao=RegistroDAO.contas())
+        )
+
+    @staticmethod
+    def travas_contas() -> TravasContas:
+        """
+        Retorna o gerenciador de travas por conta compartilhado.
+        """
+        diretorio = os.path.abspath(modulo_dao.DIRETORIO_DATABASE)
+        with RegistroDAO._trava:
+            travas = RegistroDAO._travas_contas.get(diretorio)
+            if travas is None:
+                travas = TravasContas(os.path.join(diretorio, DIRETORIO_TRAVAS_CONTAS))
+                RegistroDAO._travas_contas[diretorio] = travas
+            return travas
+
+    @staticmethod
+    def limpar_caches() -> None:
+        """
+        Descarta os objetos em cache de todos os DAOs compartilhados; a próxima
+        consulta relê os dados do motor de armazenamento.
+        """
+        with RegistroDAO._trava:
+            for dao in RegistroDAO._instancias.values():
+                dao.limpar_cache()
+
+    @staticmethod
+    def descartar() -> None:
+        """
+        Esquece as instâncias compartilhadas (usado em testes e ao trocar de diretório de dados).
+        """
+        with RegistroDAO._trava:
+            RegistroDAO._instancias.clear()
+            RegistroDAO._travas_contas.clear()
+
+    @staticmethod
+    def _obter(classe: type, fabrica) -> DAO:
+        chave = (classe.__name__, os.path.abspath(modulo_dao.DIRETORIO_DATABASE))
+        with RegistroDAO._trava:
+            dao = RegistroDAO._instancias.get(chave)
+            if dao is None:
+                dao = fabrica()
+                RegistroDAO._instancias[chave] = dao
+            return dao
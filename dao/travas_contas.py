@@ -0,0 +1,94 @@
+import os
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+try:
+    import fcntl
+except ImportError:  # Windows: sem fcntl, as travas valem apenas dentro deste processo
+    fcntl = None
+
+
+class TravasContas:
+    """
+    Gerenciador de travas por conta, para operações que leem, validam e alteram
+    saldos (ex.: transferências).
+
+    Cada conta tem uma trava entre threads do processo e, entre processos, um flock
+    exclusivo sobre um pequeno arquivo próprio ("<numero>.lock" no diretório de travas).
+    As travas de uma operação são sempre obtidas em ordem crescente de número de conta,
+    o que evita o impasse entre transferências A -> B e B -> A simultâneas. Operações
+    sobre contas distintas não esperam umas pelas outras.
+
+    Usa flock, e não fcntl.lockf sobre um único arquivo, porque as travas de intervalo
+    POSIX pertencem ao processo inteiro: com várias threads por processo, o kernel
+    acusaria impasses (EDEADLK) que não existem.
+
+    Com entre_processos=False, só a trava entre threads é usada: é o modo das
+    transferências, em que a disputa com outros processos é detectada pela versão
+    dos registros (ConflitoVersaoError) e não exige arquivo de trava.
+    """
+
+    def __init__(self, caminho: str):
+        """
+        Args:
+            caminho (str): Diretório dos arquivos de trava entre processos (criado se necessário).
+        """
+        self.caminho = caminho
+        self._travas: dict[int, threading.Lock] = {}
+        self._trava_dicionario = threading.Lock()
+        if fcntl is not None:
+            os.makedirs(caminho, exist_ok=True)
+
+    def _trava_da_conta(self, numero: int) -> threading.Lock:
+        with self._trava_dicionario:
+            trava = self._travas.get(numero)
+            if trava is None:
+                trava = self._travas[numero] = threading.Lock()
+            return trava
+
+    @contextmanager
+    def travar(self, *numeros_contas, entre_processos: bool = True) -> Iterator[None]:
+        """
+        Mantém travadas as contas informadas durante o bloco.
+
+        Args:
+            *numeros_contas: Números das contas (int ou str); repetições são ignoradas.
+            entre_processos (bool): Se False, trava apenas as threads deste processo.
+
+        Raises:
+            ValueError: Se algum número de conta não for numérico.
+        """
+        ordenadas = sorted({int(numero) for numero in numeros_contas})
+        obtidas = []
+        try:
+            for numero in ordenadas:
+                trava = self._trava_da_conta(numero)
+                trava.acquire()
+                try:
+                    descritor = self._travar_arquivo(numero) if entre_processos else None
+                except BaseException:
+                    trava.release()
+                    raise
+                obtidas.append((trava, descritor))
+            yield
+        finally:
+            for trava, descritor in reversed(obtidas):
+                if descritor is not None:
+                    fcntl.flock(descritor, fcntl.LOCK_UN)
+                    os.close(descritor)
+                trava.release()
+
+    def _travar_arquivo(self, numero: int):
+        """
+        Obtém o flock exclusivo do arquivo da conta. Retorna o descritor, ou None sem fcntl.
+        """
+        if fcntl is None:
+            return None
+        descritor = os.open(os.path.join(self.caminho, f"{numero}.lock"), os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(descritor, fcntl.LOCK_EX)
+        except BaseException:
+            os.close(descritor)
+            raise
+        return descritor
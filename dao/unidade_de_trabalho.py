@@ -0,0 +1,124 @@
+from typing import Optional
+from dao.dao import DAO
+from dao.motores.motor_armazenamento import MotorArmazenamento
+from dao.registro_dao import RegistroDAO
+from utils.logger import logger
+
+
+class UnidadeDeTrabalho:
+    """
+    Agrupa alterações em objetos de um ou mais DAOs e as persiste de uma vez.
+
+    As alterações de cada DAO viram um único lote atômico no motor de armazenamento
+    (uma linha no journal, um arquivo temporário renomeado ou uma transação SQLite).
+    Os DAOs são gravados na ordem em que foram registrados pela primeira vez: registre
+    primeiro as contas e depois os clientes, para que uma falha entre os dois arquivos
+    deixe no máximo uma conta sem dono, nunca um cliente apontando para conta inexistente.
+
+    Uso:
+        with UnidadeDeTrabalho() as unidade:
+            unidade.registrar_alteracao(conta_dao, conta_origem)
+            unidade.registrar_alteracao(conta_dao, conta_destino)
+
+    Ao sair do bloco sem exceção, confirmar() é chamado; com exceção, nada é gravado.
+    Se nada chegar ao disco, os caches dos DAOs envolvidos são descartados, já que
+    os objetos registrados podem ter sido alterados em memória.
+    """
+
+    def __init__(self):
+        # DAO -> {id normalizado: (operação, objeto ou identificador)}, na ordem de registro
+        self._pendentes: dict[DAO, dict[str, tuple]] = {}
+
+    def registrar_novo(self, dao: DAO, obj) -> None:
+        """
+        Marca um objeto para inserção. Se o mesmo identificador já estiver marcado
+        para remoção nesta unidade, o registro é substituído (atualização).
+        """
+        id_valor = self._id_do_objeto(dao, obj)
+        anterior = self._pendentes.get(dao, {}).get(id_valor)
+        if anterior is not None and anterior[0] == MotorArmazenamento.OP_REMOVER:
+            self._registrar(dao, id_valor, MotorArmazenamento.OP_ATUALIZAR, obj)
+        else:
+            self._registrar(dao, id_valor, MotorArmazenamento.OP_INSERIR, obj)
+
+    def registrar_alteracao(self, dao: DAO, obj) -> None:
+        """
+        Marca um objeto existente para atualização. Se ele já estiver marcado para
+        inserção nesta unidade, continua sendo uma inserção.
+        """
+        id_valor = self._id_do_objeto(dao, obj)
+        anterior = self._pendentes.get(dao, {}).get(id_valor)
+        if anterior is not None and anterior[0] == MotorArmazenamento.OP_INSERIR:
+            self._registrar(dao, id_valor, MotorArmazenamento.OP_INSERIR, obj)
+        else:
+            self._registrar(dao, id_valor, MotorArmazenamento.OP_ATUALIZAR, obj)
+
+    def registrar_remocao(self, dao: DAO, id_valor) -> None:
+        """
+        Marca um objeto para remoção pelo identificador.
+        """
+        id_normalizado = dao._normalizar_id(id_valor)
+        anterior = self._pendentes.get(dao, {}).get(id_normalizado)
+        if anterior is not None and anterior[0] == MotorArmazenamento.OP_INSERIR:
+            del self._pendentes[dao][id_normalizado]  # Inserido e removido na mesma unidade
+            return
+        self._registrar(dao, id_normalizado, MotorArmazenamento.OP_REMOVER, id_valor)
+
+    def confirmar(self) -> None:
+        """
+        Grava as alterações pendentes, um lote atômico por DAO, e esvazia a unidade.
+
+        Raises:
+            ValueError: Se algum lote for inválido. Os lotes de DAOs anteriores já
+                gravados permanecem; os seguintes não são gravados.
+        """
+        pendentes, self._pendentes = self._pendentes, {}
+        daos = list(pendentes)
+        for posicao, dao in enumerate(daos):
+            if not pendentes[dao]:
+                continue
+            try:
+                dao.aplicar_lote(list(pendentes[dao].values()))
+            except Exception:
+                logger.error(f"Falha ao gravar lote em {dao.arquivo_json}; lotes seguintes descartados.")
+                self._invalidar_caches(daos[posicao:])
+                raise
+
+    def descartar(self) -> None:
+        """
+        Esquece as alterações pendentes sem gravar nada.
+        """
+        pendentes, self._pendentes = self._pendentes, {}
+        self._invalidar_caches(list(pendentes))
+
+    def __enter__(self) -> "UnidadeDeTrabalho":
+        return self
+
+    def __exit__(self, tipo_excecao, excecao, rastreamento) -> Optional[bool]:
+        if tipo_excecao is None:
+            self.confirmar()
+        else:
+            self.descartar()
+        return None
+
+    # === Auxiliares ===
+
+    @staticmethod
+    def _invalidar_caches(daos: list) -> None:
+        """
+        Descarta os caches dos DAOs cujas alterações não foram gravadas. Os caches
+        compartilhados do RegistroDAO também são descartados, pois os clientes em
+        cache referenciam as mesmas contas e pessoas.
+        """
+        if not daos:
+            return
+        for dao in daos:
+            dao.limpar_cache()
+        RegistroDAO.limpar_caches()
+
+    def _registrar(self, dao: DAO, id_valor: str, operacao: str, alvo) -> None:
+        self._pendentes.setdefault(dao, {})[id_valor] = (operacao, alvo)
+
+    @staticmethod
+    def _id_do_objeto(dao: DAO, obj) -> str:
+        return dao._normalizar_id(dao.extrair_dados_do_objeto(obj)[dao.tipo_de_id()])
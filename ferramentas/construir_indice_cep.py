@@ -0,0 +1,37 @@
+"""
+Gera o índice offline de CEPs usado quando BACKEND_CEP = BACKEND_CEP_OFFLINE.
+
+O CSV de entrada deve ter as colunas cep, logradouro, bairro, localidade e uf.
+
+Uso (a partir da raiz do projeto):
+    python -m ferramentas.construir_indice_cep ceps.csv
+    python -m ferramentas.construir_indice_cep ceps.csv --saida database/ceps.idx
+"""
+import argparse
+import os
+import time
+
+from utils.constantes import DIRETORIO_DATABASE, ARQUIVO_INDICE_CEP
+from utils.indice_cep_offline import IndiceCepOffline
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("csv", help="Arquivo CSV com os CEPs.")
+    parser.add_argument(
+        "--saida",
+        default=os.path.join(DIRETORIO_DATABASE, ARQUIVO_INDICE_CEP),
+        help="Arquivo de índice gerado (padrão: %(default)s)."
+    )
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    quantidade = IndiceCepOffline.construir(args.csv, args.saida)
+    duracao = time.perf_counter() - inicio
+
+    tamanho_mb = os.path.getsize(args.saida) / (1024 * 1024)
+    print(f"{quantidade} CEPs indexados em {args.saida} ({tamanho_mb:.1f} MB, {duracao:.2f} s).")
+
+
+if __name__ == "__main__":
+    main()
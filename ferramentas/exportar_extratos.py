@@ -0,0 +1,75 @@
+"""
+Exporta os extratos de várias contas (ou de todas) para arquivos CSV ou OFX, um por
+conta ("extrato_<numero>.<formato>" no diretório de destino).
+
+Cada extrato é gerado em trechos, lidos do ledger à medida que são gravados, com
+memória constante por conta; as contas são divididas entre processos (--workers).
+
+Uso (a partir da raiz do projeto):
+    python -m ferramentas.exportar_extratos 1001 1002 --formato ofx --inicio 01/01/2024 --fim 31/12/2024
+    python -m ferramentas.exportar_extratos --todas --workers 4 --destino extratos
+"""
+import argparse
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, time as horario
+from itertools import repeat
+
+from controller.conta_controller import ContaController
+from dao.registro_dao import RegistroDAO
+from utils.constantes import FORMATO_EXPORTACAO_CSV, FORMATO_EXPORTACAO_OFX
+from utils.helpers import converter_str_para_datetime
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("contas", nargs="*", help="Números das contas exportadas.")
+    parser.add_argument("--todas", action="store_true", help="Exporta todas as contas.")
+    parser.add_argument("--formato", choices=(FORMATO_EXPORTACAO_CSV, FORMATO_EXPORTACAO_OFX),
+                        default=FORMATO_EXPORTACAO_CSV)
+    parser.add_argument("--inicio", type=converter_str_para_datetime, default=None,
+                        help="Primeiro dia do período (dd/mm/aaaa).")
+    parser.add_argument("--fim", type=converter_str_para_datetime, default=None,
+                        help="Último dia do período (dd/mm/aaaa), inclusive.")
+    parser.add_argument("--destino", default="extratos", help="Diretório dos arquivos (padrão: %(default)s).")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Processos exportando contas ao mesmo tempo (padrão: %(default)s).")
+    args = parser.parse_args()
+
+    if args.todas:
+        numeros = [conta.get_numero_conta() for conta in RegistroDAO.contas().listar_todos_objetos()]
+    elif args.contas:
+        numeros = args.contas
+    else:
+        parser.error("informe as contas ou --todas.")
+    fim = datetime.combine(args.fim, horario.max) if args.fim else None
+
+    os.makedirs(args.destino, exist_ok=True)
+    caminhos = [os.path.join(args.destino, f"extrato_{numero}.{args.formato}") for numero in numeros]
+    parametros = (numeros, caminhos, repeat(args.formato), repeat(args.inicio), repeat(fim))
+
+    inicio = time.perf_counter()
+    if args.workers > 1 and len(numeros) > 1:
+        with ProcessPoolExecutor(max_workers=args.workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+            resultados = list(executor.map(
+                ContaController.exportar_extrato_para_arquivo, *parametros,
+                chunksize=max(1, len(numeros) // (args.workers * 4))
+            ))
+    else:
+        resultados = list(map(ContaController.exportar_extrato_para_arquivo, *parametros))
+    duracao = time.perf_counter() - inicio
+
+    erros = [(numero, erro) for numero, (_, erro) in zip(numeros, resultados) if erro]
+    total = sum(tamanho for tamanho, erro in resultados if not erro)
+    print(f"{len(numeros) - len(erros)} extratos exportados ({total / 2 ** 20:.1f} MiB) em {duracao:.2f} s "
+          f"com {args.workers} processos; {len(erros)} erros.")
+    for numero, erro in erros:
+        print(f"  conta {numero}: {erro}")
+    if erros:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
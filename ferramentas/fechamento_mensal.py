@@ -0,0 +1,36 @@
+"""
+Fechamento do mês: aplica a atualização mensal (taxa de manutenção das contas
+correntes e rendimento das poupanças) a todas as contas ativas, em lotes.
+Ao final, informa os totais e a vazão (contas por segundo).
+
+Atenção: cada execução aplica a atualização de novo; execute uma vez por mês.
+
+Uso (a partir da raiz do projeto):
+    python -m ferramentas.fechamento_mensal --lote 500
+"""
+import argparse
+import time
+
+from controller.atualizacao_mensal_controller import AtualizacaoMensalController
+from utils.constantes import TAMANHO_LOTE_ATUALIZACAO_MENSAL
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lote", type=int, default=TAMANHO_LOTE_ATUALIZACAO_MENSAL,
+                        help="Contas gravadas por lote (padrão: %(default)s).")
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    resultado = AtualizacaoMensalController.executar(tamanho_lote=args.lote)
+    duracao = time.perf_counter() - inicio
+
+    print(f"{resultado['atualizadas']} contas atualizadas, {len(resultado['inativas'])} inativas ignoradas, "
+          f"{len(resultado['erros'])} erros, em {duracao:.2f} s "
+          f"({resultado['contas'] / duracao if duracao else 0.0:.0f} contas/s).")
+    for erro in resultado["erros"]:
+        print(f"  erro: {erro}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+"""
+Move o histórico das contas, antes embutido em contas.json, para os ledgers
+append-only de cada conta (ver dao/ledger_dao.py).
+
+A migração também acontece aos poucos, na próxima gravação de cada conta;
+esta ferramenta a faz de uma vez. Pode ser executada mais de uma vez.
+
+Uso (a partir da raiz do projeto):
+    python -m ferramentas.migrar_historicos
+"""
+import argparse
+import time
+
+from dao.conta_dao import ContaDAO
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lote", type=int, default=500, help="Contas gravadas por lote (padrão: %(default)s).")
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    quantidade = ContaDAO().migrar_historicos(args.lote)
+    duracao = time.perf_counter() - inicio
+
+    print(f"{quantidade} contas migradas para ledgers em {duracao:.2f} s.")
+
+
+if __name__ == "__main__":
+    main()
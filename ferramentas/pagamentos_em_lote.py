@@ -0,0 +1,48 @@
+"""
+Processa um arquivo de pagamentos em lote (ex.: folha de pagamento): transferências
+de uma conta de origem para as contas listadas em um CSV.
+
+Formato do arquivo (separado por ";", com cabeçalho; a descrição é opcional):
+    documento;conta;valor;descricao
+    12345678900;1002;1500,00;Salário junho
+
+Grava o resultado de cada linha (efetivada ou rejeitada, com o motivo) e informa a
+vazão (linhas por segundo). A senha é pedida no terminal se não for informada.
+
+Uso (a partir da raiz do projeto):
+    python -m ferramentas.pagamentos_em_lote folha.csv --conta 1001
+"""
+import argparse
+import getpass
+
+from controller.pagamento_lote_controller import PagamentoLoteController
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("entrada", help="Arquivo CSV com as transferências.")
+    parser.add_argument("--conta", type=int, required=True, help="Conta de origem (debitada).")
+    parser.add_argument("--senha", default=None, help="Senha do cliente da conta de origem.")
+    parser.add_argument("--resultado", default=None,
+                        help="Arquivo CSV de resultado (padrão: <entrada>.resultado.csv).")
+    args = parser.parse_args()
+
+    senha = args.senha if args.senha is not None else getpass.getpass("Senha: ")
+    caminho_resultado = args.resultado or f"{args.entrada}.resultado.csv"
+    resultado = PagamentoLoteController.processar_arquivo(args.entrada, caminho_resultado, args.conta, senha)
+
+    if "erros" in resultado:
+        for erro in resultado["erros"]:
+            print(f"erro: {erro}")
+        raise SystemExit(1)
+
+    print(f"{resultado['linhas']} linhas: {resultado['efetivadas']} efetivadas "
+          f"(R$ {resultado['valor_total']:.2f}), {resultado['rejeitadas']} rejeitadas, "
+          f"em {resultado['duracao']:.2f} s ({resultado['linhas_por_segundo']:.0f} linhas/s).")
+    print(f"Resultado gravado em {caminho_resultado}")
+    if not resultado["sucesso"]:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
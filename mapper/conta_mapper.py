@@ -1,6 +1,7 @@
 from model.conta import Conta
 from model.conta_corrente import ContaCorrente
 from model.conta_poupanca import ContaPoupanca
+from mapper.transacao_mapper import TransacaoMapper
 from utils.constantes import TIPO_CCORRENTE, TIPO_CPOUPANCA
 
 
@@ -8,6 +9,10 @@ class ContaMapper:
     """
     Classe responsável por converter objetos Conta (e subclasses)
     para dicionários e vice-versa, com validação de tipo.
+
+    O histórico não faz parte do dicionário: ele fica no ledger da conta (ver
+    dao/ledger_dao.py), e o campo "ledger" guarda a posição confirmada nele.
+    Dicionários antigos, com o histórico embutido em "historico", ainda são aceitos.
     """
 
     @staticmethod
@@ -18,7 +23,7 @@ class ContaMapper:
         Raises:
             ValueError: Se campos obrigatórios estiverem ausentes ou tipo for inválido.
         """
-        campos_obrigatorios = ["tipo", "numero", "saldo", "historico", "ativa"]
+        campos_obrigatorios = ["tipo", "numero", "saldo", "ativa"]
         campos_faltantes = [campo for campo in campos_obrigatorios if campo not in dados]
         if campos_faltantes:
             raise ValueError(f"Campos obrigatórios ausentes: {', '.join(campos_faltantes)}")
@@ -26,27 +31,81 @@ class ContaMapper:
         tipo = dados["tipo"]
         numero = int(dados["numero"])
         saldo = float(dados["saldo"])
-        historico = dados["historico"]
+        historico = ContaMapper._historico_embutido(dados)
         ativa = dados["ativa"]
 
         if tipo == TIPO_CCORRENTE:
-            return ContaCorrente(numero, saldo, historico, ativa)
+            conta = ContaCorrente(numero, saldo, historico, ativa)
+        elif tipo == TIPO_CPOUPANCA:
+            conta = ContaPoupanca(numero, saldo, historico, ativa)
+        else:
+            raise ValueError(f"Tipo de conta desconhecido: {tipo}")
+
+        if historico is None:
+            conta._historico = None  # Gravado no ledger: lido sob demanda
+        conta._set_versao(int(dados.get("versao", 0)))
+        ContaMapper._ler_ledger(conta, dados)
+        return conta
+
+    @staticmethod
+    def from_dict_armazenado(dados: dict) -> Conta:
+        """
+        Constrói uma conta a partir de um registro já persistido, confiando nos dados
+        (sem validação de campos nem do histórico).
+
+        Raises:
+            ValueError: Se o tipo for inválido.
+        """
+        tipo = dados["tipo"]
+        if tipo == TIPO_CCORRENTE:
+            classe = ContaCorrente
         elif tipo == TIPO_CPOUPANCA:
-            return ContaPoupanca(numero, saldo, historico, ativa)
+            classe = ContaPoupanca
         else:
             raise ValueError(f"Tipo de conta desconhecido: {tipo}")
 
+        conta = classe.de_armazenamento(
+            int(dados["numero"]), float(dados["saldo"]), ContaMapper._historico_embutido(dados), dados["ativa"]
+        )
+        conta._set_versao(dados.get("versao", 0))
+        ContaMapper._ler_ledger(conta, dados)
+        return conta
+
+    @staticmethod
+    def _historico_embutido(dados: dict) -> list | None:
+        """
+        Converte o histórico embutido de um dicionário antigo em transações.
+        Retorna None se o dicionário não tiver histórico (ele está no ledger).
+        """
+        historico = dados.get("historico")
+        if historico is None:
+            return None
+        return [TransacaoMapper.from_registro(item) for item in historico]
+
+    @staticmethod
+    def _ler_ledger(conta: Conta, dados: dict) -> None:
+        """
+        Copia para a conta a posição confirmada do ledger, se o dicionário a tiver.
+        """
+        ledger = dados.get("ledger")
+        if ledger:
+            conta._set_ledger(int(ledger["tamanho"]), int(ledger["entradas"]))
+
     @staticmethod
     def to_dict(conta: Conta) -> dict:
         """
         Converte uma instância de Conta em um dicionário serializável.
+        O campo "versao" é a versão lida do armazenamento; o DAO o incrementa ao gravar.
+        O histórico não é incluído (ver ContaDAO).
         """
         tipo = TIPO_CCORRENTE if isinstance(conta, ContaCorrente) else TIPO_CPOUPANCA
+        tamanho, entradas = conta.get_ledger()
 
         return {
             "numero": str(conta.get_numero_conta()),
             "saldo": conta.get_saldo(),
-            "historico": conta.get_historico(),
             "ativa": conta.get_estado_da_conta(),
-            "tipo": tipo
+            "tipo": tipo,
+            "ledger": {"tamanho": tamanho, "entradas": entradas},
+            "versao": conta.get_versao()
         }
\ No newline at end of file
@@ -20,7 +20,7 @@ class PessoaMapper:
         tipo = dados.get("tipo", "").strip().lower()
 
         if tipo == TIPO_PFISICA.lower():
-            return PessoaFisica(
+            pessoa = PessoaFisica(
                 nome=dados["nome"],
                 email=dados["email"],
                 numero_documento=dados["numero_documento"],
@@ -30,9 +30,11 @@ class PessoaMapper:
                 telefone=dados["telefone"],
                 data_nascimento=dados["data_nascimento"]
             )
+            pessoa._set_versao(int(dados.get("versao", 0)))
+            return pessoa
 
         if tipo == TIPO_PJURIDICA.lower():
-            return PessoaJuridica(
+            pessoa = PessoaJuridica(
                 nome=dados["nome"],
                 email=dados["email"],
                 numero_documento=dados["numero_documento"],
@@ -42,6 +44,51 @@ class PessoaMapper:
                 telefone=dados["telefone"],
                 nome_fantasia=dados.get("nome_fantasia", "")
             )
+            pessoa._set_versao(int(dados.get("versao", 0)))
+            return pessoa
+
+        raise ValueError(f"Tipo de pessoa desconhecido: {tipo}")
+
+    @staticmethod
+    def from_dict_armazenado(dados: dict):
+        """
+        Constrói uma PessoaFisica ou PessoaJuridica a partir de um registro já persistido.
+
+        Os dados são considerados válidos e o endereço armazenado é mantido,
+        sem validação nem consulta à API de CEP.
+
+        Raises:
+            ValueError: Se o tipo for desconhecido.
+        """
+        tipo = dados.get("tipo", "").strip().lower()
+
+        if tipo == TIPO_PFISICA.lower():
+            pessoa = PessoaFisica.de_armazenamento(
+                nome=dados["nome"],
+                email=dados["email"],
+                numero_documento=dados["numero_documento"],
+                cep=dados["cep"],
+                numero_endereco=dados["numero_endereco"],
+                endereco=dados.get("endereco", ""),
+                telefone=dados["telefone"],
+                data_nascimento=dados["data_nascimento"]
+            )
+            pessoa._set_versao(int(dados.get("versao", 0)))
+            return pessoa
+
+        if tipo == TIPO_PJURIDICA.lower():
+            pessoa = PessoaJuridica.de_armazenamento(
+                nome=dados["nome"],
+                email=dados["email"],
+                numero_documento=dados["numero_documento"],
+                cep=dados["cep"],
+                numero_endereco=dados["numero_endereco"],
+                endereco=dados.get("endereco", ""),
+                telefone=dados["telefone"],
+                nome_fantasia=dados.get("nome_fantasia", "")
+            )
+            pessoa._set_versao(int(dados.get("versao", 0)))
+            return pessoa
 
         raise ValueError(f"Tipo de pessoa desconhecido: {tipo}")
 
@@ -58,7 +105,8 @@ class PessoaMapper:
             "numero_endereco": pessoa.get_numero_endereco(),
             "endereco": pessoa.get_endereco(),
             "telefone": pessoa.get_telefone(),
-            "tipo": pessoa.get_tipo()
+            "tipo": pessoa.get_tipo(),
+            "versao": pessoa.get_versao()
         }
 
         if pessoa.get_tipo() == TIPO_PFISICA:
@@ -0,0 +1,75 @@
+import re
+from datetime import datetime
+from model.transacao import FORMATO_DATA_HORA, TipoOperacao, Transacao
+
+
+class TransacaoMapper:
+    """
+    Classe responsável por converter transações para o formato gravado nos ledgers
+    e vice-versa.
+
+    Cada transação é gravada como a lista [momento, tipo, valor_centavos, contraparte,
+    descricao]. Registros antigos, em texto livre (ex.: "[2025-06-24 17:54:39]
+    Transferência de R$ 88.00 para conta 1002"), também são aceitos e interpretados.
+    """
+
+    _DATA_HORA = re.compile(r"\[(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})\] (.*)", re.DOTALL)
+    _TEXTOS = (
+        (re.compile(r"Transferência de R\$ (\d+\.\d{2}) para conta (\d+)"), TipoOperacao.TRANSFERENCIA_ENVIADA),
+        (re.compile(r"Recebido R\$ (\d+\.\d{2}) da conta (\d+)"), TipoOperacao.TRANSFERENCIA_RECEBIDA),
+        (re.compile(r"Atualização mensal: taxa de manutenção de R\$ (\d+\.\d{2}) cobrada\."), TipoOperacao.TAXA_MANUTENCAO),
+        (re.compile(r"Atualização mensal: rendimento de R\$ (\d+\.\d{2}) aplicado\."), TipoOperacao.RENDIMENTO),
+        (re.compile(r"Conta encerrada"), TipoOperacao.ENCERRAMENTO),
+    )
+
+    @staticmethod
+    def to_registro(transacao: Transacao) -> list:
+        """
+        Converte uma transação na lista gravada no ledger.
+        """
+        return [
+            transacao.momento,
+            int(transacao.tipo),
+            transacao.valor_centavos,
+            transacao.contraparte,
+            transacao.descricao
+        ]
+
+    @staticmethod
+    def from_registro(registro) -> Transacao:
+        """
+        Constrói uma transação a partir de um registro do ledger (lista ou texto antigo).
+
+        Raises:
+            ValueError: Se o registro não estiver em nenhum dos formatos.
+        """
+        if isinstance(registro, str):
+            return TransacaoMapper.from_texto(registro)
+        try:
+            momento, tipo, valor_centavos, contraparte, descricao = registro
+        except (TypeError, ValueError):
+            raise ValueError(f"Registro de transação inválido: {registro!r}")
+        return Transacao(momento, tipo, valor_centavos, contraparte, descricao)
+
+    @staticmethod
+    def from_texto(texto: str) -> Transacao:
+        """
+        Interpreta uma linha do histórico antigo, em texto livre.
+        Textos que não correspondem a nenhum tipo viram TipoOperacao.OUTRA.
+        """
+        momento = 0
+        corpo = texto
+        data_hora = TransacaoMapper._DATA_HORA.fullmatch(texto)
+        if data_hora:
+            momento = int(datetime.strptime(data_hora.group(1), FORMATO_DATA_HORA).timestamp())
+            corpo = data_hora.group(2)
+
+        for padrao, tipo in TransacaoMapper._TEXTOS:
+            encontrado = padrao.fullmatch(corpo)
+            if encontrado:
+                grupos = encontrado.groups()
+                valor_centavos = round(float(grupos[0]) * 100) if grupos else 0
+                contraparte = grupos[1] if len(grupos) > 1 else None
+                return Transacao(momento, tipo, valor_centavos, contraparte)
+
+        return Transacao(momento, TipoOperacao.OUTRA, descricao=corpo)
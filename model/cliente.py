@@ -12,8 +12,11 @@ class Cliente:
         - Um objeto Pessoa com os dados pessoais (física ou jurídica).
         - Uma senha de acesso ao sistema.
         - Uma ou mais contas bancárias associadas (opcional).
+        - A versão do registro persistido (0 se ainda não foi salvo).
     """
 
+    _versao = 0
+
     def __init__(self, pessoa: Pessoa, senha: str, contas: List[Conta] = None) -> None:
         """
         Inicializa um novo cliente com pessoa, senha e lista opcional de contas.
@@ -58,6 +61,18 @@ class Cliente:
         """
         return self._pessoa.get_numero_documento()
 
+    def get_versao(self) -> int:
+        """
+        Retorna a versão do registro persistido, usada no controle de concorrência otimista.
+        """
+        return self._versao
+
+    def _set_versao(self, versao: int) -> None:
+        """
+        Define a versão do registro. Usado apenas pelo DAO.
+        """
+        self._versao = versao
+
     def verificar_senha(self, senha_digitada: str) -> bool:
         """
         Verifica se a senha informada está correta.
@@ -1,8 +1,10 @@
+import time
 from abc import ABC, abstractmethod
-from utils.helpers import data_hora_atual_str
+from typing import Callable, Optional
 from utils.validadores.validar_conta import ValidarConta as Validar
 from utils.constantes import LIMITE_TRANSFERENCIA_CCORRENTE
 from model.exceptions import ContaInativaError
+from model.transacao import TipoOperacao, Transacao
 
 class Conta(ABC):
     """
@@ -11,11 +13,21 @@ class Conta(ABC):
     Attributes:
         _numero_conta (str): Número único da conta.
         _saldo (float): Saldo atual da conta.
-        _historico (list[str]): Lista de operações realizadas.
+        _historico (list[Transacao] | None): Operações já gravadas no ledger da conta
+            (None enquanto não forem lidas; ver get_transacoes).
+        _historico_pendente (list[Transacao]): Operações registradas e ainda não gravadas.
         _ativa (bool): Indica se a conta está ativa.
+        _versao (int): Versão do registro persistido (0 se ainda não foi salva).
+        _ledger_tamanho (int): Bytes confirmados no ledger da conta.
+        _ledger_entradas (int): Operações confirmadas no ledger da conta.
     """
 
-    def __init__(self, numero: str, saldo: float = 0.0, historico: list[str] = None, ativa: bool = True) -> None:
+    _versao = 0
+    _ledger_tamanho = 0
+    _ledger_entradas = 0
+    _carregar_historico: Optional[Callable[[int], list[Transacao]]] = None  # Definido pelo ContaDAO
+
+    def __init__(self, numero: str, saldo: float = 0.0, historico: list[Transacao] = None, ativa: bool = True) -> None:
         """
         Inicializa uma conta bancária com os dados necessários.
         
@@ -25,7 +37,7 @@ class Conta(ABC):
         Args:
             numero (str): Número da conta.
             saldo (float, opcional): Saldo da conta (pode ser negativo). Padrão: 0.0.
-            historico (list[str], opcional): Lista de transações registradas. Padrão: lista vazia.
+            historico (list[Transacao], opcional): Lista de transações registradas. Padrão: lista vazia.
             ativa (bool, opcional): Estado da conta (ativa ou inativa). Padrão: True.
 
         Raises:
@@ -39,9 +51,38 @@ class Conta(ABC):
 
         self._numero_conta = numero
         self._saldo = saldo
-        self._historico = historico
+        self._historico = []
+        self._historico_pendente = list(historico)
         self._ativa = ativa
 
+    @classmethod
+    def de_armazenamento(cls, numero: str, saldo: float, historico: Optional[list[Transacao]], ativa: bool) -> 'Conta':
+        """
+        Reconstrói uma conta a partir de dados já persistidos, sem passar pelo __init__.
+
+        Nota:
+            Os dados são considerados válidos: o histórico não é percorrido
+            para validação, o que torna a carga proporcional apenas ao número de contas.
+
+        Args:
+            numero (str): Número da conta.
+            saldo (float): Saldo armazenado.
+            historico (list[Transacao] | None): None se o histórico está no ledger (lido sob
+                demanda); uma lista para registros antigos, com o histórico embutido,
+                que passa ao ledger na próxima gravação da conta.
+            ativa (bool): Estado armazenado.
+
+        Returns:
+            Conta: Instância da subclasse em que o método foi chamado.
+        """
+        conta = cls.__new__(cls)
+        conta._numero_conta = numero
+        conta._saldo = saldo
+        conta._historico = None if historico is None else []
+        conta._historico_pendente = list(historico or [])
+        conta._ativa = ativa
+        return conta
+
     @abstractmethod
     def atualizacao_mensal(self) -> None:
         """
@@ -62,7 +103,7 @@ class Conta(ABC):
         """
         return float(LIMITE_TRANSFERENCIA_CCORRENTE)
 
-    def transferir(self, destino: 'Conta', valor: float) -> None:
+    def transferir(self, destino: 'Conta', valor: float, descricao: str = "") -> None:
         """
         Transfere um valor para outra conta, seguindo o fluxo:
             1. Verifica contas ativas
@@ -74,6 +115,7 @@ class Conta(ABC):
         Args:
             destino (Conta): Conta de destino.
             valor (float): Valor a ser transferido.
+            descricao (str, opcional): Descrição registrada nas duas contas.
         
         Raises:
             ContaInativaError: Se a conta origem ou destino estiver inativa.
@@ -83,6 +125,7 @@ class Conta(ABC):
             raise ContaInativaError(self.get_numero_conta())
         if not destino._ativa:
             raise ContaInativaError(destino.get_numero_conta())
+        valor = self._arredondar_centavos(valor)
         if valor <= 0:
             raise ValueError("O valor da transferência deve ser positivo.")
         if valor > self._saldo:
@@ -92,22 +135,35 @@ class Conta(ABC):
                 f"O valor da transferência excede o limite de R$ {self.limite_transferencia:.2f}."
             )
 
-        self._set_saldo(self._saldo - valor)
-        destino._set_saldo(destino._saldo + valor)
-        self._registrar_operacao(
-            f"Transferência de R$ {valor:.2f} para conta {destino.get_numero_conta()}"
+        self._set_saldo(self._arredondar_centavos(self._saldo - valor))
+        destino._set_saldo(self._arredondar_centavos(destino._saldo + valor))
+        momento = int(time.time())
+        self._registrar_transacao(
+            TipoOperacao.TRANSFERENCIA_ENVIADA, valor, destino.get_numero_conta(), descricao, momento
         )
-        destino._registrar_operacao(
-            f"Recebido R$ {valor:.2f} da conta {self.get_numero_conta()}"
+        destino._registrar_transacao(
+            TipoOperacao.TRANSFERENCIA_RECEBIDA, valor, self.get_numero_conta(), descricao, momento
         )
 
+    @staticmethod
+    def _arredondar_centavos(valor):
+        """
+        Arredonda um valor em reais para centavos inteiros, como na gravação das
+        transações (Transacao.valor_centavos), para que o saldo acompanhe exatamente
+        a soma das operações registradas. Aceita float ou arrays NumPy.
+        """
+        centavos = valor * 100
+        if hasattr(centavos, "round"):  # Arrays NumPy: meio a par, como round()
+            return centavos.round() / 100
+        return round(centavos) / 100
+
     def encerrar_conta(self) -> None:
         """
         Encerra a conta, tornando-a inativa.
         Faz o registro de encerramento e adiciona no histórico.
         """
         self._ativa = False
-        self._registrar_operacao("Conta encerrada")
+        self._registrar_transacao(TipoOperacao.ENCERRAMENTO)
 
     def get_estado_da_conta(self) -> bool:
         """
@@ -148,14 +204,26 @@ class Conta(ABC):
             Validar.saldo_positivo_ou_zero(novo_saldo)
         self._saldo = novo_saldo
 
+    def get_transacoes(self) -> list[Transacao]:
+        """
+        Retorna as transações da conta, da mais antiga para a mais recente.
+        As operações gravadas são lidas do ledger na primeira chamada.
+
+        Returns:
+            list[Transacao]: Transações da conta.
+        """
+        if self._historico is None:
+            self._historico = self._carregar_historico(self._ledger_tamanho) if self._carregar_historico else []
+        return self._historico + self._historico_pendente
+
     def get_historico(self) -> list[str]:
         """
-        Retorna o histórico de transações da conta.
+        Retorna o histórico de transações da conta, como texto para exibição.
 
         Returns:
             list[str]: Lista de descrições de transações.
         """
-        return self._historico.copy()
+        return [transacao.formatar() for transacao in self.get_transacoes()]
 
     def get_numero_conta(self) -> str:
         """
@@ -166,15 +234,70 @@ class Conta(ABC):
         """
         return self._numero_conta
 
-    def _registrar_operacao(self, descricao: str) -> None:
+    def get_versao(self) -> int:
+        """
+        Retorna a versão do registro persistido, usada no controle de concorrência otimista.
+
+        Returns:
+            int: Versão lida do armazenamento (0 se a conta ainda não foi salva).
+        """
+        return self._versao
+
+    def _set_versao(self, versao: int) -> None:
+        """
+        Define a versão do registro. Usado apenas pelos mappers e DAOs.
+        """
+        self._versao = versao
+
+    def get_ledger(self) -> tuple[int, int]:
+        """
+        Retorna a posição confirmada do ledger da conta.
+
+        Returns:
+            tuple[int, int]: (bytes, operações) gravados no ledger.
+        """
+        return self._ledger_tamanho, self._ledger_entradas
+
+    def _set_ledger(self, tamanho: int, entradas: int) -> None:
+        """
+        Define a posição confirmada do ledger. Usado apenas pelos mappers e DAOs.
+        """
+        self._ledger_tamanho = tamanho
+        self._ledger_entradas = entradas
+
+    def _confirmar_historico(self) -> None:
+        """
+        Marca as operações pendentes como gravadas no ledger. Usado apenas pelo ContaDAO.
+        """
+        if self._historico is not None:
+            self._historico.extend(self._historico_pendente)
+        self._historico_pendente = []
+
+    def _registrar_transacao(
+        self,
+        tipo: TipoOperacao,
+        valor: float = 0.0,
+        contraparte: str = None,
+        descricao: str = "",
+        momento: int = None
+    ) -> None:
         """
-        Adiciona um registro da operação no histórico da conta, com data e hora.
+        Adiciona uma transação ao histórico da conta, com data e hora.
 
         Args:
-            descricao (str): Descrição da operação.
+            tipo (TipoOperacao): Tipo da operação.
+            valor (float, opcional): Valor da operação, em reais.
+            contraparte (str, opcional): Número da outra conta envolvida.
+            descricao (str, opcional): Descrição informada na operação.
+            momento (int, opcional): Segundos desde a época Unix. Padrão: agora.
         """
-        registro = f"[{data_hora_atual_str()}] {descricao}"
-        self._historico.append(registro)
+        self._historico_pendente.append(Transacao(
+            int(time.time()) if momento is None else momento,
+            tipo,
+            round(valor * 100),
+            None if contraparte is None else str(contraparte),
+            descricao
+        ))
 
     def __str__(self) -> str:
         """
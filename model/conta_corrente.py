@@ -1,5 +1,6 @@
 from model.conta import Conta
 from model.exceptions import ContaInativaError
+from model.transacao import TipoOperacao
 from utils.constantes import TAXA_MANUTENCAO_CCORRENTE
 
 
@@ -9,6 +10,19 @@ class ContaCorrente(Conta):
     Não possui rendimento automático.
     """
 
+    SALDO_NEGATIVO_NA_ATUALIZACAO = True  # A taxa é cobrada mesmo sem saldo
+
+    @staticmethod
+    def regra_mensal(saldo, taxa=TAXA_MANUTENCAO_CCORRENTE) -> tuple:
+        """
+        Regra da atualização mensal: desconta a taxa de manutenção.
+        Aceita saldos float ou arrays NumPy (atualização em lote e projeções).
+
+        Returns:
+            tuple: (novo saldo, valor da taxa cobrada).
+        """
+        return Conta._arredondar_centavos(saldo - taxa), taxa
+
     def atualizacao_mensal(self) -> None:
         """
         Aplica a taxa de manutenção mensal ao saldo da conta.
@@ -22,8 +36,6 @@ class ContaCorrente(Conta):
         if not self.get_estado_da_conta():
             raise ContaInativaError(self.get_numero_conta())
 
-        novo_saldo = self._saldo - TAXA_MANUTENCAO_CCORRENTE
-        self._set_saldo(novo_saldo, permitir_negativo=True)
-        self._registrar_operacao(
-            f"Atualização mensal: taxa de manutenção de R$ {TAXA_MANUTENCAO_CCORRENTE:.2f} cobrada."
-        )
\ No newline at end of file
+        novo_saldo, taxa = self.regra_mensal(self._saldo)
+        self._set_saldo(novo_saldo, permitir_negativo=self.SALDO_NEGATIVO_NA_ATUALIZACAO)
+        self._registrar_transacao(TipoOperacao.TAXA_MANUTENCAO, taxa)
\ No newline at end of file
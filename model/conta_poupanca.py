@@ -1,5 +1,6 @@
 from model.conta import Conta
 from model.exceptions import ContaInativaError
+from model.transacao import TipoOperacao
 from utils.constantes import (
     LIMITE_TRANSFERENCIA_CPOUPANCA,
     RENDIMENTO_MENSAL_CPOUPANCA
@@ -12,6 +13,20 @@ class ContaPoupanca(Conta):
     Herda os comportamentos padrão da classe Conta.
     """
 
+    SALDO_NEGATIVO_NA_ATUALIZACAO = False
+
+    @staticmethod
+    def regra_mensal(saldo, rendimento_mensal=RENDIMENTO_MENSAL_CPOUPANCA) -> tuple:
+        """
+        Regra da atualização mensal: aplica o rendimento, em centavos inteiros, sobre o saldo.
+        Aceita saldos float ou arrays NumPy (atualização em lote e projeções).
+
+        Returns:
+            tuple: (novo saldo, valor do rendimento).
+        """
+        rendimento = Conta._arredondar_centavos(saldo * rendimento_mensal)
+        return Conta._arredondar_centavos(saldo + rendimento), rendimento
+
     @property
     def limite_transferencia(self) -> float:
         """
@@ -29,6 +44,6 @@ class ContaPoupanca(Conta):
         if not self.get_estado_da_conta():
             raise ContaInativaError(self.get_numero_conta())
 
-        rendimento = self._saldo * RENDIMENTO_MENSAL_CPOUPANCA
-        self._set_saldo(self._saldo + rendimento)
-        self._registrar_operacao(f"Atualização mensal: rendimento de R$ {rendimento:.2f} aplicado.")
\ No newline at end of file
+        novo_saldo, rendimento = self.regra_mensal(self._saldo)
+        self._set_saldo(novo_saldo, permitir_negativo=self.SALDO_NEGATIVO_NA_ATUALIZACAO)
+        self._registrar_transacao(TipoOperacao.RENDIMENTO, rendimento)
\ No newline at end of file
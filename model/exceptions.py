@@ -9,3 +9,20 @@ class ContaInativaError(Exception):
             else "A conta está inativa e não pode realizar operações."
         )
         super().__init__(mensagem)
+
+
+class ConflitoVersaoError(Exception):
+    """
+    Exceção lançada quando um registro foi alterado por outra operação desde que
+    foi lido (a versão armazenada não é mais a esperada).
+
+    A operação pode ser repetida depois de reler os dados.
+    """
+
+    def __init__(self, identificador: str = None):
+        mensagem = (
+            f"O registro {identificador} foi alterado por outra operação. Tente novamente." if identificador
+            else "O registro foi alterado por outra operação. Tente novamente."
+        )
+        super().__init__(mensagem)
+        self.identificador = identificador
@@ -10,8 +10,11 @@ class Pessoa(ABC):
     Atributos:
         - nome, email, número de documento, telefone.
         - CEP e número do endereço, com busca automática via API (ViaCEP).
+        - versão do registro persistido (0 se ainda não foi salva).
     """
 
+    _versao = 0
+
     def __init__(
         self,
         nome: str,
@@ -41,6 +44,34 @@ class Pessoa(ABC):
         self._endereco = endereco
         self._atualizar_endereco()
 
+    @classmethod
+    def _de_armazenamento(
+        cls,
+        nome: str,
+        email: str,
+        numero_documento: str,
+        cep: str,
+        numero_endereco: str,
+        telefone: str,
+        endereco: str
+    ) -> 'Pessoa':
+        """
+        Cria a instância a partir de dados já persistidos, sem passar pelo __init__.
+
+        Nota:
+            Os dados são considerados válidos e o endereço armazenado é mantido,
+            portanto nenhuma validação ou consulta à API de CEP é feita.
+        """
+        pessoa = cls.__new__(cls)
+        pessoa._nome = nome
+        pessoa._email = email
+        pessoa._numero_documento = numero_documento
+        pessoa._cep = cep
+        pessoa._numero_endereco = numero_endereco
+        pessoa._telefone = telefone
+        pessoa._endereco = endereco
+        return pessoa
+
     @abstractmethod
     def __str__(self) -> str:
         """
@@ -68,6 +99,12 @@ class Pessoa(ABC):
     def get_numero_documento(self) -> str:
         return self._numero_documento
 
+    def get_versao(self) -> int:
+        return self._versao
+
+    def _set_versao(self, versao: int) -> None:
+        self._versao = versao
+
     def get_cep(self) -> str:
         return self._cep
 
@@ -40,6 +40,29 @@ class PessoaFisica(Pessoa):
             else data_nascimento
         )
 
+    @classmethod
+    def de_armazenamento(
+        cls,
+        nome: str,
+        email: str,
+        numero_documento: str,
+        cep: str,
+        numero_endereco: str,
+        endereco: str,
+        telefone: str,
+        data_nascimento: str | datetime
+    ) -> 'PessoaFisica':
+        """
+        Reconstrói uma Pessoa Física persistida, sem validação nem consulta de CEP.
+        """
+        pessoa = cls._de_armazenamento(nome, email, numero_documento, cep, numero_endereco, telefone, endereco)
+        pessoa._data_nascimento = (
+            datetime.strptime(data_nascimento, "%d/%m/%Y")
+            if isinstance(data_nascimento, str)
+            else data_nascimento
+        )
+        return pessoa
+
     def __str__(self) -> str:
         """
         Representação textual da pessoa física (nome + CPF).
@@ -34,6 +34,25 @@ class PessoaJuridica(Pessoa):
         super().__init__(nome, email, numero_documento, cep, numero_endereco, telefone, endereco)
         self._nome_fantasia = nome_fantasia
 
+    @classmethod
+    def de_armazenamento(
+        cls,
+        nome: str,
+        email: str,
+        numero_documento: str,
+        cep: str,
+        numero_endereco: str,
+        endereco: str,
+        telefone: str,
+        nome_fantasia: str = ""
+    ) -> 'PessoaJuridica':
+        """
+        Reconstrói uma Pessoa Jurídica persistida, sem validação nem consulta de CEP.
+        """
+        pessoa = cls._de_armazenamento(nome, email, numero_documento, cep, numero_endereco, telefone, endereco)
+        pessoa._nome_fantasia = nome_fantasia
+        return pessoa
+
     def __str__(self) -> str:
         """
         Representação textual da pessoa jurídica (nome fantasia + CNPJ).
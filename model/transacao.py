@@ -0,0 +1,122 @@
+from datetime import datetime
+from enum import IntEnum
+from typing import Optional
+
+
+class TipoOperacao(IntEnum):
+    """
+    Tipos de operação registrados no histórico das contas.
+    OUTRA guarda registros antigos em texto livre que não correspondem a nenhum tipo.
+    """
+
+    OUTRA = 0
+    TRANSFERENCIA_ENVIADA = 1
+    TRANSFERENCIA_RECEBIDA = 2
+    TAXA_MANUTENCAO = 3
+    RENDIMENTO = 4
+    ENCERRAMENTO = 5
+
+
+# Sinal do valor no saldo da conta, por tipo de operação
+_SINAIS = {
+    TipoOperacao.OUTRA: 0,
+    TipoOperacao.TRANSFERENCIA_ENVIADA: -1,
+    TipoOperacao.TRANSFERENCIA_RECEBIDA: 1,
+    TipoOperacao.TAXA_MANUTENCAO: -1,
+    TipoOperacao.RENDIMENTO: 1,
+    TipoOperacao.ENCERRAMENTO: 0,
+}
+
+# Textos exibidos no extrato (os mesmos do histórico antigo, em texto livre)
+_MODELOS_TEXTO = {
+    TipoOperacao.TRANSFERENCIA_ENVIADA: "Transferência de R$ {valor:.2f} para conta {contraparte}",
+    TipoOperacao.TRANSFERENCIA_RECEBIDA: "Recebido R$ {valor:.2f} da conta {contraparte}",
+    TipoOperacao.TAXA_MANUTENCAO: "Atualização mensal: taxa de manutenção de R$ {valor:.2f} cobrada.",
+    TipoOperacao.RENDIMENTO: "Atualização mensal: rendimento de R$ {valor:.2f} aplicado.",
+    TipoOperacao.ENCERRAMENTO: "Conta encerrada",
+}
+
+FORMATO_DATA_HORA = "%Y-%m-%d %H:%M:%S"
+
+
+class Transacao:
+    """
+    Registro de uma operação no histórico de uma conta.
+
+    Os campos são valores simples, para que filtrar, ordenar e somar transações
+    não exija interpretar texto.
+
+    Attributes:
+        momento (int): Data e hora da operação, em segundos desde a época Unix
+            (0 para registros antigos sem data).
+        tipo (TipoOperacao): Tipo da operação.
+        valor_centavos (int): Valor da operação em centavos, sempre positivo.
+        contraparte (str | None): Número da outra conta envolvida, se houver.
+        descricao (str): Descrição informada na operação; em OUTRA, o texto original.
+    """
+
+    __slots__ = ("momento", "tipo", "valor_centavos", "contraparte", "descricao")
+
+    def __init__(
+        self,
+        momento: int,
+        tipo: TipoOperacao,
+        valor_centavos: int = 0,
+        contraparte: Optional[str] = None,
+        descricao: str = ""
+    ) -> None:
+        self.momento = momento
+        self.tipo = tipo if type(tipo) is TipoOperacao else TipoOperacao(tipo)
+        self.valor_centavos = valor_centavos
+        self.contraparte = contraparte
+        self.descricao = descricao
+
+    @property
+    def valor(self) -> float:
+        """
+        Retorna o valor da operação em reais.
+        """
+        return self.valor_centavos / 100
+
+    @property
+    def efeito_centavos(self) -> int:
+        """
+        Retorna o efeito da operação no saldo, em centavos: positivo para entradas,
+        negativo para saídas e zero para operações sem movimentação.
+        """
+        return _SINAIS[self.tipo] * self.valor_centavos
+
+    def texto(self) -> str:
+        """
+        Retorna o texto da transação no extrato, sem a data e hora,
+        ex.: "Transferência de R$ 88.00 para conta 1002".
+        """
+        modelo = _MODELOS_TEXTO.get(self.tipo)
+        return modelo.format(valor=self.valor, contraparte=self.contraparte) if modelo else self.descricao
+
+    def formatar(self) -> str:
+        """
+        Retorna a transação no formato de texto usado no extrato,
+        ex.: "[2025-06-24 17:54:39] Transferência de R$ 88.00 para conta 1002".
+        """
+        texto = self.texto()
+        if not self.momento:
+            return texto
+        return f"[{datetime.fromtimestamp(self.momento).strftime(FORMATO_DATA_HORA)}] {texto}"
+
+    def _campos(self) -> tuple:
+        return self.momento, self.tipo, self.valor_centavos, self.contraparte, self.descricao
+
+    def __eq__(self, outra: object) -> bool:
+        if not isinstance(outra, Transacao):
+            return NotImplemented
+        return self._campos() == outra._campos()
+
+    def __repr__(self) -> str:
+        return (
+            f"Transacao(momento={self.momento}, tipo={self.tipo.name}, valor_centavos={self.valor_centavos}, "
+            f"contraparte={self.contraparte!r}, descricao={self.descricao!r})"
+        )
+
+    def __str__(self) -> str:
+        return self.formatar()
@@ -0,0 +1,352 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+from utils.api import API
+from utils.cache_cep import CacheCep
+from utils.constantes import BACKEND_CEP_OFFLINE
+from utils.indice_cep_offline import IndiceCepOffline
+
+
+ENDERECOS_STUB = {
+    "30140071": {"logradouro": "Avenida Afonso Pena", "bairro": "Centro", "localidade": "Belo Horizonte", "uf": "MG"},
+    "01001000": {"logradouro": "Praça da Sé", "bairro": "Sé", "localidade": "São Paulo", "uf": "SP"},
+}
+
+
+class StubViaCep(BaseHTTPRequestHandler):
+    """
+    Servidor HTTP local que imita a ViaCEP e conta as requisições recebidas.
+    """
+
+    requisicoes = []
+    atraso = 0.0  # Segundos antes de responder, para simular lentidão
+
+    def do_GET(self):
+        cep = self.path.strip("/").split("/")[1]
+        StubViaCep.requisicoes.append(cep)
+        time.sleep(StubViaCep.atraso)
+        corpo = json.dumps(ENDERECOS_STUB.get(cep, {"erro": True})).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def log_message(self, *args):
+        pass
+
+
+class ServidorStubMixin:
+    """
+    Sobe o StubViaCep em uma porta livre para os testes da classe.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.servidor = ThreadingHTTPServer(("127.0.0.1", 0), StubViaCep)
+        cls.thread = threading.Thread(target=cls.servidor.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.url = f"http://127.0.0.1:{cls.servidor.server_address[1]}/ws/{{cep}}/json/"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.servidor.shutdown()
+        cls.servidor.server_close()
+
+
+class TestCacheCep(ServidorStubMixin, unittest.TestCase):
+
+    def setUp(self):
+        """
+        /************************ Setup Testes do Cache de CEP ****************************
+        Aponta a API para o servidor local e usa um arquivo de cache temporário,
+        com relógio controlado pelo teste.
+        ***********************************************************************************
+        """
+        StubViaCep.requisicoes = []
+        self.diretorio = tempfile.mkdtemp()
+        self.caminho = os.path.join(self.diretorio, "cache_cep.sqlite3")
+        self.agora = 1_000_000.0
+        self.patcher = patch("utils.api.URL_VIACEP", self.url)
+        self.patcher.start()
+        self.usar_cache(self.novo_cache())
+
+    def tearDown(self):
+        API._cache_cep.fechar()
+        API._cache_cep = None
+        self.patcher.stop()
+        shutil.rmtree(self.diretorio, ignore_errors=True)
+
+    def novo_cache(self, tamanho_maximo: int = 100) -> CacheCep:
+        return CacheCep(
+            self.caminho, ttl_segundos=100, ttl_negativo_segundos=10,
+            tamanho_maximo=tamanho_maximo, relogio=lambda: self.agora
+        )
+
+    def usar_cache(self, cache: CacheCep) -> None:
+        if API._cache_cep is not None:
+            API._cache_cep.fechar()
+        API._cache_cep = cache
+
+    def test_cache_persiste_entre_execucoes(self):
+        """
+        /************************ Teste 1 ****************************
+        Testa se um CEP consultado não volta à rede, nem após reabrir o cache.
+
+        Teste para simular o reinício da aplicação.
+        *****************************************************************/
+        """
+        endereco = API.buscar_endereco_por_cep("30140-071", "100")
+        self.usar_cache(self.novo_cache())
+        endereco_cache = API.buscar_endereco_por_cep("30140071", "100")
+
+        self.assertEqual(endereco, "Avenida Afonso Pena, 100 - Centro, Belo Horizonte - MG, 30140071")
+        self.assertEqual(endereco_cache, endereco)
+        self.assertEqual(StubViaCep.requisicoes, ["30140071"])
+        self.assertEqual(API._cache_cep.estatisticas()["acertos"], 1)
+
+    def test_cache_negativo(self):
+        """
+        /************************ Teste 2 ****************************
+        Testa se "CEP não encontrado" também é guardado, até expirar o TTL negativo.
+        *****************************************************************/
+        """
+        for _ in range(2):
+            with self.assertRaisesRegex(ValueError, "CEP não encontrado"):
+                API.buscar_endereco_por_cep("99999999", "1")
+        self.assertEqual(StubViaCep.requisicoes, ["99999999"])
+
+        self.agora += 11
+        with self.assertRaises(ValueError):
+            API.buscar_endereco_por_cep("99999999", "1")
+
+        self.assertEqual(StubViaCep.requisicoes, ["99999999", "99999999"])
+        self.assertEqual(API._cache_cep.estatisticas()["acertos_negativos"], 1)
+
+    def test_expiracao_ttl(self):
+        """
+        /************************ Teste 3 ****************************
+        Testa se um endereço expirado é consultado novamente na rede.
+        *****************************************************************/
+        """
+        API.buscar_endereco_por_cep("30140071", "1")
+        self.agora += 101
+        API.buscar_endereco_por_cep("30140071", "1")
+
+        self.assertEqual(StubViaCep.requisicoes, ["30140071", "30140071"])
+
+    def test_descarte_lru(self):
+        """
+        /************************ Teste 4 ****************************
+        Testa o limite de tamanho: o CEP menos recentemente usado é descartado.
+        *****************************************************************/
+        """
+        cache = self.novo_cache(tamanho_maximo=2)
+        cache.gravar("00000001", {"a": 1})
+        self.agora += 1
+        cache.gravar("00000002", {"a": 2})
+        self.agora += 1
+        cache.obter("00000001")
+        self.agora += 1
+        cache.gravar("00000003", {"a": 3})
+
+        self.assertEqual(cache.obter("00000001"), (True, {"a": 1}))
+        self.assertEqual(cache.obter("00000002"), (False, None))
+        self.assertEqual(cache.estatisticas()["tamanho"], 2)
+        cache.fechar()
+
+
+class TestIndiceCepOffline(ServidorStubMixin, unittest.TestCase):
+
+    def setUp(self):
+        """
+        /************************ Setup Testes do Índice Offline ****************************
+        Gera um índice a partir de um CSV temporário e configura a API para usá-lo.
+        *************************************************************************************
+        """
+        StubViaCep.requisicoes = []
+        self.diretorio = tempfile.mkdtemp()
+        caminho_csv = os.path.join(self.diretorio, "ceps.csv")
+        self.caminho_indice = os.path.join(self.diretorio, "ceps.idx")
+        with open(caminho_csv, "w", encoding="utf-8") as f:
+            f.write("cep,logradouro,bairro,localidade,uf\n")
+            f.write("01001-000,Praça da Sé,Sé,São Paulo,SP\n")
+            f.write("70040010,Esplanada dos Ministérios,Zona Cívico-Administrativa,Brasília,DF\n")
+
+        self.quantidade = IndiceCepOffline.construir(caminho_csv, self.caminho_indice)
+        API._indice_offline = IndiceCepOffline(self.caminho_indice)
+        API._cache_cep = CacheCep(os.path.join(self.diretorio, "cache.sqlite3"), 100, 10, 100)
+        self.patchers = [
+            patch("utils.api.URL_VIACEP", self.url),
+            patch("utils.api.BACKEND_CEP", BACKEND_CEP_OFFLINE),
+        ]
+        for patcher in self.patchers:
+            patcher.start()
+
+    def tearDown(self):
+        for patcher in reversed(self.patchers):
+            patcher.stop()
+        API._indice_offline.fechar()
+        API._indice_offline = None
+        API._cache_cep.fechar()
+        API._cache_cep = None
+        shutil.rmtree(self.diretorio, ignore_errors=True)
+
+    def test_busca_no_indice(self):
+        """
+        /************************ Teste 1 ****************************
+        Testa a busca binária no índice gerado a partir do CSV.
+        *****************************************************************/
+        """
+        indice = API._indice_offline
+
+        self.assertEqual(self.quantidade, 2)
+        self.assertEqual(len(indice), 2)
+        self.assertEqual(indice.buscar("70040010")["localidade"], "Brasília")
+        self.assertIsNone(indice.buscar("00000000"))
+        self.assertIsNone(indice.buscar("99999999"))
+
+    def test_api_usa_indice_sem_rede(self):
+        """
+        /************************ Teste 2 ****************************
+        Testa se um CEP presente no índice é resolvido sem chamada HTTP.
+        *****************************************************************/
+        """
+        endereco = API.buscar_endereco_por_cep("01001000", "1")
+
+        self.assertEqual(endereco, "Praça da Sé, 1 - Sé, São Paulo - SP, 01001000")
+        self.assertEqual(StubViaCep.requisicoes, [])
+
+    def test_api_recorre_a_viacep_quando_falta_no_indice(self):
+        """
+        /************************ Teste 3 ****************************
+        Testa o fallback para a ViaCEP quando o CEP não está no índice.
+        *****************************************************************/
+        """
+        endereco = API.buscar_endereco_por_cep("30140071", "5")
+
+        self.assertTrue(endereco.startswith("Avenida Afonso Pena, 5"))
+        self.assertEqual(StubViaCep.requisicoes, ["30140071"])
+
+    def test_indice_truncado_recorre_a_viacep(self):
+        """
+        /************************ Teste 4 ****************************
+        Testa a abertura de índices vazios ou truncados: ValueError com o motivo,
+        e a API passa a consultar a ViaCEP em vez de falhar em toda busca.
+        *****************************************************************/
+        """
+        with open(self.caminho_indice, "rb") as f:
+            conteudo = f.read()
+        caminho_truncado = os.path.join(self.diretorio, "truncado.idx")
+        for tamanho in (0, 5, 20, len(conteudo) - 3):
+            with open(caminho_truncado, "wb") as f:
+                f.write(conteudo[:tamanho])
+            with self.assertRaisesRegex(ValueError, "truncado"):
+                IndiceCepOffline(caminho_truncado)
+
+        indice_valido = API._indice_offline
+        API._indice_offline = None
+        try:
+            with patch("utils.api.DIRETORIO_DATABASE", self.diretorio), \
+                    patch("utils.api.ARQUIVO_INDICE_CEP", "truncado.idx"):
+                endereco = API.buscar_endereco_por_cep("01001000", "1")
+            self.assertIsNone(API.obter_indice_offline())
+        finally:
+            API._indice_offline = indice_valido
+
+        self.assertEqual(endereco, "Praça da Sé, 1 - Sé, São Paulo - SP, 01001000")
+        self.assertEqual(StubViaCep.requisicoes, ["01001000"])
+
+
+class TestConsultaConcorrente(ServidorStubMixin, unittest.TestCase):
+
+    def setUp(self):
+        """
+        /************************ Setup Testes de Consultas Concorrentes ****************************
+        Usa cache temporário e um servidor local que responde com atraso.
+        *********************************************************************************************
+        """
+        StubViaCep.requisicoes = []
+        StubViaCep.atraso = 0.3
+        self.diretorio = tempfile.mkdtemp()
+        API._cache_cep = CacheCep(os.path.join(self.diretorio, "cache.sqlite3"), 100, 10, 100)
+        self.patcher = patch("utils.api.URL_VIACEP", self.url)
+        self.patcher.start()
+
+    def tearDown(self):
+        StubViaCep.atraso = 0.0
+        self.patcher.stop()
+        API._cache_cep.fechar()
+        API._cache_cep = None
+        shutil.rmtree(self.diretorio, ignore_errors=True)
+
+    def test_consultas_simultaneas_compartilham_requisicao(self):
+        """
+        /************************ Teste 1 ****************************
+        Testa se vários cadastros simultâneos com o mesmo CEP geram uma única requisição.
+        *****************************************************************/
+        """
+        with ThreadPoolExecutor(max_workers=10) as executor:
+            enderecos = list(executor.map(
+                lambda numero: API.buscar_endereco_por_cep("30140071", str(numero)), range(1, 11)
+            ))
+
+        self.assertEqual(StubViaCep.requisicoes, ["30140071"])
+        self.assertEqual(enderecos[4], "Avenida Afonso Pena, 5 - Centro, Belo Horizonte - MG, 30140071")
+
+    def test_buscar_enderecos_em_lote(self):
+        """
+        /************************ Teste 2 ****************************
+        Testa a consulta em lote: CEPs distintos em paralelo e falhas como None.
+        *****************************************************************/
+        """
+        inicio = time.perf_counter()
+        enderecos = API.buscar_enderecos([("30140071", "1"), ("01001000", "2"), ("99999999", "3"), ("123", "4")])
+        duracao = time.perf_counter() - inicio
+
+        self.assertEqual(enderecos[1], "Praça da Sé, 2 - Sé, São Paulo - SP, 01001000")
+        self.assertIsNone(enderecos[2])
+        self.assertIsNone(enderecos[3])
+        self.assertLess(duracao, 3 * StubViaCep.atraso)
+
+    def test_tempo_limite(self):
+        """
+        /************************ Teste 3 ****************************
+        Testa se uma ViaCEP lenta gera ValueError em vez de travar a tela.
+        *****************************************************************/
+        """
+        with patch("utils.api.TIMEOUT_CEP_LEITURA", 0.05):
+            with self.assertRaisesRegex(ValueError, "demorou"):
+                API.buscar_endereco_por_cep("30140071", "1")
+
+    def test_cache_gravado_apos_a_primeira_consulta(self):
+        """
+        /************************ Teste 4 ****************************
+        Testa a consulta que não encontra o CEP no cache logo antes de outra thread
+        gravá-lo e encerrar a requisição em andamento: o cache é consultado de novo
+        e nenhuma requisição HTTP é feita.
+        *****************************************************************/
+        """
+        cache = API._cache_cep
+        cache.gravar("30140071", ENDERECOS_STUB["30140071"])
+        consultas = iter([(False, None)])  # A primeira consulta chega antes da gravação
+
+        with patch.object(cache, "obter", side_effect=lambda cep: next(consultas, None) or CacheCep.obter(cache, cep)):
+            endereco = API.buscar_endereco_por_cep("30140071", "7")
+
+        self.assertEqual(endereco, "Avenida Afonso Pena, 7 - Centro, Belo Horizonte - MG, 30140071")
+        self.assertEqual(StubViaCep.requisicoes, [])
+
+        self.assertEqual(API._requisicoes_em_andamento, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
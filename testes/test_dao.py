@@ -0,0 +1,1805 @@
+import json
+import os
+import shutil
+import random
+import tempfile
+import threading
+import unittest
+import weakref
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+from unittest.mock import patch
+
+from dao.cliente_dao import ClienteDAO
+from dao.conta_dao import ContaDAO
+from dao.ledger_dao import LedgerDAO
+from dao.pessoa_dao import PessoaDAO
+from dao.motores.fabrica_motor import descartar_motores
+from dao.motores.motor_armazenamento import MotorArmazenamento
+from dao.motores.motor_journal import MotorJournal
+from dao.motores.motor_json import MotorJson
+from dao.motores.motor_sqlite import MotorSqlite
+from dao.registro_dao import RegistroDAO
+from dao.travas_contas import TravasContas
+from dao.unidade_de_trabalho import UnidadeDeTrabalho
+from controller import atualizacao_mensal_controller
+from controller.atualizacao_mensal_controller import AtualizacaoMensalController
+from controller.conta_controller import ContaController
+from controller.pagamento_controller import PagamentoController
+from controller.pagamento_lote_controller import PagamentoLoteController
+from controller.projecao_controller import Cenario, ProjecaoController
+from mapper.transacao_mapper import TransacaoMapper
+from utils.constantes import (
+    DURABILIDADE_GRUPO,
+    DURABILIDADE_NENHUMA,
+    MOTOR_JOURNAL,
+    MOTOR_JSON,
+    MOTOR_SQLITE,
+    TENTATIVAS_CONFLITO_VERSAO
+)
+from model.cliente import Cliente
+from model.exceptions import ConflitoVersaoError, ContaInativaError
+from model.conta_corrente import ContaCorrente
+from model.conta_poupanca import ContaPoupanca
+from model.pessoa_fisica import PessoaFisica
+from model.pessoa_juridica import PessoaJuridica
+from model.transacao import TipoOperacao
+
+try:
+    import numpy as np
+except ImportError:  # Os testes de projeção exigem NumPy
+    np = None
+
+
+class _BaseTesteDAO(unittest.TestCase):
+    """
+    Base dos testes que gravam dados: redireciona o diretório de dados do DAO para
+    uma pasta temporária, mocka a API de CEP e descarta motores e DAOs compartilhados
+    antes e depois de cada teste.
+    """
+
+    def setUp(self):
+        self.diretorio = tempfile.mkdtemp()
+        self.patchers = [
+            patch("dao.dao.DIRETORIO_DATABASE", self.diretorio),
+            patch("utils.api.API.buscar_endereco_por_cep", return_value="Rua Teste, 100"),
+        ]
+        for patcher in self.patchers:
+            patcher.start()
+        descartar_motores()
+        RegistroDAO.descartar()
+
+    def tearDown(self):
+        RegistroDAO.descartar()
+        descartar_motores()
+        for patcher in reversed(self.patchers):
+            patcher.stop()
+        shutil.rmtree(self.diretorio, ignore_errors=True)
+
+    def _cadastrar_cliente(self, documento: str, numero: str, saldo: float = 100.0, pessoa=None) -> Cliente:
+        """
+        Cadastra um cliente (senha "senha123") com uma conta corrente. Sem `pessoa`,
+        o titular é uma PessoaFisica de teste com o documento informado.
+        """
+        if pessoa is None:
+            pessoa = PessoaFisica(
+                nome="Joao Silva",
+                email=f"{documento}@email.com",
+                numero_documento=documento,
+                cep="12345678",
+                numero_endereco="100",
+                endereco="Rua Teste, 100",
+                telefone="31999998888",
+                data_nascimento="01/01/1990"
+            )
+        conta = ContaCorrente(numero, saldo)
+        cliente = Cliente(pessoa, "senha123", [conta])
+        PessoaDAO().salvar_objeto(pessoa)
+        ContaDAO().salvar_objeto(conta)
+        ClienteDAO().salvar_objeto(cliente)
+        return cliente
+
+
+class TestMotorJournal(unittest.TestCase):
+
+    def setUp(self):
+        """
+        /************************ Setup Testes do Motor Journal ****************************
+        Cria um diretório temporário para o snapshot e o journal de cada teste.
+        ***********************************************************************************
+        """
+        self.diretorio = tempfile.mkdtemp()
+        self.caminho = os.path.join(self.diretorio, "contas.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.diretorio, ignore_errors=True)
+
+    def test_escritas_sao_reaplicadas_na_inicializacao(self):
+        """
+        /************************ Teste 1 ****************************
+        Testa se inserções, atualizações e remoções sobrevivem a um novo carregamento.
+
+        Teste para garantir que o replay do journal reconstrói o mesmo estado.
+        *****************************************************************/
+        """
+        motor = MotorJournal(self.caminho, "numero")
+        motor.inserir({"numero": "1001", "saldo": 10.0})
+        motor.inserir({"numero": "1002", "saldo": 20.0})
+        motor.atualizar({"numero": "1001", "saldo": 15.0})
+        motor.remover(1002)
+
+        recarregado = MotorJournal(self.caminho, "numero")
+
+        self.assertEqual(recarregado.listar(), [{"numero": "1001", "saldo": 15.0}])
+        self.assertFalse(os.path.exists(self.caminho))  # Nada foi regravado no snapshot
+
+    def test_inserir_id_duplicado(self):
+        """
+        /************************ Teste 2 ****************************
+        Testa ValueError ao inserir um identificador já existente.
+        *****************************************************************/
+        """
+        motor = MotorJournal(self.caminho, "numero")
+        motor.inserir({"numero": "1001"})
+
+        with self.assertRaises(ValueError):
+            motor.inserir({"numero": 1001})
+
+    def test_compactacao_gera_snapshot(self):
+        """
+        /************************ Teste 3 ****************************
+        Testa se a compactação grava o snapshot e descarta o journal.
+
+        Teste para garantir que o snapshot mantém o formato de lista JSON original.
+        *****************************************************************/
+        """
+        motor = MotorJournal(self.caminho, "numero", limite_compactacao=3)
+        for numero in ("1001", "1002", "1003"):
+            motor.inserir({"numero": numero})
+        motor.aguardar_compactacao()
+
+        with open(self.caminho, encoding="utf-8") as f:
+            snapshot = json.load(f)
+
+        self.assertEqual([r["numero"] for r in snapshot], ["1001", "1002", "1003"])
+        self.assertFalse(os.path.exists(motor.caminho_journal))
+        self.assertFalse(os.path.exists(motor.caminho_compactando))
+
+    def test_linha_truncada_no_journal_e_ignorada(self):
+        """
+        /************************ Teste 4 ****************************
+        Testa o carregamento com a última linha do journal incompleta.
+
+        Teste para simular uma queda no meio de uma escrita.
+        *****************************************************************/
+        """
+        motor = MotorJournal(self.caminho, "numero")
+        motor.inserir({"numero": "1001"})
+        with open(motor.caminho_journal, "a", encoding="utf-8") as f:
+            f.write('{"op": "upsert", "id": "10')
+
+        recarregado = MotorJournal(self.caminho, "numero")
+
+        self.assertEqual(recarregado.listar(), [{"numero": "1001"}])
+
+
+class TestMotorSqlite(unittest.TestCase):
+
+    def setUp(self):
+        """
+        /************************ Setup Testes do Motor SQLite ****************************
+        Cria um diretório temporário com um contas.json no formato original.
+        ***********************************************************************************
+        """
+        self.diretorio = tempfile.mkdtemp()
+        self.caminho = os.path.join(self.diretorio, "contas.json")
+        self.caminho_banco = os.path.join(self.diretorio, "banco.sqlite3")
+        with open(self.caminho, "w", encoding="utf-8") as f:
+            json.dump([{"numero": "1001", "saldo": 1.0}, {"numero": "1002", "saldo": 2.0}], f)
+
+    def tearDown(self):
+        shutil.rmtree(self.diretorio, ignore_errors=True)
+
+    def test_importa_json_original_uma_unica_vez(self):
+        """
+        /************************ Teste 1 ****************************
+        Testa a importação inicial do JSON e que ela não se repete após remoções.
+        *****************************************************************/
+        """
+        motor = MotorSqlite(self.caminho, "numero", self.caminho_banco)
+        self.assertEqual([r["numero"] for r in motor.listar()], ["1001", "1002"])
+
+        motor.remover("1001")
+        motor.fechar()
+        motor = MotorSqlite(self.caminho, "numero", self.caminho_banco)
+
+        self.assertEqual([r["numero"] for r in motor.listar()], ["1002"])
+        motor.fechar()
+
+    def test_operacoes_por_chave_primaria(self):
+        """
+        /************************ Teste 2 ****************************
+        Testa buscar, inserir, atualizar e remover registros individualmente.
+
+        Teste para garantir que a ordem de inserção é mantida após atualizações.
+        *****************************************************************/
+        """
+        motor = MotorSqlite(self.caminho, "numero", self.caminho_banco)
+        motor.inserir({"numero": "1003", "saldo": 3.0})
+
+        with self.assertRaises(ValueError):
+            motor.inserir({"numero": "1003"})
+
+        self.assertTrue(motor.atualizar({"numero": "1001", "saldo": 9.0}))
+        self.assertFalse(motor.atualizar({"numero": "9999"}))
+        self.assertEqual(motor.buscar(1001), {"numero": "1001", "saldo": 9.0})
+        self.assertIsNone(motor.buscar("9999"))
+        self.assertTrue(motor.remover(1002))
+        self.assertEqual([r["numero"] for r in motor.listar()], ["1001", "1003"])
+        motor.fechar()
+
+
+class TestContaDAO(_BaseTesteDAO):
+
+    def test_crud_de_contas(self):
+        """
+        /************************ Teste 1 ****************************
+        Testa salvar, buscar, atualizar e deletar contas pelo ContaDAO.
+
+        Teste para garantir que o DAO continua funcionando sobre o motor de armazenamento.
+        *****************************************************************/
+        """
+        dao = ContaDAO()
+        dao.salvar_objeto(ContaCorrente("1001", 100.0))
+        dao.salvar_objeto(ContaPoupanca("1002", 50.0))
+
+        conta = dao.buscar_por_id(1001)
+        conta._set_saldo(80.0)
+        self.assertTrue(dao.atualizar_objeto(conta))
+        self.assertTrue(dao.deletar_objeto("1002"))
+        self.assertFalse(dao.deletar_objeto("1002"))
+
+        descartar_motores()
+        contas = ContaDAO().listar_todos_objetos()
+
+        self.assertEqual(len(contas), 1)
+        self.assertIsInstance(contas[0], ContaCorrente)
+        self.assertEqual(contas[0].get_saldo(), 80.0)
+
+    def test_indice_atualizado_sem_recarregar(self):
+        """
+        /************************ Teste 2 ****************************
+        Testa se o índice em memória acompanha salvar, atualizar e deletar.
+
+        Teste para garantir que as buscas usam os mesmos objetos do cache,
+        sem reconstruí-lo a cada escrita.
+        *****************************************************************/
+        """
+        dao = ContaDAO()
+        for numero in ("1001", "1002", "1003"):
+            dao.salvar_objeto(ContaCorrente(numero))
+        contas = dao.listar_todos_objetos()
+
+        nova = ContaPoupanca("1004", 10.0)
+        dao.salvar_objeto(nova)
+        substituta = ContaCorrente("1002", 99.0)
+        substituta._set_versao(dao.buscar_por_id("1002").get_versao())
+        dao.atualizar_objeto(substituta)
+        dao.deletar_objeto(1001)
+
+        self.assertIs(dao.listar_todos_objetos(), contas)
+        self.assertIs(dao.buscar_por_id("1004"), nova)
+        self.assertIs(dao.buscar_por_id(1002), substituta)
+        self.assertIsNone(dao.buscar_por_id("1001"))
+        self.assertEqual([str(c.get_numero_conta()) for c in contas], ["1002", "1003", "1004"])
+        self.assertEqual(dao._indice_posicoes, {"1002": 0, "1003": 1, "1004": 2})
+
+    def test_historico_gravado_no_ledger(self):
+        """
+        /************************ Teste 3 ****************************
+        Testa se o histórico vai para o ledger da conta, e não para o arquivo de contas,
+        e se ele só é lido quando pedido.
+
+        Teste para garantir que operações só de saldo não leem o histórico.
+        *****************************************************************/
+        """
+        dao = ContaDAO()
+        dao.salvar_objeto(ContaCorrente("1001", 100.0))
+        dao.salvar_objeto(ContaCorrente("1002", 100.0))
+        origem, destino = dao.buscar_por_id(1001), dao.buscar_por_id(1002)
+        origem.transferir(destino, 30.0)
+        dao.aplicar_lote([(MotorArmazenamento.OP_ATUALIZAR, origem), (MotorArmazenamento.OP_ATUALIZAR, destino)])
+
+        registro = dao._motor.buscar(1001)
+        self.assertNotIn("historico", registro)
+        self.assertEqual(registro["ledger"]["entradas"], 1)
+
+        descartar_motores()
+        dao = ContaDAO()
+        with patch.object(LedgerDAO, "ler", autospec=True, side_effect=LedgerDAO.ler) as ler:
+            saldos = [conta.get_saldo() for conta in dao.listar_todos_objetos()]
+            ler.assert_not_called()
+            historico = dao.buscar_por_id(1001).get_historico()
+            dao.buscar_por_id(1001).get_historico()
+
+        self.assertEqual(saldos, [70.0, 130.0])
+        self.assertEqual(len(historico), 1)
+        self.assertIn("Transferência de R$ 30.00 para conta 1002", historico[0])
+        self.assertEqual(ler.call_count, 1)
+
+    def test_falha_na_gravacao_descarta_trecho_do_ledger(self):
+        """
+        /************************ Teste 4 ****************************
+        Testa se, quando o registro da conta não é gravado, as operações anexadas
+        ao ledger são descartadas e continuam pendentes na conta.
+        *****************************************************************/
+        """
+        dao = ContaDAO()
+        dao.salvar_objeto(ContaCorrente("1001", 100.0))
+        conta = dao.buscar_por_id(1001)
+        conta.atualizacao_mensal()
+
+        with patch.object(dao._motor, "atualizar", side_effect=OSError("disco cheio")):
+            with self.assertRaises(OSError):
+                dao.atualizar_objeto(conta)
+
+        self.assertEqual(conta.get_ledger(), (0, 0))
+        self.assertEqual(os.path.getsize(dao._ledger.caminho(1001)), 0)
+        self.assertEqual(len(conta.get_historico()), 1)
+
+        self.assertTrue(dao.atualizar_objeto(conta))
+        descartar_motores()
+        self.assertEqual(ContaDAO().buscar_por_id(1001).get_historico(), conta.get_historico())
+
+    def test_bytes_nao_confirmados_sao_ignorados(self):
+        """
+        /************************ Teste 5 ****************************
+        Testa se bytes além da posição confirmada (gravação interrompida) são
+        ignorados na leitura e descartados na gravação seguinte.
+
+        Teste para simular uma queda entre o ledger e o registro da conta.
+        *****************************************************************/
+        """
+        dao = ContaDAO()
+        conta = ContaCorrente("1001", 100.0)
+        conta.atualizacao_mensal()
+        dao.salvar_objeto(conta)
+        with open(dao._ledger.caminho(1001), "ab") as f:
+            f.write(b'"operacao nao confirmada"\n"incomple')
+
+        descartar_motores()
+        dao = ContaDAO()
+        conta = dao.buscar_por_id(1001)
+        self.assertEqual(len(conta.get_historico()), 1)
+
+        conta.encerrar_conta()
+        dao.atualizar_objeto(conta)
+        descartar_motores()
+
+        historico = ContaDAO().buscar_por_id(1001).get_historico()
+        self.assertEqual(len(historico), 2)
+        self.assertNotIn("operacao nao confirmada", historico)
+
+    def test_historico_embutido_migrado_para_ledger(self):
+        """
+        /************************ Teste 6 ****************************
+        Testa a leitura de contas com o histórico embutido (formato antigo)
+        e a migração desse histórico para os ledgers.
+        *****************************************************************/
+        """
+        with open(os.path.join(self.diretorio, "contas.json"), "w", encoding="utf-8") as f:
+            json.dump([{
+                "numero": "1001", "saldo": 10.0, "ativa": True, "tipo": "corrente",
+                "historico": ["[2025-01-01 10:00:00] Conta criada", "[2025-01-02 10:00:00] Depósito"]
+            }], f)
+
+        dao = ContaDAO()
+        self.assertEqual(len(dao.buscar_por_id(1001).get_historico()), 2)
+        self.assertEqual(dao.migrar_historicos(), 1)
+        self.assertEqual(dao.migrar_historicos(), 0)
+        self.assertNotIn("historico", dao._motor.buscar(1001))
+
+        descartar_motores()
+        historico = ContaDAO().buscar_por_id(1001).get_historico()
+        self.assertEqual(historico, ["[2025-01-01 10:00:00] Conta criada", "[2025-01-02 10:00:00] Depósito"])
+
+    def test_extrato_paginado_de_tras_para_frente(self):
+        """
+        /************************ Teste 7 ****************************
+        Testa a paginação do extrato: ordem da mais recente para a mais antiga,
+        continuação pelo cursor (passando das operações pendentes para o ledger)
+        e filtro por tipo.
+
+        Teste com blocos de leitura pequenos, para que as linhas cruzem os blocos.
+        *****************************************************************/
+        """
+        dao = ContaDAO()
+        dao.salvar_objeto(ContaCorrente("1001", 1000.0))
+        dao.salvar_objeto(ContaCorrente("1002", 1000.0))
+        origem, destino = dao.buscar_por_id(1001), dao.buscar_por_id(1002)
+        for valor in range(1, 8):
+            origem.transferir(destino, float(valor))
+            origem.atualizacao_mensal()
+            dao.atualizar_objeto(origem)
+        origem.transferir(destino, 8.0)  # Pendente, ainda não gravada
+
+        esperadas = [t for t in reversed(origem.get_transacoes()) if t.tipo == TipoOperacao.TRANSFERENCIA_ENVIADA]
+        paginas, cursor = [], None
+        with patch.object(LedgerDAO, "TAMANHO_BLOCO", 37):
+            while True:
+                pagina, cursor = dao.paginar_transacoes(origem, 3, cursor, [TipoOperacao.TRANSFERENCIA_ENVIADA])
+                paginas.append(pagina)
+                if cursor is None:
+                    break
+            todas, fim = dao.paginar_transacoes(origem, 100)
+
+        self.assertEqual([len(pagina) for pagina in paginas], [3, 3, 2])
+        self.assertEqual([t for pagina in paginas for t in pagina], esperadas)
+        self.assertEqual([t.valor for t in paginas[0]], [8.0, 7.0, 6.0])
+        self.assertEqual(todas, list(reversed(origem.get_transacoes())))
+        self.assertIsNone(fim)
+        with self.assertRaises(ValueError):
+            dao.paginar_transacoes(origem, 3, origem.get_ledger()[0] - 1)
+
+    def test_primeira_pagina_nao_le_o_ledger_inteiro(self):
+        """
+        /************************ Teste 8 ****************************
+        Testa se a primeira página do extrato é montada sem ler o início do ledger.
+
+        Teste que corrompe a primeira linha do ledger: a leitura completa falha,
+        mas a página com as transações mais recentes não chega até ela.
+        *****************************************************************/
+        """
+        dao = ContaDAO()
+        conta = ContaCorrente("1001", 100.0)
+        for _ in range(200):
+            conta.atualizacao_mensal()
+        dao.salvar_objeto(conta)
+        with open(dao._ledger.caminho(1001), "r+b") as f:
+            f.write(b"#")
+
+        descartar_motores()
+        dao = ContaDAO()
+        conta = dao.buscar_por_id(1001)
+        with patch.object(LedgerDAO, "TAMANHO_BLOCO", 512):
+            pagina, cursor = dao.paginar_transacoes(conta, 10)
+
+        self.assertEqual(len(pagina), 10)
+        self.assertIsNotNone(cursor)
+        with self.assertRaises(ValueError):
+            conta.get_transacoes()
+
+    def test_extrato_por_periodo_pelo_indice_temporal(self):
+        """
+        /************************ Teste 9 ****************************
+        Testa a consulta por período: o resultado deve ser o mesmo da busca linear,
+        incluindo transações com o mesmo momento, operações pendentes e uma
+        transação gravada com o relógio atrasado.
+
+        Teste para garantir que o ledger não é lido por inteiro.
+        *****************************************************************/
+        """
+        dao = ContaDAO()
+        dao.salvar_objeto(ContaCorrente("1001", 100.0))
+        conta = dao.buscar_por_id(1001)
+        for momento in (100, 200, 200, 300, 250, 400, 500, 600, 700, 800):
+            conta._registrar_transacao(TipoOperacao.OUTRA, descricao=str(momento), momento=momento)
+            if momento < 700:
+                dao.atualizar_objeto(conta)
+
+        def linear(inicio, fim):
+            return [t for t in conta.get_transacoes() if inicio <= t.momento <= fim]
+
+        with patch.object(LedgerDAO, "ler", autospec=True) as ler:
+            for inicio, fim in ((0, 1000), (200, 200), (200, 300), (350, 750), (801, 900), (500, 100)):
+                self.assertEqual(dao.transacoes_do_periodo(conta, inicio, fim), linear(inicio, fim), (inicio, fim))
+            ler.assert_not_called()
+        self.assertEqual([t.descricao for t in dao.transacoes_do_periodo(conta, 450, 650)], ["500", "600"])
+
+    def test_indice_temporal_reconstruido(self):
+        """
+        /************************ Teste 10 ****************************
+        Testa se o índice temporal ausente (ledgers anteriores a ele) ou com
+        registros de uma gravação não confirmada é reconstruído a partir do ledger.
+        *****************************************************************/
+        """
+        dao = ContaDAO()
+        conta = ContaCorrente("1001", 100.0)
+        for momento in range(10, 60, 10):
+            conta._registrar_transacao(TipoOperacao.OUTRA, momento=momento)
+        dao.salvar_objeto(conta)
+
+        os.remove(dao._ledger.caminho_indice(1001))
+        self.assertEqual([t.momento for t in dao.transacoes_do_periodo(conta, 20, 40)], [20, 30, 40])
+
+        with open(dao._ledger.caminho_indice(1001), "r+b") as f:
+            f.truncate(2 * LedgerDAO.REGISTRO_INDICE.size)
+        self.assertEqual([t.momento for t in dao.transacoes_do_periodo(conta, 35, 100)], [40, 50])
+
+        conta._registrar_transacao(TipoOperacao.OUTRA, momento=60)
+        with patch.object(dao._motor, "atualizar", side_effect=OSError("disco cheio")):
+            with self.assertRaises(OSError):
+                dao.atualizar_objeto(conta)
+        self.assertEqual(os.path.getsize(dao._ledger.caminho_indice(1001)), 5 * LedgerDAO.REGISTRO_INDICE.size)
+        self.assertTrue(dao.atualizar_objeto(conta))
+        self.assertEqual([t.momento for t in dao.transacoes_do_periodo(conta, 50, 60)], [50, 60])
+
+    def _operar(self, conta, valor, momento):
+        """
+        Registra uma entrada (valor positivo) ou saída na conta, ajustando o saldo.
+        """
+        tipo = TipoOperacao.TRANSFERENCIA_RECEBIDA if valor > 0 else TipoOperacao.TRANSFERENCIA_ENVIADA
+        conta._registrar_transacao(tipo, abs(valor), "1002", momento=momento)
+        conta._set_saldo(conta.get_saldo() + valor)
+
+    def test_saldo_em_a_partir_de_checkpoints(self):
+        """
+        /************************ Teste 11 ****************************
+        Testa o saldo em uma data, comparado com a reaplicação de todo o histórico,
+        em instantes antes, entre e depois das operações (gravadas e pendentes).
+
+        Teste para garantir que os checkpoints são gravados a cada dia e a cada
+        OPERACOES_POR_CHECKPOINT operações, e que a consulta lê só o trecho seguinte.
+        *****************************************************************/
+        """
+        dao = ContaDAO()
+        dao.salvar_objeto(ContaCorrente("1001", 1000.0))
+        conta = dao.buscar_por_id(1001)
+        base = int(datetime(2025, 1, 1, 8).timestamp())
+        momentos = [base + hora * 3600 for hora in range(0, 72, 2)]  # 12 operações por dia, 3 dias
+        with patch.object(LedgerDAO, "OPERACOES_POR_CHECKPOINT", 5):
+            for indice, momento in enumerate(momentos[:-2]):
+                self._operar(conta, 10.0 if indice % 3 else -7.5, momento)
+                if indice % 4 == 3:
+                    dao.atualizar_objeto(conta)
+            dao.atualizar_objeto(conta)
+        for momento in momentos[-2:]:
+            self._operar(conta, 1.0, momento)
+
+        checkpoints = os.path.getsize(dao._ledger.caminho_saldos(1001)) // LedgerDAO.REGISTRO_SALDO.size
+        self.assertEqual(checkpoints, 9)  # Três dias com 10, 12 e 12 operações
+
+        def linear(momento):
+            return 1000.0 + sum(t.efeito_centavos for t in conta.get_transacoes() if t.momento <= momento) / 100
+
+        for momento in [base - 1] + momentos + [m + 3599 for m in momentos] + [base + 10 ** 6]:
+            esperado = linear(momento)
+            with patch.object(TransacaoMapper, "from_registro", side_effect=TransacaoMapper.from_registro) as lidas:
+                self.assertAlmostEqual(dao.saldo_em(conta, momento), esperado, msg=momento)
+            self.assertLessEqual(lidas.call_count, 5 + 1)  # Até o próximo checkpoint, mais a que encerra
+
+    def test_saldo_em_sem_checkpoints(self):
+        """
+        /************************ Teste 12 ****************************
+        Testa o saldo em uma data em ledgers sem checkpoints (gravados antes deles):
+        as operações posteriores são desfeitas a partir do saldo atual.
+        Testa também o descarte de checkpoints de uma gravação não confirmada.
+        *****************************************************************/
+        """
+        dao = ContaDAO()
+        conta = ContaCorrente("1001", 100.0)
+        for momento in range(10, 60, 10):
+            self._operar(conta, 5.0, momento)
+        dao.salvar_objeto(conta)
+        os.remove(dao._ledger.caminho_saldos(1001))
+
+        self.assertEqual([dao.saldo_em(conta, m) for m in (0, 10, 35, 50)], [100.0, 105.0, 115.0, 125.0])
+
+        self._operar(conta, -20.0, 86400 * 3)
+        with patch.object(dao._motor, "atualizar", side_effect=OSError("disco cheio")):
+            with self.assertRaises(OSError):
+                dao.atualizar_objeto(conta)
+        self.assertEqual(os.path.getsize(dao._ledger.caminho_saldos(1001)), 0)
+        self.assertTrue(dao.atualizar_objeto(conta))
+
+        descartar_motores()
+        conta = ContaDAO().buscar_por_id(1001)
+        self.assertEqual([ContaDAO().saldo_em(conta, m) for m in (15, 86400 * 3 - 1, 86400 * 3)], [105.0, 125.0, 105.0])
+
+    def test_saldo_em_apos_rendimentos_da_poupanca(self):
+        """
+        /************************ Teste 13 ****************************
+        Testa o saldo em uma data após vários meses de rendimento da poupança,
+        comparado com o saldo da conta ao fim de cada mês.
+
+        Teste para garantir que o saldo acompanha os centavos gravados em cada
+        rendimento, sem acumular diferenças de arredondamento entre os meses.
+        *****************************************************************/
+        """
+        dao = ContaDAO()
+        dao.salvar_objeto(ContaPoupanca("1001", 1234.57))
+        conta = dao.buscar_por_id(1001)
+        base = int(datetime(2025, 1, 31, 23).timestamp())
+        saldos = {base - 1: 1234.57}
+        for mes in range(24):
+            momento = base + mes * 30 * 86400
+            with patch("model.conta.time.time", return_value=momento):
+                conta.atualizacao_mensal()
+            dao.atualizar_objeto(conta)
+            saldos[momento] = conta.get_saldo()
+
+        descartar_motores()
+        conta = ContaDAO().buscar_por_id(1001)
+        self.assertEqual(conta.get_saldo(), saldos[max(saldos)])
+        for momento, saldo in saldos.items():
+            self.assertEqual(ContaDAO().saldo_em(conta, momento), saldo, msg=momento)
+
+
+
+class TestClienteDAO(_BaseTesteDAO):
+
+    def setUp(self):
+        """
+        /************************ Setup Testes de ClienteDAO ****************************
+        Cadastra um cliente com uma conta corrente.
+        ********************************************************************************
+        """
+        super().setUp()
+        self.pessoa = self._cadastrar_cliente("12345678900", "1001").pessoa
+
+    def test_indice_reverso_acompanha_novas_contas(self):
+        """
+        /************************ Teste 1 ****************************
+        Testa a busca do cliente pela conta após vincular uma nova conta.
+
+        Teste para garantir que o índice é atualizado por atualizar_objeto
+        e persistido para um novo processo.
+        *****************************************************************/
+        """
+        dao = ClienteDAO()
+        ContaDAO().salvar_objeto(ContaPoupanca("1002"))
+        cliente = dao.buscar_por_id("12345678900")
+        cliente.contas.append(ContaPoupanca("1002"))
+        dao.atualizar_objeto(cliente)
+
+        descartar_motores()
+        novo_dao = ClienteDAO()
+        with open(novo_dao.arquivo_indice_contas, encoding="utf-8") as f:
+            indice = json.load(f)
+
+        self.assertEqual(indice["contas"], {"1001": "12345678900", "1002": "12345678900"})
+        self.assertEqual(novo_dao.buscar_cliente_por_numero_conta(1002).numero_documento, "12345678900")
+        self.assertIsNone(novo_dao.buscar_cliente_por_numero_conta(9999))
+
+    def test_indice_desatualizado_e_reconstruido(self):
+        """
+        /************************ Teste 2 ****************************
+        Testa a recuperação quando o índice em disco aponta para o cliente errado.
+        *****************************************************************/
+        """
+        dao = ClienteDAO()
+        with open(dao.arquivo_indice_contas, "w", encoding="utf-8") as f:
+            json.dump({"assinatura_clientes": dao._assinatura_clientes(), "contas": {"1001": "00000000000"}}, f)
+
+        cliente = ClienteDAO().buscar_cliente_por_numero_conta("1001")
+
+        self.assertEqual(cliente.numero_documento, "12345678900")
+
+    def test_hidratacao_em_lote_compartilha_contas(self):
+        """
+        /************************ Teste 3 ****************************
+        Testa a hidratação em lote de todos os clientes.
+
+        Teste para garantir que as contas dos clientes são os mesmos objetos
+        do índice do ContaDAO, sem recarregar contas por cliente.
+        *****************************************************************/
+        """
+        dao = ClienteDAO()
+        clientes = dao.listar_todos_objetos()
+
+        self.assertEqual(len(clientes), 1)
+        self.assertIs(clientes[0].contas[0], dao._conta_dao.buscar_por_id("1001"))
+        self.assertIs(clientes[0].pessoa, dao._pessoa_dao.buscar_por_id("12345678900"))
+
+    def test_clientes_gravados_sem_o_indice(self):
+        """
+        /************************ Teste 4 ****************************
+        Testa a busca de uma conta nova quando o processo parou depois de gravar os
+        clientes e antes de gravar o índice reverso.
+
+        Teste para garantir que a assinatura dos clientes guardada no índice faz com
+        que ele seja reconstruído, tanto em um novo processo quanto em um DAO que já
+        tinha o índice em memória.
+        *****************************************************************/
+        """
+        outro_dao = ClienteDAO()
+        self.assertEqual(outro_dao.documentos_das_contas([1001, 1002]), {"1001": "12345678900", "1002": None})
+
+        dao = ClienteDAO()
+        ContaDAO().salvar_objeto(ContaPoupanca("1002"))
+        cliente = dao.buscar_por_id("12345678900")
+        cliente.contas.append(ContaPoupanca("1002"))
+        with patch.object(ClienteDAO, "_salvar_indice_contas", side_effect=OSError("processo interrompido")):
+            with self.assertRaises(OSError):
+                dao.atualizar_objeto(cliente)
+        with open(dao.arquivo_indice_contas, encoding="utf-8") as f:
+            indice_antigo = f.read()
+
+        self.assertEqual(outro_dao.documentos_das_contas([1002]), {"1002": "12345678900"})
+
+        descartar_motores()
+        with open(dao.arquivo_indice_contas, "w", encoding="utf-8") as f:
+            f.write(indice_antigo)
+        self.assertEqual(ClienteDAO().buscar_cliente_por_numero_conta(1002).numero_documento, "12345678900")
+
+
+
+class TestUnidadeDeTrabalho(_BaseTesteDAO):
+
+    def setUp(self):
+        """
+        /************************ Setup Testes da Unidade de Trabalho ****************************
+        Cadastra um cliente com uma conta corrente e uma conta 1002 sem cliente.
+        ******************************************************************************************
+        """
+        super().setUp()
+        self._cadastrar_cliente("12345678900", "1001")
+        ContaDAO().salvar_objeto(ContaCorrente("1002", 0.0))
+
+    def test_lote_no_journal_e_uma_unica_linha(self):
+        """
+        /************************ Teste 1 ****************************
+        Testa se débito e crédito de uma transferência geram uma única linha no journal.
+
+        Teste para garantir que uma escrita interrompida descarta o lote inteiro,
+        e não apenas uma das contas.
+        *****************************************************************/
+        """
+        dao = ContaDAO()
+        origem, destino = dao.buscar_por_id(1001), dao.buscar_por_id(1002)
+        origem.transferir(destino, 30.0)
+
+        with UnidadeDeTrabalho() as unidade:
+            unidade.registrar_alteracao(dao, origem)
+            unidade.registrar_alteracao(dao, destino)
+
+        with open(dao._motor.caminho_journal, encoding="utf-8") as f:
+            linhas = f.readlines()
+        self.assertEqual(len(json.loads(linhas[-1])["lote"]), 2)
+
+        descartar_motores()
+        self.assertEqual(ContaDAO().buscar_por_id(1002).get_saldo(), 30.0)
+
+        with open(dao._motor.caminho_journal, "w", encoding="utf-8") as f:
+            f.writelines(linhas[:-1])
+            f.write(linhas[-1][:len(linhas[-1]) // 2])  # Queda no meio da escrita do lote
+
+        descartar_motores()
+        recarregado = ContaDAO()
+        self.assertEqual(recarregado.buscar_por_id(1001).get_saldo(), 100.0)
+        self.assertEqual(recarregado.buscar_por_id(1002).get_saldo(), 0.0)
+
+    def test_lote_invalido_nao_grava_nada(self):
+        """
+        /************************ Teste 2 ****************************
+        Testa, em todos os motores, que um lote com uma operação inválida é rejeitado por inteiro.
+        *****************************************************************/
+        """
+        motores = [
+            MotorJson(os.path.join(self.diretorio, "a.json"), "numero"),
+            MotorJournal(os.path.join(self.diretorio, "b.json"), "numero"),
+            MotorSqlite(os.path.join(self.diretorio, "c.json"), "numero", os.path.join(self.diretorio, "c.sqlite3")),
+        ]
+        for motor in motores:
+            motor.inserir({"numero": "1", "saldo": 10})
+            with self.assertRaises(ValueError):
+                motor.aplicar_lote([
+                    (MotorArmazenamento.OP_ATUALIZAR, {"numero": "1", "saldo": 0}),
+                    (MotorArmazenamento.OP_INSERIR, {"numero": "2", "saldo": 10}),
+                    (MotorArmazenamento.OP_ATUALIZAR, {"numero": "3", "saldo": 10}),
+                ])
+            self.assertEqual(motor.listar(), [{"numero": "1", "saldo": 10}], type(motor).__name__)
+
+            motor.aplicar_lote([
+                (MotorArmazenamento.OP_REMOVER, 1),
+                (MotorArmazenamento.OP_INSERIR, {"numero": "2", "saldo": 5}),
+            ])
+            self.assertEqual(motor.listar(), [{"numero": "2", "saldo": 5}], type(motor).__name__)
+        motores[2].fechar()
+
+    def test_nova_conta_e_cliente_gravados_juntos(self):
+        """
+        /************************ Teste 3 ****************************
+        Testa a criação de conta e a atualização do cliente em uma unidade de trabalho,
+        incluindo o índice reverso conta -> cliente.
+        *****************************************************************/
+        """
+        conta_dao, cliente_dao = ContaDAO(), ClienteDAO()
+        cliente = cliente_dao.buscar_por_id("12345678900")
+        nova = ContaPoupanca("1003")
+        cliente.contas.append(nova)
+
+        with UnidadeDeTrabalho() as unidade:
+            unidade.registrar_novo(conta_dao, nova)
+            unidade.registrar_alteracao(cliente_dao, cliente)
+
+        descartar_motores()
+        self.assertIsNotNone(ContaDAO().buscar_por_id("1003"))
+        self.assertEqual(ClienteDAO().buscar_cliente_por_numero_conta(1003).numero_documento, "12345678900")
+
+    def test_excecao_no_bloco_descarta_alteracoes(self):
+        """
+        /************************ Teste 4 ****************************
+        Testa se uma exceção dentro do bloco impede qualquer gravação.
+        *****************************************************************/
+        """
+        dao = ContaDAO()
+        conta = dao.buscar_por_id(1001)
+        conta._set_saldo(0.0)
+
+        with self.assertRaises(RuntimeError):
+            with UnidadeDeTrabalho() as unidade:
+                unidade.registrar_alteracao(dao, conta)
+                raise RuntimeError("falha no meio da operação")
+
+        descartar_motores()
+        self.assertEqual(ContaDAO().buscar_por_id(1001).get_saldo(), 100.0)
+
+    def test_reativacao_grava_conta_e_cliente_juntos(self):
+        """
+        /************************ Teste 5 ****************************
+        Testa a reativação de conta em uma unidade de trabalho: em conflito de versão
+        nada é gravado e a conta compartilhada continua inativa; sem conflito, conta
+        e cliente são gravados em um lote cada.
+        *****************************************************************/
+        """
+        self.assertTrue(ContaController.excluir_conta("12345678900", "1001", "senha123")["sucesso"])
+        conta_dao, cliente_dao = RegistroDAO.contas(), RegistroDAO.clientes()
+        conta = conta_dao.buscar_por_id(1001)
+
+        with patch.object(conta_dao, "aplicar_lote", side_effect=ConflitoVersaoError("1001")):
+            resultado = ContaController.reativar_conta("12345678900", "1001", "senha123")
+        self.assertFalse(resultado["sucesso"])
+        self.assertFalse(conta.get_estado_da_conta())
+
+        with patch.object(ContaDAO, "atualizar_objeto") as atualizar_conta, \
+                patch.object(ClienteDAO, "atualizar_objeto") as atualizar_cliente:
+            resultado = ContaController.reativar_conta("12345678900", "1001", "senha123")
+        self.assertTrue(resultado["sucesso"])
+        atualizar_conta.assert_not_called()
+        atualizar_cliente.assert_not_called()
+
+        descartar_motores()
+        RegistroDAO.descartar()
+        self.assertTrue(ClienteDAO().buscar_por_id("12345678900").contas[0].get_estado_da_conta())
+
+
+
+class TestRegistroDAO(_BaseTesteDAO):
+
+    def setUp(self):
+        """
+        /************************ Setup Testes do Registro de DAOs ****************************
+        Cadastra dois clientes, cada um com uma conta corrente.
+        ***************************************************************************************
+        """
+        super().setUp()
+        for documento, numero in (("12345678900", "1001"), ("98765432100", "1002")):
+            self._cadastrar_cliente(documento, numero)
+
+    def test_um_objeto_por_identificador(self):
+        """
+        /************************ Teste 1 ****************************
+        Testa o mapa de identidade: a mesma conta é devolvida pela busca direta,
+        pelo cliente e pela listagem completa.
+        *****************************************************************/
+        """
+        conta = RegistroDAO.contas().buscar_por_id(1001)
+        cliente = RegistroDAO.clientes().buscar_por_id("12345678900")
+
+        self.assertIs(RegistroDAO.contas(), RegistroDAO.contas())
+        self.assertIs(cliente.contas[0], conta)
+        self.assertIs(RegistroDAO.clientes().listar_todos_objetos()[0], cliente)
+        self.assertIn(conta, RegistroDAO.contas().listar_todos_objetos())
+
+    def test_pagamento_sem_reler_arquivos(self):
+        """
+        /************************ Teste 2 ****************************
+        Testa se uma transferência pelo controlador reaproveita os objetos compartilhados.
+
+        Teste para garantir que, após o pagamento, as consultas seguintes não
+        voltam ao motor de armazenamento.
+        *****************************************************************/
+        """
+        origem = RegistroDAO.contas().buscar_por_id(1001)
+        resultado = PagamentoController.processar_pagamento(1001, "98765432100", 30.0, "Aluguel", "senha123", 1002)
+
+        with patch.object(RegistroDAO.contas()._motor, "buscar", side_effect=AssertionError("releu o motor")):
+            destino = RegistroDAO.clientes().buscar_por_id("98765432100").contas[0]
+            self.assertIs(RegistroDAO.contas().buscar_por_id(1001), origem)
+
+        self.assertTrue(resultado["sucesso"])
+        self.assertEqual(origem.get_saldo(), 70.0)
+        self.assertEqual(destino.get_saldo(), 130.0)
+
+    def test_falha_na_gravacao_descarta_cache(self):
+        """
+        /************************ Teste 3 ****************************
+        Testa se uma falha ao gravar faz o cache ser descartado,
+        voltando ao estado persistido em vez do alterado em memória.
+        *****************************************************************/
+        """
+        origem = RegistroDAO.contas().buscar_por_id(1001)
+
+        with patch.object(RegistroDAO.contas()._motor, "aplicar_lote", side_effect=OSError("disco cheio")):
+            with self.assertRaises(OSError):
+                PagamentoController.processar_pagamento(1001, "98765432100", 30.0, "Aluguel", "senha123", 1002)
+
+        self.assertEqual(origem.get_saldo(), 70.0)  # Objeto antigo, alterado em memória
+        self.assertEqual(RegistroDAO.contas().buscar_por_id(1001).get_saldo(), 100.0)
+        self.assertEqual(RegistroDAO.clientes().buscar_por_id("98765432100").contas[0].get_saldo(), 100.0)
+
+
+
+class TestCoerenciaEntreProcessos(_BaseTesteDAO):
+    """
+    O "outro processo" é simulado por uma instância independente de motor sobre os
+    mesmos arquivos.
+    """
+
+    def outro_processo(self, tipo: str, caminho: str):
+        if tipo == MOTOR_JOURNAL:
+            return MotorJournal(caminho, "numero")
+        if tipo == MOTOR_JSON:
+            return MotorJson(caminho, "numero")
+        return MotorSqlite(caminho, "numero", os.path.join(self.diretorio, "banco.sqlite3"))
+
+    def test_escrita_externa_invalida_cache(self):
+        """
+        /************************ Teste 1 ****************************
+        Testa, em todos os motores, se o DAO enxerga um saldo alterado por outro processo.
+
+        Teste para garantir que, sem alterações externas, o cache continua sendo reutilizado.
+        *****************************************************************/
+        """
+        for numero, tipo in (("1001", MOTOR_JOURNAL), ("1002", MOTOR_JSON), ("1003", MOTOR_SQLITE)):
+            with self.subTest(motor=tipo), patch("dao.motores.fabrica_motor.MOTOR_ARMAZENAMENTO", tipo):
+                descartar_motores()
+                dao = ContaDAO()
+                dao.salvar_objeto(ContaCorrente(numero, 100.0))
+                conta = dao.buscar_por_id(numero)
+                self.assertIs(dao.buscar_por_id(numero), conta)
+
+                externo = self.outro_processo(tipo, dao.arquivo_json)
+                atual = externo.buscar(numero)
+                registro = dict(atual, saldo=55.0, versao=atual["versao"] + 1)
+                externo.atualizar(registro)
+                if isinstance(externo, MotorSqlite):
+                    externo.fechar()
+
+                self.assertEqual(dao.buscar_por_id(numero).get_saldo(), 55.0)
+                self.assertEqual(dao.listar_todos_objetos()[-1].get_saldo(), 55.0)
+
+    def test_journal_aplica_apenas_linhas_novas(self):
+        """
+        /************************ Teste 2 ****************************
+        Testa a sincronização incremental do journal: só as linhas acrescentadas por
+        outro processo são lidas, e uma linha ainda incompleta não é aplicada.
+        *****************************************************************/
+        """
+        caminho = os.path.join(self.diretorio, "contas.json")
+        leitor = MotorJournal(caminho, "numero")
+        escritor = MotorJournal(caminho, "numero")
+        escritor.inserir({"numero": "1001", "saldo": 1.0})
+
+        self.assertTrue(leitor.sincronizar())
+        self.assertFalse(leitor.sincronizar())
+        self.assertEqual(leitor.buscar(1001), {"numero": "1001", "saldo": 1.0})
+
+        with open(escritor.caminho_journal, "a", encoding="utf-8") as f:
+            f.write('{"op": "upsert", "id": "1002", "dados": {"numero": "1002"')
+        leitor.sincronizar()
+        self.assertIsNone(leitor.buscar(1002))
+
+        with open(escritor.caminho_journal, "a", encoding="utf-8") as f:
+            f.write('}}\n')
+        leitor.sincronizar()
+        self.assertEqual(leitor.buscar(1002), {"numero": "1002"})
+
+    def test_cliente_acompanha_conta_alterada_externamente(self):
+        """
+        /************************ Teste 3 ****************************
+        Testa se os clientes em cache são descartados quando uma conta deles muda em outro processo.
+        *****************************************************************/
+        """
+        self._cadastrar_cliente("12345678900", "1001")
+        dao = ClienteDAO()
+        self.assertEqual(dao.listar_todos_objetos()[0].contas[0].get_saldo(), 100.0)
+
+        externo = MotorJournal(dao._conta_dao.arquivo_json, "numero")
+        atual = externo.buscar(1001)
+        externo.atualizar(dict(atual, saldo=0.0, versao=atual["versao"] + 1))
+
+        self.assertEqual(dao.buscar_por_id("12345678900").contas[0].get_saldo(), 0.0)
+
+
+
+class TestConcorrenciaOtimista(_BaseTesteDAO):
+
+    def setUp(self):
+        """
+        /************************ Setup Testes de Concorrência Otimista ****************************
+        Cadastra dois clientes, cada um com uma conta corrente de saldo 100.
+        ********************************************************************************************
+        """
+        super().setUp()
+        for documento, numero in (("12345678900", "1001"), ("98765432100", "1002")):
+            self._cadastrar_cliente(documento, numero)
+
+    def test_motores_recusam_versao_desatualizada(self):
+        """
+        /************************ Teste 1 ****************************
+        Testa, em todos os motores, a comparação de versão em atualizar e aplicar_lote.
+
+        Teste para garantir que uma gravação baseada em leitura antiga não é persistida.
+        *****************************************************************/
+        """
+        for tipo in (MOTOR_JOURNAL, MOTOR_JSON, MOTOR_SQLITE):
+            with self.subTest(motor=tipo):
+                caminho = os.path.join(self.diretorio, f"versoes_{tipo}.json")
+                if tipo == MOTOR_JOURNAL:
+                    motor = MotorJournal(caminho, "numero")
+                elif tipo == MOTOR_JSON:
+                    motor = MotorJson(caminho, "numero")
+                else:
+                    motor = MotorSqlite(caminho, "numero", os.path.join(self.diretorio, "versoes.sqlite3"))
+
+                motor.inserir({"numero": "1001", "saldo": 1.0, "versao": 1})
+                self.assertTrue(motor.atualizar({"numero": "1001", "saldo": 2.0, "versao": 2}))
+
+                with self.assertRaises(ConflitoVersaoError):
+                    motor.atualizar({"numero": "1001", "saldo": 3.0, "versao": 2})
+                with self.assertRaises(ConflitoVersaoError):
+                    motor.aplicar_lote([
+                        (MotorArmazenamento.OP_INSERIR, {"numero": "1002", "saldo": 0.0, "versao": 1}),
+                        (MotorArmazenamento.OP_ATUALIZAR, {"numero": "1001", "saldo": 4.0, "versao": 2}),
+                    ])
+
+                self.assertEqual(motor.buscar(1001), {"numero": "1001", "saldo": 2.0, "versao": 2})
+                self.assertIsNone(motor.buscar(1002))
+                if isinstance(motor, MotorSqlite):
+                    motor.fechar()
+
+    def test_dao_detecta_escrita_concorrente(self):
+        """
+        /************************ Teste 2 ****************************
+        Testa se um objeto lido antes de outra gravação não sobrescreve essa gravação.
+
+        Teste para garantir que, após o conflito, a releitura traz o dado atual.
+        *****************************************************************/
+        """
+        dao_a, dao_b = ContaDAO(), ContaDAO()
+        conta_a = dao_a.buscar_por_id(1001)
+        conta_b = dao_b.buscar_por_id(1001)
+
+        conta_b._set_saldo(40.0)
+        dao_b.atualizar_objeto(conta_b)
+        conta_a._set_saldo(90.0)
+
+        with self.assertRaises(ConflitoVersaoError):
+            dao_a.atualizar_objeto(conta_a)
+
+        relida = dao_a.buscar_por_id(1001)
+        self.assertIsNot(relida, conta_a)
+        self.assertEqual((relida.get_saldo(), relida.get_versao()), (40.0, 2))
+
+    def test_pagamento_repete_apos_conflito(self):
+        """
+        /************************ Teste 3 ****************************
+        Testa se a transferência é refeita quando outro processo grava a conta de
+        destino entre a leitura e a gravação.
+        *****************************************************************/
+        """
+        transferir_original = ContaCorrente.transferir
+        chamadas = []
+
+        def transferir_com_escrita_externa(conta, destino, valor, descricao=""):
+            chamadas.append(valor)
+            if len(chamadas) == 1:
+                externo = MotorJournal(RegistroDAO.contas().arquivo_json, "numero")
+                atual = externo.buscar(1002)
+                externo.atualizar(dict(atual, saldo=atual["saldo"] + 50.0, versao=atual["versao"] + 1))
+            transferir_original(conta, destino, valor, descricao)
+
+        with patch.object(ContaCorrente, "transferir", transferir_com_escrita_externa), \
+                patch.object(PagamentoController, "_aguardar_nova_tentativa"):
+            resultado = PagamentoController.processar_pagamento(1001, "98765432100", 30.0, "Aluguel", "senha123", 1002)
+
+        descartar_motores()
+        self.assertTrue(resultado["sucesso"])
+        self.assertEqual(len(chamadas), 2)
+        self.assertEqual(ContaDAO().buscar_por_id(1001).get_saldo(), 70.0)
+        self.assertEqual(ContaDAO().buscar_por_id(1002).get_saldo(), 180.0)
+
+    def test_pagamento_desiste_apos_tentativas(self):
+        """
+        /************************ Teste 4 ****************************
+        Testa o limite de novas tentativas quando o conflito persiste.
+        *****************************************************************/
+        """
+        with patch.object(PagamentoController, "_efetivar_pagamento", side_effect=ConflitoVersaoError("1001")) as efetivar, \
+                patch.object(PagamentoController, "_aguardar_nova_tentativa") as aguardar:
+            resultado = PagamentoController.processar_pagamento(1001, "98765432100", 30.0, "Aluguel", "senha123", 1002)
+
+        self.assertFalse(resultado["sucesso"])
+        self.assertEqual(efetivar.call_count, TENTATIVAS_CONFLITO_VERSAO)
+        self.assertEqual(aguardar.call_count, TENTATIVAS_CONFLITO_VERSAO - 1)
+
+
+
+def executar_transferencias(diretorio: str, processo: int, quantidade: int, clientes: int) -> int:
+    """
+    Executa transferências aleatórias em 8 threads sobre o diretório de dados informado.
+    Usada como processo filho em TestTransferenciasConcorrentes.
+
+    Returns:
+        int: Quantidade de transferências aceitas.
+    """
+    def transferir(semente: int) -> bool:
+        sorteio = random.Random(semente)
+        origem, destino = sorteio.sample(range(clientes), 2)
+        resultado = PagamentoController.processar_pagamento(
+            1001 + origem, f"{destino:011d}", float(sorteio.randint(1, 300)), "Teste", "senha123", 1001 + destino
+        )
+        return resultado["sucesso"]
+
+    with patch("dao.dao.DIRETORIO_DATABASE", diretorio):
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            return sum(executor.map(transferir, range(processo * quantidade, (processo + 1) * quantidade)))
+
+
+class TestTransferenciasConcorrentes(_BaseTesteDAO):
+
+    QUANTIDADE_CLIENTES = 40
+    SALDO_INICIAL = 1000.0
+
+    def setUp(self):
+        """
+        /************************ Setup Testes de Concorrência ****************************
+        Cadastra clientes, cada um com uma conta corrente e o mesmo saldo inicial.
+        ***********************************************************************************
+        """
+        super().setUp()
+        for i in range(self.QUANTIDADE_CLIENTES):
+            self._cadastrar_cliente(f"{i:011d}", str(1001 + i), self.SALDO_INICIAL)
+
+    def test_saldo_total_conservado(self):
+        """
+        /************************ Teste 1 ****************************
+        Testa milhares de transferências simultâneas, em vários processos com várias
+        threads cada, entre as mesmas contas e em ambos os sentidos.
+
+        Teste para garantir que nenhuma escrita se perde: a soma dos saldos gravados
+        em disco é a mesma do início.
+        *****************************************************************/
+        """
+        RegistroDAO.descartar()
+        descartar_motores()
+
+        contexto = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=4, mp_context=contexto) as executor:
+            sucessos = sum(executor.map(
+                executar_transferencias, [self.diretorio] * 4, range(4), [500] * 4, [self.QUANTIDADE_CLIENTES] * 4
+            ))
+
+        saldos = [c.get_saldo() for c in ContaDAO().listar_todos_objetos()]
+
+        self.assertGreater(sucessos, 1000)
+        self.assertEqual(sum(saldos), self.QUANTIDADE_CLIENTES * self.SALDO_INICIAL)
+
+    def test_travas_em_ordem_crescente(self):
+        """
+        /************************ Teste 2 ****************************
+        Testa se travar (A, B) e (B, A) ao mesmo tempo não gera impasse e
+        se contas distintas não esperam uma pela outra.
+        *****************************************************************/
+        """
+        travas = TravasContas(os.path.join(self.diretorio, "travas_teste"))
+        dentro = threading.Event()
+        liberar = threading.Event()
+
+        def segurar_1001():
+            with travas.travar(1001):
+                dentro.set()
+                liberar.wait(5)
+
+        thread = threading.Thread(target=segurar_1001)
+        thread.start()
+        dentro.wait(5)
+        with travas.travar(2002, 2003):
+            pass  # Não depende da conta 1001, então não espera
+        liberar.set()
+        thread.join()
+
+        def cruzado(par):
+            for _ in range(200):
+                with travas.travar(*par):
+                    pass
+
+        threads = [threading.Thread(target=cruzado, args=(par,)) for par in ((1001, 1002), (1002, 1001)) * 4]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(10)
+
+        self.assertFalse(any(t.is_alive() for t in threads))
+
+
+class TestDurabilidade(unittest.TestCase):
+
+    def setUp(self):
+        """
+        /************************ Setup Testes de Durabilidade ****************************
+        Cria um diretório temporário para os arquivos de cada teste.
+        ***********************************************************************************
+        """
+        self.diretorio = tempfile.mkdtemp()
+        self.caminho = os.path.join(self.diretorio, "contas.json")
+
+    def tearDown(self):
+        descartar_motores()
+        shutil.rmtree(self.diretorio, ignore_errors=True)
+
+    def novo_motor(self, tipo: str, durabilidade: str = None):
+        if tipo == MOTOR_JOURNAL:
+            return MotorJournal(self.caminho, "numero", durabilidade=durabilidade)
+        if tipo == MOTOR_JSON:
+            return MotorJson(self.caminho, "numero", durabilidade=durabilidade)
+        return MotorSqlite(self.caminho, "numero", os.path.join(self.diretorio, "banco.sqlite3"), durabilidade)
+
+    def test_gravacao_em_grupo_agrupa_fsync(self):
+        """
+        /************************ Teste 1 ****************************
+        Testa se escritas simultâneas no modo grupo compartilham fsyncs
+        e se todas são persistidas.
+        *****************************************************************/
+        """
+        for tipo in (MOTOR_JOURNAL, MOTOR_JSON):
+            with self.subTest(motor=tipo):
+                self.caminho = os.path.join(self.diretorio, f"{tipo}.json")
+                motor = self.novo_motor(tipo, DURABILIDADE_GRUPO)
+                fsync_original = os.fsync
+                chamadas = []
+
+                def contar_fsync(descritor):
+                    chamadas.append(descritor)
+                    fsync_original(descritor)
+
+                with patch("os.fsync", side_effect=contar_fsync):
+                    with ThreadPoolExecutor(max_workers=16) as executor:
+                        list(executor.map(lambda i: motor.inserir({"numero": str(i)}), range(64)))
+
+                self.assertLess(len(chamadas), 64)
+                self.assertEqual(len(self.novo_motor(tipo).listar()), 64)
+
+    def test_erro_no_grupo_afeta_apenas_a_propria_escrita(self):
+        """
+        /************************ Teste 2 ****************************
+        Testa se, no modo grupo, uma inserção duplicada é recusada sem
+        impedir as demais escritas do mesmo grupo.
+        *****************************************************************/
+        """
+        for tipo in (MOTOR_JOURNAL, MOTOR_JSON, MOTOR_SQLITE):
+            with self.subTest(motor=tipo):
+                self.caminho = os.path.join(self.diretorio, f"{tipo}.json")
+                motor = self.novo_motor(tipo, DURABILIDADE_GRUPO)
+                motor.inserir({"numero": "1"})
+
+                def inserir(i):
+                    try:
+                        motor.inserir({"numero": str(i % 9)})
+                        return True
+                    except ValueError:
+                        return False
+
+                with ThreadPoolExecutor(max_workers=8) as executor:
+                    resultados = list(executor.map(inserir, range(2, 11)))
+
+                self.assertEqual(resultados.count(False), 1)  # 10 % 9 == 1 já existia
+                self.assertEqual(sorted(r["numero"] for r in self.novo_motor(tipo).listar()),
+                                 [str(i) for i in range(9)])
+
+    def test_queda_durante_gravacao_preserva_arquivo(self):
+        """
+        /************************ Teste 3 ****************************
+        Testa se uma falha no meio da gravação deixa o arquivo anterior intacto.
+
+        Teste para simular uma queda enquanto o arquivo temporário é escrito.
+        *****************************************************************/
+        """
+        motor = self.novo_motor(MOTOR_JSON)
+        motor.inserir({"numero": "1001", "saldo": 10.0})
+        with open(self.caminho, encoding="utf-8") as f:
+            conteudo_anterior = f.read()
+
+        def gravar_pela_metade(registros, f, **kwargs):
+            f.write('[{"numero": "10')
+            raise OSError("queda de energia")
+
+        with patch("dao.motores.motor_json.json.dump", side_effect=gravar_pela_metade):
+            with self.assertRaises(OSError):
+                motor.inserir({"numero": "1002", "saldo": 20.0})
+
+        with open(self.caminho, encoding="utf-8") as f:
+            self.assertEqual(f.read(), conteudo_anterior)
+        self.assertEqual(motor.listar(), [{"numero": "1001", "saldo": 10.0}])
+
+    def test_durabilidade_desconhecida(self):
+        """
+        /************************ Teste 4 ****************************
+        Testa ValueError para um modo de durabilidade inválido.
+        *****************************************************************/
+        """
+        for tipo in (MOTOR_JOURNAL, MOTOR_JSON, MOTOR_SQLITE):
+            with self.subTest(motor=tipo):
+                with self.assertRaises(ValueError):
+                    self.novo_motor(tipo, "sempre")
+
+    def test_dao_mantem_cache_com_escritas_agrupadas(self):
+        """
+        /************************ Teste 5 ****************************
+        Testa se escritas simultâneas do próprio DAO, agrupadas, não descartam
+        o cache, e se ele termina com todas as contas.
+        *****************************************************************/
+        """
+        with patch("dao.dao.DIRETORIO_DATABASE", self.diretorio), \
+                patch("dao.motores.motor_armazenamento.DURABILIDADE", DURABILIDADE_GRUPO):
+            descartar_motores()
+            dao = ContaDAO()
+            dao.listar_todos_objetos()
+            versao_cache = dao.versao_cache
+
+            with ThreadPoolExecutor(max_workers=16) as executor:
+                list(executor.map(lambda i: dao.salvar_objeto(ContaCorrente(str(2000 + i), 10.0)), range(48)))
+
+            self.assertEqual(dao.versao_cache, versao_cache)
+            self.assertEqual(len(dao.listar_todos_objetos()), 48)
+            self.assertEqual(len(dao._motor.listar()), 48)
+            self.assertIs(dao.buscar_por_id(2005), dao.listar_todos_objetos()[
+                dao._indice_posicoes[dao._normalizar_id(2005)]])
+
+    def test_sem_fsync_no_modo_nenhuma(self):
+        """
+        /************************ Teste 6 ****************************
+        Testa se o modo "nenhuma" grava sem chamar fsync.
+        *****************************************************************/
+        """
+        motor = self.novo_motor(MOTOR_JOURNAL, DURABILIDADE_NENHUMA)
+
+        with patch("os.fsync") as fsync:
+            motor.inserir({"numero": "1001"})
+            motor.compactar()
+
+        fsync.assert_not_called()
+        self.assertEqual(self.novo_motor(MOTOR_JOURNAL).listar(), [{"numero": "1001"}])
+
+
+class TestAtualizacaoMensal(_BaseTesteDAO):
+
+    def _livro(self, quantidade: int) -> list:
+        """
+        Gera contas correntes e poupanças com saldos sorteados (inclusive valores cujo
+        rendimento termina em meio centavo) e algumas contas inativas.
+        """
+        sorteio = random.Random(21)
+        contas = []
+        for indice in range(quantidade):
+            saldo = sorteio.choice([round(sorteio.uniform(0, 10 ** 6), 2), sorteio.randint(0, 2000) * 1.0, 1.0])
+            classe = ContaPoupanca if indice % 2 else ContaCorrente
+            contas.append(classe(str(1001 + indice), saldo, ativa=indice % 7 != 0))
+        return contas
+
+    def test_lote_igual_ao_calculo_conta_a_conta(self):
+        """
+        /************************ Teste 1 ****************************
+        Testa se o cálculo em lote (com e sem NumPy) dá os mesmos saldos e transações
+        que atualizacao_mensal conta a conta, ignorando as contas inativas.
+        *****************************************************************/
+        """
+        esperadas = self._livro(3000)
+        for conta in esperadas:
+            try:
+                conta.atualizacao_mensal()
+            except ContaInativaError:
+                pass
+        for conta in esperadas:
+            for transacao in conta.get_transacoes():
+                transacao.momento = 1234
+
+        for modulo_numpy in (atualizacao_mensal_controller.np, None):
+            with self.subTest(numpy=modulo_numpy is not None):
+                contas = self._livro(3000)
+                with patch.object(atualizacao_mensal_controller, "np", modulo_numpy):
+                    atualizadas, inativas, erros = AtualizacaoMensalController.aplicar(contas, 1234)
+
+                self.assertEqual(len(atualizadas) + len(inativas), len(contas))
+                self.assertEqual(erros, [])
+                for conta, esperada in zip(contas, esperadas):
+                    self.assertEqual(conta.get_saldo(), esperada.get_saldo())
+                    self.assertEqual(conta.get_transacoes(), esperada.get_transacoes())
+
+    def test_execucao_grava_em_lotes(self):
+        """
+        /************************ Teste 2 ****************************
+        Testa a atualização mensal de todas as contas: uma gravação por lote,
+        contas inativas ignoradas e transações gravadas nos ledgers.
+        *****************************************************************/
+        """
+        dao = RegistroDAO.contas()
+        for conta in self._livro(7):
+            dao.salvar_objeto(conta)
+
+        with patch.object(ContaDAO, "aplicar_lote", autospec=True, side_effect=ContaDAO.aplicar_lote) as lotes:
+            resultado = AtualizacaoMensalController.executar(momento=1234, tamanho_lote=3)
+
+        self.assertTrue(resultado["sucesso"])
+        self.assertEqual(resultado["atualizadas"], 6)
+        self.assertEqual(resultado["inativas"], ["1001"])
+        self.assertEqual(lotes.call_count, 3)
+
+        RegistroDAO.descartar()
+        descartar_motores()
+        contas = ContaDAO().listar_todos_objetos()
+        self.assertEqual(contas[0].get_transacoes(), [])
+        for conta in contas[1:]:
+            tipo = TipoOperacao.RENDIMENTO if isinstance(conta, ContaPoupanca) else TipoOperacao.TAXA_MANUTENCAO
+            self.assertEqual([(t.momento, t.tipo) for t in conta.get_transacoes()], [(1234, tipo)])
+
+    def test_lote_sincroniza_cada_arquivo_de_ledger_uma_vez(self):
+        """
+        /************************ Teste 3 ****************************
+        Testa se cada lote grava todos os ledgers antes de sincronizá-los: um fsync
+        por arquivo do ledger (ledger, índice e checkpoints) e um só do diretório.
+        *****************************************************************/
+        """
+        dao = RegistroDAO.contas()
+        for conta in self._livro(8):
+            dao.salvar_objeto(conta)
+        diretorio_ledgers = os.path.dirname(dao._ledger.caminho("1001"))
+        fsync_original = os.fsync
+        sincronizados = []
+
+        def registrar_fsync(descritor):
+            estado = os.fstat(descritor)
+            sincronizados.append((estado.st_dev, estado.st_ino))
+            fsync_original(descritor)
+
+        with patch("os.fsync", side_effect=registrar_fsync):
+            resultado = AtualizacaoMensalController.executar(momento=1234, tamanho_lote=4)
+
+        self.assertEqual(resultado["atualizadas"], 6)
+        for conta in ContaDAO().listar_todos_objetos():
+            if not conta.get_estado_da_conta():
+                continue
+            numero = conta.get_numero_conta()
+            for caminho in (dao._ledger.caminho(numero), dao._ledger.caminho_indice(numero), dao._ledger.caminho_saldos(numero)):
+                estado = os.stat(caminho)
+                self.assertEqual(sincronizados.count((estado.st_dev, estado.st_ino)), 1, caminho)
+        estado = os.stat(diretorio_ledgers)
+        self.assertEqual(sincronizados.count((estado.st_dev, estado.st_ino)), 2)
+
+
+@unittest.skipIf(np is None, "A projeção de saldos requer o NumPy.")
+class TestProjecao(unittest.TestCase):
+
+    def test_projecao_igual_a_atualizacoes_mensais(self):
+        """
+        /************************ Teste 1 ****************************
+        Testa se a projeção de cada cenário dá os mesmos saldos que aplicar
+        atualizacao_mensal mês a mês, sem alterar as contas projetadas.
+        Contas inativas mantêm o saldo.
+        *****************************************************************/
+        """
+        cenarios = [
+            Cenario("atual"),
+            Cenario("alta", rendimento_mensal=0.01, taxa_manutencao=15.0),
+        ]
+        contas = [
+            ContaCorrente("3001", 25.0),
+            ContaPoupanca("4001", 1234.56),
+            ContaPoupanca("4002", 0.0),
+            ContaCorrente("3002", 80.0, ativa=False),
+        ]
+
+        (numeros, saldos), = ProjecaoController.projetar(contas, 12, cenarios)
+
+        self.assertEqual(numeros, ["3001", "4001", "4002", "3002"])
+        self.assertEqual(saldos.shape, (4, 12, 2))
+        self.assertEqual([conta.get_saldo() for conta in contas], [25.0, 1234.56, 0.0, 80.0])
+        self.assertEqual([conta.get_transacoes() for conta in contas], [[], [], [], []])
+        self.assertTrue((saldos[3] == 80.0).all())
+
+        copias = [ContaCorrente("3001", 25.0), ContaPoupanca("4001", 1234.56), ContaPoupanca("4002", 0.0)]
+        alta = [(ContaCorrente, 25.0, 15.0), (ContaPoupanca, 1234.56, 0.01), (ContaPoupanca, 0.0, 0.01)]
+        for mes in range(12):
+            for indice_conta, copia in enumerate(copias):
+                copia.atualizacao_mensal()
+                self.assertEqual(saldos[indice_conta, mes, 0], copia.get_saldo())
+            for indice_conta, (classe, saldo, parametro) in enumerate(alta):
+                saldo = classe.regra_mensal(saldo, parametro)[0]
+                alta[indice_conta] = (classe, saldo, parametro)
+                self.assertEqual(saldos[indice_conta, mes, 1], saldo)
+
+    def test_projecao_em_blocos_com_memoria_limitada(self):
+        """
+        /************************ Teste 2 ****************************
+        Testa se, com pouca memória, a projeção é entregue em vários blocos com o
+        mesmo resultado, e se o total da carteira soma todos os blocos.
+        *****************************************************************/
+        """
+        cenarios = [Cenario("atual"), Cenario("sem taxa", taxa_manutencao=0.0)]
+        contas = [(ContaPoupanca if i % 2 else ContaCorrente)(str(5001 + i), 100.0 + i) for i in range(25)]
+        por_conta = ProjecaoController.memoria_por_conta(6, len(cenarios))
+
+        blocos = list(ProjecaoController.projetar(iter(contas), 6, cenarios, memoria_maxima=10 * por_conta))
+        (_, inteiro), = ProjecaoController.projetar(contas, 6, cenarios)
+
+        self.assertEqual([len(numeros) for numeros, _ in blocos], [10, 10, 5])
+        self.assertTrue((np.concatenate([saldos for _, saldos in blocos]) == inteiro).all())
+        self.assertTrue(np.allclose(ProjecaoController.projetar_carteira(contas, 6, cenarios), inteiro.sum(axis=0)))
+        with self.assertRaises(ValueError):
+            next(ProjecaoController.projetar(contas, 6, cenarios, memoria_maxima=por_conta - 1))
+
+    def test_projecao_nao_retem_as_contas_lidas(self):
+        """
+        /************************ Teste 3 ****************************
+        Testa se o bloco guarda só os dados copiados das contas: quando ele é
+        entregue, as contas lidas de um gerador já podem ter sido descartadas.
+        *****************************************************************/
+        """
+        referencias = []
+
+        def gerar_contas():
+            for i in range(4):
+                conta = ContaCorrente(str(6001 + i), 50.0)
+                referencias.append(weakref.ref(conta))
+                yield conta
+
+        (numeros, saldos), = ProjecaoController.projetar(gerar_contas(), 3, [Cenario("atual")])
+
+        self.assertEqual(numeros, ["6001", "6002", "6003", "6004"])
+        self.assertEqual(saldos.shape, (4, 3, 1))
+        self.assertTrue(all(referencia() is None for referencia in referencias))
+
+
+class TestPagamentosEmLote(_BaseTesteDAO):
+
+    def setUp(self):
+        """
+        /************************ Setup Testes de Pagamentos em Lote ****************************
+        Cadastra três clientes, cada um com uma conta corrente (a 1001, de origem,
+        com R$ 1000,00).
+        *****************************************************************************************
+        """
+        super().setUp()
+        for documento, numero, saldo in (("12345678900", "1001", 1000.0), ("98765432100", "1002", 0.0),
+                                         ("11122233344", "1003", 0.0)):
+            self._cadastrar_cliente(documento, numero, saldo)
+
+        self.entrada = os.path.join(self.diretorio, "pagamentos.csv")
+        self.resultado = os.path.join(self.diretorio, "resultado.csv")
+
+    def _escrever_entrada(self, linhas: list) -> None:
+        with open(self.entrada, "w", encoding="utf-8") as f:
+            f.write("\n".join(linhas) + "\n")
+
+    def _ler_resultado(self) -> list:
+        with open(self.resultado, "r", encoding="utf-8") as f:
+            return f.read().splitlines()
+
+    def test_lote_com_linhas_validas_e_rejeitadas(self):
+        """
+        /************************ Teste 1 ****************************
+        Testa um arquivo com transferências válidas e recusadas: as válidas são
+        gravadas de uma vez, com as mesmas regras de Conta.transferir, e cada linha
+        recebe seu resultado.
+        *****************************************************************/
+        """
+        self._escrever_entrada([
+            "documento;conta;valor;descricao",
+            "987.654.321-00;1002;300,50;Salário",
+            "11122233344;1003;200;Salário",
+            "",
+            "11122233344;1002;10,00;Documento de outro cliente",
+            "98765432100;abc;10,00;",
+            "98765432100;1002;-5;",
+            "98765432100;1002;1,234;",
+            "12345678900;1001;10,00;",
+            "98765432100;1002;600,00;Acima do saldo",
+            "98765432100;1002;99,50",
+        ])
+
+        with patch.object(ContaDAO, "aplicar_lote", autospec=True, side_effect=ContaDAO.aplicar_lote) as lotes:
+            resultado = PagamentoLoteController.processar_arquivo(self.entrada, self.resultado, 1001, "senha123")
+
+        self.assertTrue(resultado["sucesso"])
+        self.assertEqual((resultado["linhas"], resultado["efetivadas"], resultado["rejeitadas"]), (9, 3, 6))
+        self.assertEqual(resultado["valor_total"], 600.0)
+        self.assertEqual(lotes.call_count, 1)
+        self.assertEqual(self._ler_resultado(), [
+            "linha;situacao;mensagem",
+            "2;efetivada;",
+            "3;efetivada;",
+            "5;rejeitada;Conta 1002 não encontrada para o destinatário com documento 11122233344.",
+            "6;rejeitada;Número de conta inválido.",
+            "7;rejeitada;O valor da transferência deve ser maior que zero.",
+            "8;rejeitada;O valor da transferência deve ter no máximo duas casas decimais.",
+            "9;rejeitada;Você não pode transferir para a mesma conta.",
+            "10;rejeitada;Saldo insuficiente para a transferência.",
+            "11;efetivada;",
+        ])
+
+        RegistroDAO.descartar()
+        descartar_motores()
+        dao = ContaDAO()
+        self.assertEqual(dao.buscar_por_id(1001).get_saldo(), 400.0)
+        self.assertEqual(dao.buscar_por_id(1002).get_saldo(), 400.0)
+        self.assertEqual(dao.buscar_por_id(1003).get_saldo(), 200.0)
+        self.assertEqual(
+            [(t.tipo, t.valor, t.contraparte) for t in dao.buscar_por_id(1002).get_transacoes()],
+            [(TipoOperacao.TRANSFERENCIA_RECEBIDA, 300.5, "1001"), (TipoOperacao.TRANSFERENCIA_RECEBIDA, 99.5, "1001")]
+        )
+
+    def test_arquivo_recusado_sem_gravar(self):
+        """
+        /************************ Teste 2 ****************************
+        Testa se senha incorreta ou cabeçalho incompleto recusam o arquivo inteiro,
+        e se um conflito persistente rejeita todas as linhas sem gravar nada.
+        *****************************************************************/
+        """
+        self._escrever_entrada(["documento;conta;valor", "98765432100;1002;10,00"])
+        resultado = PagamentoLoteController.processar_arquivo(self.entrada, self.resultado, 1001, "errada")
+        self.assertEqual(resultado, {"sucesso": False, "erros": ["Senha incorreta."]})
+
+        self._escrever_entrada(["documento;valor", "98765432100;10,00"])
+        resultado = PagamentoLoteController.processar_arquivo(self.entrada, self.resultado, 1001, "senha123")
+        self.assertFalse(resultado["sucesso"])
+        self.assertIn("conta", resultado["erros"][0])
+        self.assertFalse(os.path.exists(self.resultado))
+
+        self._escrever_entrada(["documento;conta;valor", "98765432100;1002;10,00"])
+        with patch.object(PagamentoLoteController, "_efetivar", side_effect=ConflitoVersaoError("1001")), \
+                patch.object(PagamentoController, "_aguardar_nova_tentativa"):
+            resultado = PagamentoLoteController.processar_arquivo(self.entrada, self.resultado, 1001, "senha123")
+        self.assertFalse(resultado["sucesso"])
+        self.assertEqual(resultado["efetivadas"], 0)
+        self.assertEqual(self._ler_resultado()[1].split(";")[1], "rejeitada")
+        self.assertEqual(RegistroDAO.contas().buscar_por_id(1001).get_saldo(), 1000.0)
+
+    def test_documentos_formatados_como_gravados(self):
+        """
+        /************************ Teste 3 ****************************
+        Testa um lote de uma empresa para um cliente cujos documentos estão gravados
+        com pontuação (como no cadastro): o documento da linha vale com ou sem
+        pontuação, como na transferência avulsa.
+        *****************************************************************/
+        """
+        empresa = PessoaJuridica(
+            nome="Empresa Teste",
+            email="empresa@email.com",
+            numero_documento="87.654.332/1454-65",
+            cep="12345678",
+            numero_endereco="100",
+            endereco="Rua Teste, 100",
+            telefone="31999998888"
+        )
+        funcionario = PessoaFisica(
+            nome="Maria Souza",
+            email="maria@email.com",
+            numero_documento="157.112.896-40",
+            cep="12345678",
+            numero_endereco="100",
+            endereco="Rua Teste, 100",
+            telefone="31999998888",
+            data_nascimento="01/01/1990"
+        )
+        self._cadastrar_cliente(empresa.get_numero_documento(), "1004", 500.0, pessoa=empresa)
+        self._cadastrar_cliente(funcionario.get_numero_documento(), "1005", 0.0, pessoa=funcionario)
+        RegistroDAO.descartar()
+
+        self._escrever_entrada([
+            "documento;conta;valor;descricao",
+            "157.112.896-40;1005;50,00;Salário",
+            "15711289640;1005;25,00;Adiantamento",
+            "87.654.332/1454-65;1005;10,00;Documento da empresa",
+        ])
+        resultado = PagamentoLoteController.processar_arquivo(self.entrada, self.resultado, 1004, "senha123")
+
+        self.assertEqual((resultado["efetivadas"], resultado["rejeitadas"]), (2, 1))
+        self.assertEqual(self._ler_resultado()[1:3], ["2;efetivada;", "3;efetivada;"])
+        self.assertEqual(
+            PagamentoController.processar_pagamento(1004, "157.112.896-40", 5.0, "", "senha123", 1005)["sucesso"],
+            True
+        )
+        self.assertEqual(RegistroDAO.contas().buscar_por_id(1005).get_saldo(), 80.0)
+
+
+class TestExportacaoExtrato(_BaseTesteDAO):
+
+    def _conta_com_historico(self, momentos: list, pendentes: int = 0) -> ContaCorrente:
+        """
+        Grava a conta 1001 com uma entrada de R$ 10,00 em cada momento; as últimas
+        `pendentes` operações ficam sem gravar.
+        """
+        dao = RegistroDAO.contas()
+        dao.salvar_objeto(ContaCorrente("1001", 0.0))
+        conta = dao.buscar_por_id(1001)
+        for indice, momento in enumerate(momentos):
+            conta._registrar_transacao(TipoOperacao.TRANSFERENCIA_RECEBIDA, 10.0, "1002", "Aluguel & cia", momento)
+            conta._set_saldo(conta.get_saldo() + 10.0)
+            if indice == len(momentos) - pendentes - 1:
+                dao.atualizar_objeto(conta)
+        return conta
+
+    def test_exportacao_csv_e_ofx(self):
+        """
+        /************************ Teste 1 ****************************
+        Testa o extrato exportado em CSV (histórico completo, inclusive operações
+        pendentes) e em OFX (período, com o saldo ao fim dele).
+        *****************************************************************/
+        """
+        base = int(datetime(2025, 1, 1, 8).timestamp())
+        conta = self._conta_com_historico([base + dia * 86400 for dia in range(10)], pendentes=2)
+        conta._registrar_transacao(TipoOperacao.OUTRA, descricao="Registro; antigo", momento=base + 5 * 86400)
+
+        trechos, erro = ContaController.exportar_extrato(1001)
+        self.assertIsNone(erro)
+        linhas = "".join(trechos).splitlines()
+        self.assertEqual(len(linhas), 1 + 11)
+        self.assertEqual(linhas[0], "data;tipo;valor;contraparte;descricao")
+        self.assertEqual(linhas[1], "2025-01-01 08:00:00;transferencia_recebida;10.00;1002;Aluguel & cia")
+        self.assertEqual(linhas[-1], '2025-01-06 08:00:00;outra;0.00;;"Registro; antigo"')
+
+        inicio, fim = datetime(2025, 1, 3), datetime(2025, 1, 9, 23, 59, 59)
+        trechos, erro = ContaController.exportar_extrato(1001, "ofx", inicio, fim)
+        self.assertIsNone(erro)
+        ofx = "".join(trechos)
+        self.assertTrue(ofx.startswith("OFXHEADER:100\n"))
+        self.assertEqual(ofx.count("<STMTTRN>"), 7)  # Dias 3 a 9; o registro antigo não movimenta saldo
+        self.assertIn("<FITID>1001-2<MEMO>Aluguel &amp; cia</STMTTRN>", ofx)
+        self.assertIn("<FITID>1001-8<", ofx)  # Operação pendente, numerada após as gravadas
+        self.assertIn("<DTSTART>20250103000000\n<DTEND>20250109235959\n", ofx)
+        self.assertIn("<LEDGERBAL><BALAMT>90.00<DTASOF>20250109235959</LEDGERBAL>", ofx)
+
+        self.assertEqual(ContaController.exportar_extrato(1001, "pdf"), (None, "Formato de exportação inválido: pdf."))
+        self.assertEqual(ContaController.exportar_extrato(9999), (None, "Conta não encontrada."))
+        self.assertEqual(ContaController.exportar_extrato(1001, "csv", fim, inicio)[0], None)
+
+    def test_exportacao_em_blocos_sem_copiar_historico(self):
+        """
+        /************************ Teste 2 ****************************
+        Testa se o extrato é gerado em trechos lidos do ledger sob demanda, sem
+        carregar o histórico da conta, e se a gravação em arquivo dá o mesmo conteúdo.
+        *****************************************************************/
+        """
+        self._conta_com_historico(range(1, 2501))
+        RegistroDAO.descartar()
+        descartar_motores()
+
+        with patch.object(LedgerDAO, "ler", side_effect=AssertionError("leu o histórico inteiro")), \
+                patch.object(TransacaoMapper, "from_registro", side_effect=TransacaoMapper.from_registro) as lidas:
+            trechos, _ = ContaController.exportar_extrato(1001)
+            primeiro = next(trechos)
+            self.assertEqual(lidas.call_count, 1000)
+            self.assertEqual(primeiro.count("\n"), 1 + 1000)
+            conteudo = primeiro + "".join(trechos)
+        self.assertEqual(conteudo.count("\n"), 1 + 2500)
+
+        caminho = os.path.join(self.diretorio, "extrato.csv")
+        tamanho, erro = ContaController.exportar_extrato_para_arquivo(1001, caminho)
+        self.assertIsNone(erro)
+        with open(caminho, "r", encoding="utf-8", newline="") as f:
+            self.assertEqual(f.read(), conteudo)
+        self.assertEqual(tamanho, os.path.getsize(caminho))
+
+        with open(RegistroDAO.contas()._ledger.caminho(1001), "r+b") as f:
+            f.truncate(100)
+        tamanho, erro = ContaController.exportar_extrato_para_arquivo(1001, caminho + "2")
+        self.assertIsNone(tamanho)
+        self.assertIn("incompleto", erro)
+        self.assertEqual(os.listdir(self.diretorio).count("extrato.csv2.tmp"), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
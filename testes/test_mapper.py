@@ -9,6 +9,8 @@ from model.pessoa_juridica import PessoaJuridica
 from mapper.conta_mapper import ContaMapper
 from model.conta_corrente import ContaCorrente
 from model.conta_poupanca import ContaPoupanca
+from mapper.transacao_mapper import TransacaoMapper
+from model.transacao import TipoOperacao, Transacao
 
 from utils.constantes import (
     TIPO_PFISICA,
@@ -220,6 +222,37 @@ class TestPessoaMapper(unittest.TestCase):
         self.assertEqual(dict_pessoa["tipo"], TIPO_PJURIDICA)
         self.assertNotIn("nome_fantasia", dict_pessoa)
 
+    @patch('utils.api.API.buscar_endereco_por_cep')
+    def test_from_dict_armazenado_nao_consulta_api(self, mock_api_cep):
+        """
+        /************************ Teste 9 ****************************
+        Testa a reconstrução de uma PessoaFisica persistida.
+
+        Teste para garantir que o endereço armazenado é mantido e que
+        nenhuma consulta de CEP é feita ao carregar a base.
+        *****************************************************************/
+        """
+        dados_pf = {
+            "tipo": TIPO_PFISICA,
+            "nome": "Victor",
+            "email": "victor@email.com",
+            "numero_documento": "12345678900",
+            "cep": "12345000",
+            "numero_endereco": "10",
+            "endereco": "Rua dos Testes, 10 - Centro, Cidade - UF, 12345000",
+            "telefone": "31999998888",
+            "data_nascimento": "01/01/1990",
+            "versao": 3
+        }
+
+        pessoa = PessoaMapper.from_dict_armazenado(dados_pf)
+
+        self.assertIsInstance(pessoa, PessoaFisica)
+        self.assertEqual(pessoa.get_endereco(), dados_pf["endereco"])
+        self.assertEqual(pessoa.get_data_nascimento(), datetime(1990, 1, 1))
+        self.assertEqual(PessoaMapper.to_dict(pessoa), dados_pf)
+        mock_api_cep.assert_not_called()
+
 #Testes ContaMapper
 class TestContaMapper(unittest.TestCase):
 
@@ -289,3 +322,72 @@ class TestContaMapper(unittest.TestCase):
 
         
 
+    def test_from_dict_armazenado_nao_revalida(self):
+        """
+        /************************ Teste 4 ****************************
+        Testa a reconstrução de uma conta persistida sem revalidação.
+
+        Teste para garantir que o histórico não é percorrido pelo validador na carga.
+        *****************************************************************/
+        """
+        dados_cp = {
+            "tipo": TIPO_CPOUPANCA,
+            "numero": "2002",
+            "saldo": 10.0,
+            "historico": ["[2025-01-01 10:00:00] Conta criada"],
+            "ativa": True
+        }
+
+        with patch('utils.validadores.validar_conta.ValidarConta.todos_campos') as mock_validar:
+            conta = ContaMapper.from_dict_armazenado(dados_cp)
+
+        self.assertIsInstance(conta, ContaPoupanca)
+        self.assertEqual(conta.get_saldo(), 10.0)
+        self.assertEqual(conta.get_historico(), dados_cp["historico"])
+        mock_validar.assert_not_called()
+
+
+class TestTransacaoMapper(unittest.TestCase):
+
+    def test_registro_ida_e_volta(self):
+        """
+        /************************ Teste 1 ****************************
+        Testa a conversão de uma transação para o registro do ledger e de volta.
+        *****************************************************************/
+        """
+        transacao = Transacao(1750798479, TipoOperacao.TRANSFERENCIA_RECEBIDA, 8800, "1001", "Aluguel")
+
+        registro = TransacaoMapper.to_registro(transacao)
+
+        self.assertEqual(registro, [1750798479, 2, 8800, "1001", "Aluguel"])
+        self.assertEqual(TransacaoMapper.from_registro(registro), transacao)
+        with self.assertRaises(ValueError):
+            TransacaoMapper.from_registro([1, 2])
+
+    def test_from_texto_historico_antigo(self):
+        """
+        /************************ Teste 2 ****************************
+        Testa a interpretação das linhas do histórico antigo, em texto livre.
+
+        Teste para garantir que o texto exibido continua o mesmo após a conversão.
+        *****************************************************************/
+        """
+        textos = {
+            "[2025-06-24 17:54:39] Transferência de R$ 88.00 para conta 1002": TipoOperacao.TRANSFERENCIA_ENVIADA,
+            "[2025-06-24 17:54:39] Recebido R$ 1500.25 da conta 1001": TipoOperacao.TRANSFERENCIA_RECEBIDA,
+            "[2025-07-01 00:00:00] Atualização mensal: taxa de manutenção de R$ 10.00 cobrada.": TipoOperacao.TAXA_MANUTENCAO,
+            "[2025-07-01 00:00:00] Atualização mensal: rendimento de R$ 5.03 aplicado.": TipoOperacao.RENDIMENTO,
+            "[2025-07-02 09:00:00] Conta encerrada": TipoOperacao.ENCERRAMENTO,
+            "[2025-01-01 10:00:00] Conta criada": TipoOperacao.OUTRA,
+            "Deposito inicial": TipoOperacao.OUTRA,
+        }
+
+        for texto, tipo in textos.items():
+            with self.subTest(texto=texto):
+                transacao = TransacaoMapper.from_texto(texto)
+                self.assertEqual(transacao.tipo, tipo)
+                self.assertEqual(transacao.formatar(), texto)
+
+        recebida = TransacaoMapper.from_texto("[2025-06-24 17:54:39] Recebido R$ 1500.25 da conta 1001")
+        self.assertEqual((recebida.valor_centavos, recebida.contraparte), (150025, "1001"))
+        self.assertEqual(recebida.momento, int(datetime(2025, 6, 24, 17, 54, 39).timestamp()))
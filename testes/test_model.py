@@ -8,6 +8,7 @@ from model.pessoa_juridica import PessoaJuridica
 from model.cliente import Cliente
 from model.conta_corrente import ContaCorrente
 from model.conta_poupanca import ContaPoupanca
+from model.transacao import TipoOperacao, Transacao
 from model.exceptions import ContaInativaError # não diretamente testado em Cliente, mas é uma dependência de Conta
 
 # Constantes que podem ser usadas nos testes
@@ -540,9 +541,47 @@ class TestContasBancarias(unittest.TestCase):
        
 
 
+class TestTransacao(unittest.TestCase):
 
+    def test_transferencia_registra_transacoes_estruturadas(self):
+        """
+        /************************ Teste 1 ****************************
+        Testa se a transferência registra, nas duas contas, transações com tipo,
+        valor em centavos, contraparte e descrição.
 
+        Teste para garantir que somar transações não depende de texto.
+        *****************************************************************/
+        """
+        remetente = ContaCorrente("3001", saldo=100.0)
+        destinatario = ContaPoupanca("4001", saldo=50.0)
 
+        remetente.transferir(destinatario, 30.5, "Aluguel")
+        remetente.atualizacao_mensal()
 
+        enviada, taxa = remetente.get_transacoes()
+        recebida, = destinatario.get_transacoes()
+        self.assertEqual(enviada.tipo, TipoOperacao.TRANSFERENCIA_ENVIADA)
+        self.assertEqual((enviada.valor_centavos, enviada.contraparte, enviada.descricao), (3050, "4001", "Aluguel"))
+        self.assertEqual(recebida.tipo, TipoOperacao.TRANSFERENCIA_RECEBIDA)
+        self.assertEqual(recebida.contraparte, "3001")
+        self.assertEqual(recebida.momento, enviada.momento)
+        self.assertEqual(taxa.tipo, TipoOperacao.TAXA_MANUTENCAO)
+        self.assertEqual(sum(t.efeito_centavos for t in remetente.get_transacoes()),
+                         round((remetente.get_saldo() - 100.0) * 100))
+
+    def test_formatacao_compativel_com_historico_em_texto(self):
+        """
+        /************************ Teste 2 ****************************
+        Testa se a transação é exibida com o mesmo texto do histórico antigo.
+        *****************************************************************/
+        """
+        momento = int(datetime(2025, 6, 24, 17, 54, 39).timestamp())
 
+        enviada = Transacao(momento, TipoOperacao.TRANSFERENCIA_ENVIADA, 8800, "1002", "Aluguel")
+        encerramento = Transacao(momento, TipoOperacao.ENCERRAMENTO)
+        antiga = Transacao(0, TipoOperacao.OUTRA, descricao="Deposito inicial")
 
+        self.assertEqual(enviada.formatar(), "[2025-06-24 17:54:39] Transferência de R$ 88.00 para conta 1002")
+        self.assertEqual(str(encerramento), "[2025-06-24 17:54:39] Conta encerrada")
+        self.assertEqual(antiga.formatar(), "Deposito inicial")
+        self.assertEqual(enviada.valor, 88.0)
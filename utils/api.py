@@ -1,39 +1,186 @@
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 import requests
+from requests.adapters import HTTPAdapter
+from utils.cache_cep import CacheCep
+from utils.indice_cep_offline import IndiceCepOffline
+from utils.logger import logger
+from utils.constantes import (
+    DIRETORIO_DATABASE,
+    URL_VIACEP,
+    BACKEND_CEP,
+    BACKEND_CEP_OFFLINE,
+    ARQUIVO_INDICE_CEP,
+    ARQUIVO_CACHE_CEP,
+    TTL_CACHE_CEP,
+    TTL_CACHE_CEP_NEGATIVO,
+    TAMANHO_MAXIMO_CACHE_CEP,
+    TIMEOUT_CEP_CONEXAO,
+    TIMEOUT_CEP_LEITURA,
+    CONEXOES_CEP_SIMULTANEAS
+)
 from utils.validadores.validar_pessoa import ValidarPessoa as Validar
 
+# Protege a criação sob demanda do cache, do índice offline e da sessão compartilhados
+_trava_inicializacao = threading.Lock()
+
 class API():
     """
     Classe utilitária responsável por consultar e compor endereços a partir de CEPs,
-    utilizando a API pública ViaCEP, com cache local para evitar múltiplas requisições.
+    utilizando a API pública ViaCEP, com cache persistente para evitar múltiplas requisições.
+
+    Com BACKEND_CEP = BACKEND_CEP_OFFLINE, um índice local de CEPs é consultado
+    primeiro e a ViaCEP só é usada para CEPs ausentes do índice.
     """
 
-    _cache_cep = {}  # Cache em memória por execução
+    _cache_cep = None         # CacheCep, aberto na primeira consulta
+    _indice_offline = None    # IndiceCepOffline; False se o arquivo não pôde ser aberto
+    _sessao = None            # requests.Session com pool de conexões keep-alive
+
+    # Consultas HTTP em andamento por CEP, compartilhadas entre threads
+    _requisicoes_em_andamento: dict[str, Future] = {}
+    _trava_requisicoes = threading.Lock()
+
+    @staticmethod
+    def obter_cache() -> CacheCep:
+        """
+        Retorna o cache persistente de CEPs, abrindo-o na primeira chamada.
+        """
+        if API._cache_cep is None:
+            with _trava_inicializacao:
+                if API._cache_cep is None:
+                    API._cache_cep = CacheCep(
+                        os.path.join(DIRETORIO_DATABASE, ARQUIVO_CACHE_CEP),
+                        ttl_segundos=TTL_CACHE_CEP,
+                        ttl_negativo_segundos=TTL_CACHE_CEP_NEGATIVO,
+                        tamanho_maximo=TAMANHO_MAXIMO_CACHE_CEP
+                    )
+        return API._cache_cep
+
+    @staticmethod
+    def obter_indice_offline() -> IndiceCepOffline | None:
+        """
+        Retorna o índice local de CEPs, abrindo-o na primeira chamada.
+        Retorna None se o arquivo de índice não existir ou for inválido.
+        """
+        if API._indice_offline is None:
+            with _trava_inicializacao:
+                if API._indice_offline is None:
+                    caminho = os.path.join(DIRETORIO_DATABASE, ARQUIVO_INDICE_CEP)
+                    try:
+                        API._indice_offline = IndiceCepOffline(caminho)
+                    except (OSError, ValueError) as e:
+                        logger.warning(f"Índice offline de CEP indisponível ({e}); usando apenas a ViaCEP.")
+                        API._indice_offline = False
+        return API._indice_offline or None
+
+    @staticmethod
+    def obter_sessao() -> requests.Session:
+        """
+        Retorna a sessão HTTP compartilhada, que reaproveita conexões com a ViaCEP.
+        """
+        if API._sessao is None:
+            with _trava_inicializacao:
+                if API._sessao is None:
+                    sessao = requests.Session()
+                    adaptador = HTTPAdapter(
+                        pool_connections=CONEXOES_CEP_SIMULTANEAS,
+                        pool_maxsize=CONEXOES_CEP_SIMULTANEAS
+                    )
+                    sessao.mount("https://", adaptador)
+                    sessao.mount("http://", adaptador)
+                    API._sessao = sessao
+        return API._sessao
+
+    @staticmethod
+    def _requisitar_viacep(cep_numerico: str) -> dict | None:
+        """
+        Faz a chamada HTTP à ViaCEP, com tempo limite de conexão e de leitura.
+
+        Raises:
+            ValueError: Se a ViaCEP responder com erro ou não responder a tempo.
+        """
+        url = URL_VIACEP.format(cep=cep_numerico)
+        try:
+            response = API.obter_sessao().get(url, timeout=(TIMEOUT_CEP_CONEXAO, TIMEOUT_CEP_LEITURA))
+        except requests.Timeout:
+            raise ValueError("O serviço de CEP demorou para responder. Tente novamente mais tarde.")
+        except requests.RequestException:
+            raise ValueError("Erro ao buscar o endereço. Tente novamente mais tarde.")
+
+        if response.status_code != 200:
+            raise ValueError("Erro ao buscar o endereço. Tente novamente mais tarde.")
+
+        data = response.json()
+        return None if "erro" in data else data
+
+    @staticmethod
+    def _consultar_cep(cep_numerico: str) -> dict | None:
+        """
+        Retorna os dados do CEP (ou None se ele não existir), consultando em ordem:
+        o índice offline (se configurado), o cache persistente e a ViaCEP.
+        Consultas simultâneas ao mesmo CEP compartilham uma única requisição HTTP.
+
+        Raises:
+            ValueError: Se a ViaCEP responder com erro.
+        """
+        if BACKEND_CEP == BACKEND_CEP_OFFLINE:
+            indice = API.obter_indice_offline()
+            data = indice.buscar(cep_numerico) if indice else None
+            if data is not None:
+                return data
+
+        cache = API.obter_cache()
+        presente, data = cache.obter(cep_numerico)
+        if presente:
+            return data
+
+        # Apenas uma requisição por CEP em andamento: as demais aguardam o mesmo resultado
+        with API._trava_requisicoes:
+            futuro = API._requisicoes_em_andamento.get(cep_numerico)
+            responsavel = futuro is None
+            if responsavel:
+                # A requisição anterior pode ter terminado (e gravado o cache) depois da
+                # consulta acima: consulta de novo antes de abrir outra
+                presente, data = cache.obter(cep_numerico)
+                if presente:
+                    return data
+                futuro = Future()
+                API._requisicoes_em_andamento[cep_numerico] = futuro
+
+        if not responsavel:
+            return futuro.result()
+
+        try:
+            data = API._requisitar_viacep(cep_numerico)
+            cache.gravar(cep_numerico, data)
+            futuro.set_result(data)
+            return data
+        except Exception as e:
+            futuro.set_exception(e)
+            raise
+        finally:
+            with API._trava_requisicoes:
+                del API._requisicoes_em_andamento[cep_numerico]
 
     @staticmethod
     def buscar_endereco_por_cep(cep: str, numero: str) -> str:
         """
         Consulta o endereço completo a partir de um CEP e número do imóvel,
-        utilizando a API pública ViaCEP. Usa cache local para evitar múltiplas chamadas repetidas.
+        utilizando o índice offline (se configurado) ou a API pública ViaCEP.
+        O cache persistente é consultado antes de qualquer chamada de rede,
+        inclusive para CEPs já conhecidos como inexistentes.
         """
         Validar.cep(cep)
         Validar.numero_endereco(numero)
 
         cep_numerico = ''.join(filter(str.isdigit, cep))  # Apenas os dígitos
 
-        if cep_numerico in API._cache_cep:
-            data = API._cache_cep[cep_numerico]
-        else:
-            url = f"https://viacep.com.br/ws/{cep_numerico}/json/"
-            response = requests.get(url)
-
-            if response.status_code != 200:
-                raise ValueError("Erro ao buscar o endereço. Tente novamente mais tarde.")
-
-            data = response.json()
-            if "erro" in data:
-                raise ValueError("CEP não encontrado. Verifique se está digitado corretamente.")
+        data = API._consultar_cep(cep_numerico)
 
-            API._cache_cep[cep_numerico] = data  # Armazena no cache
+        if data is None:
+            raise ValueError("CEP não encontrado. Verifique se está digitado corretamente.")
 
         logradouro = data["logradouro"]
         bairro     = data["bairro"]
@@ -41,3 +188,26 @@ class API():
         uf         = data["uf"]
 
         return f"{logradouro}, {numero} - {bairro}, {localidade} - {uf}, {cep_numerico}"
+
+    @staticmethod
+    def buscar_enderecos(pares: list[tuple[str, str]]) -> list[str | None]:
+        """
+        Consulta vários endereços em paralelo.
+
+        Args:
+            pares (list[tuple[str, str]]): Lista de (cep, número do imóvel).
+
+        Returns:
+            list[str | None]: Endereços na mesma ordem da entrada; None para CEPs
+            inválidos, inexistentes ou que não puderam ser consultados.
+        """
+        def buscar(par: tuple[str, str]) -> str | None:
+            cep, numero = par
+            try:
+                return API.buscar_endereco_por_cep(cep, numero)
+            except ValueError as e:
+                logger.warning(f"Falha ao consultar o CEP {cep}: {e}")
+                return None
+
+        with ThreadPoolExecutor(max_workers=CONEXOES_CEP_SIMULTANEAS) as executor:
+            return list(executor.map(buscar, pares))
@@ -0,0 +1,120 @@
+import json
+import sqlite3
+import threading
+import time
+from typing import Callable, Optional
+
+
+class CacheCep:
+    """
+    Cache persistente de consultas de CEP, armazenado em um arquivo SQLite.
+
+    Características:
+        - Validade (TTL) configurável, com TTL próprio para respostas negativas
+          ("CEP não encontrado"), que também são guardadas.
+        - Tamanho máximo: ao ultrapassá-lo, os CEPs acessados há mais tempo são removidos (LRU).
+        - Contadores de acertos e falhas para acompanhamento.
+    """
+
+    def __init__(
+        self,
+        caminho: str,
+        ttl_segundos: float,
+        ttl_negativo_segundos: float,
+        tamanho_maximo: int,
+        relogio: Callable[[], float] = time.time
+    ) -> None:
+        """
+        Abre (ou cria) o arquivo de cache.
+
+        Args:
+            caminho (str): Caminho do arquivo SQLite.
+            ttl_segundos (float): Validade de um endereço encontrado.
+            ttl_negativo_segundos (float): Validade de uma resposta "CEP não encontrado".
+            tamanho_maximo (int): Quantidade máxima de CEPs guardados.
+            relogio (Callable, opcional): Fonte de tempo em segundos. Padrão: time.time.
+        """
+        self.ttl_segundos = ttl_segundos
+        self.ttl_negativo_segundos = ttl_negativo_segundos
+        self.tamanho_maximo = tamanho_maximo
+        self._relogio = relogio
+
+        self.acertos = 0
+        self.acertos_negativos = 0
+        self.falhas = 0
+
+        self._trava = threading.Lock()
+        self._conexao = sqlite3.connect(caminho, check_same_thread=False)
+        with self._conexao:
+            self._conexao.execute(
+                "CREATE TABLE IF NOT EXISTS cep ("
+                "cep TEXT PRIMARY KEY, dados TEXT, gravado_em REAL NOT NULL, acessado_em REAL NOT NULL)"
+            )
+            self._conexao.execute("CREATE INDEX IF NOT EXISTS idx_cep_acesso ON cep (acessado_em)")
+
+    def obter(self, cep: str) -> tuple[bool, Optional[dict]]:
+        """
+        Consulta o cache.
+
+        Returns:
+            tuple: (presente, dados). Se presente for True e dados for None,
+            o CEP está guardado como inexistente.
+        """
+        agora = self._relogio()
+        with self._trava:
+            linha = self._conexao.execute(
+                "SELECT dados, gravado_em FROM cep WHERE cep = ?", (cep,)
+            ).fetchone()
+
+            if linha is not None:
+                dados, gravado_em = linha
+                ttl = self.ttl_segundos if dados is not None else self.ttl_negativo_segundos
+                if agora - gravado_em < ttl:
+                    with self._conexao:
+                        self._conexao.execute("UPDATE cep SET acessado_em = ? WHERE cep = ?", (agora, cep))
+                    if dados is None:
+                        self.acertos_negativos += 1
+                        return True, None
+                    self.acertos += 1
+                    return True, json.loads(dados)
+
+            self.falhas += 1
+            return False, None
+
+    def gravar(self, cep: str, dados: Optional[dict]) -> None:
+        """
+        Guarda o resultado de uma consulta. Use dados=None para CEP inexistente.
+        """
+        agora = self._relogio()
+        conteudo = json.dumps(dados, ensure_ascii=False) if dados is not None else None
+        with self._trava, self._conexao:
+            self._conexao.execute(
+                "INSERT OR REPLACE INTO cep (cep, dados, gravado_em, acessado_em) VALUES (?, ?, ?, ?)",
+                (cep, conteudo, agora, agora)
+            )
+            excedente = self._conexao.execute("SELECT COUNT(*) FROM cep").fetchone()[0] - self.tamanho_maximo
+            if excedente > 0:
+                self._conexao.execute(
+                    "DELETE FROM cep WHERE cep IN (SELECT cep FROM cep ORDER BY acessado_em LIMIT ?)",
+                    (excedente,)
+                )
+
+    def estatisticas(self) -> dict:
+        """
+        Retorna os contadores de uso do cache.
+        """
+        with self._trava:
+            tamanho = self._conexao.execute("SELECT COUNT(*) FROM cep").fetchone()[0]
+        return {
+            "acertos": self.acertos,
+            "acertos_negativos": self.acertos_negativos,
+            "falhas": self.falhas,
+            "tamanho": tamanho
+        }
+
+    def fechar(self) -> None:
+        """
+        Fecha o arquivo de cache.
+        """
+        with self._trava:
+            self._conexao.close()
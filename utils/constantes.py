@@ -7,11 +7,69 @@ LIMITE_TRANSFERENCIA_CPOUPANCA = 1000.0
 RENDIMENTO_MENSAL_CPOUPANCA    = 0.005
 TAXA_MANUTENCAO_CCORRENTE      = 10.0
 TAMANHO_MIN_NUMERO_CONTA       = 4       # Exemplo: 1034 (str) OK, 103 (str) ERRADO!
+TAMANHO_PAGINA_EXTRATO         = 10      # Transações por página do extrato
 
 # Nomes de arquivo para a classe DAO
+DIRETORIO_DATABASE = "database"
 ARQUIVO_CONTAS   = "contas.json"
 ARQUIVO_CLIENTES = "clientes.json"
 ARQUIVO_PESSOAS  = "pessoas.json"
+ARQUIVO_SQLITE   = "banco.sqlite3"   # Usado apenas com MOTOR_SQLITE
+ARQUIVO_INDICE_CONTAS_CLIENTES = "indice_contas_clientes.json"  # numero_conta -> numero_documento
+DIRETORIO_TRAVAS_CONTAS = "travas_contas"  # Um arquivo de trava (flock) por conta
+DIRETORIO_LEDGERS = "ledgers"  # Histórico das contas: um ledger append-only por conta
+OPERACOES_POR_CHECKPOINT_SALDO = 1000  # Operações entre checkpoints de saldo no ledger (além de um por dia)
+
+# Motores de armazenamento para a classe DAO
+MOTOR_JSON    = "json"      # Regrava o arquivo inteiro a cada escrita
+MOTOR_JOURNAL = "journal"   # Snapshot + journal append-only
+MOTOR_SQLITE  = "sqlite"    # Uma tabela por arquivo em ARQUIVO_SQLITE
+MOTOR_ARMAZENAMENTO = MOTOR_JOURNAL
+LIMITE_COMPACTACAO_JOURNAL = 1000   # Entradas no journal antes de gerar novo snapshot
+
+# Durabilidade das escritas dos motores (no SQLite, define o PRAGMA synchronous)
+DURABILIDADE_NENHUMA = "nenhuma"  # Sem fsync: uma queda de energia pode perder as últimas escritas
+DURABILIDADE_FSYNC   = "fsync"    # Cada escrita é sincronizada com o disco antes de ser confirmada
+DURABILIDADE_GRUPO   = "grupo"    # Escritas simultâneas são agrupadas em uma gravação e um fsync
+DURABILIDADE = DURABILIDADE_FSYNC
+JANELA_GRAVACAO_EM_GRUPO = 0.005  # Segundos que a primeira escrita espera pelas demais do grupo
+
+# Concorrência otimista: novas tentativas de uma transferência em conflito de versão
+TENTATIVAS_CONFLITO_VERSAO    = 8
+ESPERA_CONFLITO_VERSAO_BASE   = 0.005   # Segundos; dobra a cada tentativa (com sorteio)
+ESPERA_CONFLITO_VERSAO_MAXIMA = 0.2     # Teto da espera entre tentativas
+
+# Atualização mensal em lote: contas por gravação (cada uma mantém seu ledger travado)
+TAMANHO_LOTE_ATUALIZACAO_MENSAL = 500
+
+# Projeção de saldos: memória máxima do bloco de contas em cálculo (bytes)
+MEMORIA_MAXIMA_PROJECAO = 256 * 2 ** 20
+
+# Pagamentos em lote: arquivos CSV de transferências (entrada e resultado por linha)
+SEPARADOR_CSV_PAGAMENTOS = ";"
+COLUNAS_CSV_PAGAMENTOS   = ("documento", "conta", "valor", "descricao")  # Descrição opcional
+
+# Exportação de extratos
+FORMATO_EXPORTACAO_CSV = "csv"
+FORMATO_EXPORTACAO_OFX = "ofx"
+TRANSACOES_POR_BLOCO_EXPORTACAO = 1000  # Transações por trecho de texto gerado
+CODIGO_BANCO_OFX = "000"                # BANKID informado nos arquivos OFX
+
+# Consulta de CEP (ViaCEP) e cache persistente
+URL_VIACEP               = "https://viacep.com.br/ws/{cep}/json/"
+ARQUIVO_CACHE_CEP        = "cache_cep.sqlite3"
+TTL_CACHE_CEP            = 30 * 24 * 3600   # Endereços encontrados: 30 dias (em segundos)
+TTL_CACHE_CEP_NEGATIVO   = 24 * 3600        # "CEP não encontrado": 1 dia
+TAMANHO_MAXIMO_CACHE_CEP = 50000            # CEPs guardados antes de descartar os menos usados
+TIMEOUT_CEP_CONEXAO      = 3.05             # Segundos para abrir a conexão com a ViaCEP
+TIMEOUT_CEP_LEITURA      = 5.0              # Segundos aguardando a resposta
+CONEXOES_CEP_SIMULTANEAS = 8                # Conexões mantidas no pool / consultas paralelas em lote
+
+# Origem dos endereços: "http" (ViaCEP) ou "offline" (índice local, com ViaCEP se o CEP faltar)
+BACKEND_CEP_HTTP    = "http"
+BACKEND_CEP_OFFLINE = "offline"
+BACKEND_CEP         = BACKEND_CEP_HTTP
+ARQUIVO_INDICE_CEP  = "ceps.idx"   # Gerado por ferramentas/construir_indice_cep.py
 
 # Nome de tipos 
 TIPO_CCORRENTE = "corrente"
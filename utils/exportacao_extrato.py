@@ -0,0 +1,160 @@
+import csv
+import io
+import time
+from itertools import islice
+from typing import Iterable, Iterator, Optional
+from xml.sax.saxutils import escape
+from model.transacao import FORMATO_DATA_HORA, TipoOperacao, Transacao
+from utils.constantes import CODIGO_BANCO_OFX, TRANSACOES_POR_BLOCO_EXPORTACAO
+
+# Tipo da transação no OFX (TRNTYPE), por tipo de operação
+_TIPOS_OFX = {
+    TipoOperacao.TRANSFERENCIA_ENVIADA: "DEBIT",
+    TipoOperacao.TRANSFERENCIA_RECEBIDA: "CREDIT",
+    TipoOperacao.TAXA_MANUTENCAO: "FEE",
+    TipoOperacao.RENDIMENTO: "INT",
+}
+
+_CABECALHO_OFX = (
+    "OFXHEADER:100\n"
+    "DATA:OFXSGML\n"
+    "VERSION:102\n"
+    "SECURITY:NONE\n"
+    "ENCODING:UTF-8\n"
+    "CHARSET:NONE\n"
+    "COMPRESSION:NONE\n"
+    "OLDFILEUID:NONE\n"
+    "NEWFILEUID:NONE\n"
+    "\n"
+)
+
+
+class ExportadorExtrato:
+    """
+    Geradores de extrato em CSV e OFX a partir de um iterável de transações.
+
+    O texto é produzido em trechos de até `tamanho_bloco` transações, à medida que as
+    transações são consumidas: a memória usada não depende do tamanho do histórico.
+    As transações chegam como (número da operação, Transacao), como em
+    ContaDAO.iterar_transacoes; o número identifica a transação no OFX (FITID).
+    """
+
+    COLUNAS_CSV = ("data", "tipo", "valor", "contraparte", "descricao")
+
+    @staticmethod
+    def gerar_csv(
+        transacoes: Iterable[tuple[int, Transacao]],
+        tamanho_bloco: int = TRANSACOES_POR_BLOCO_EXPORTACAO
+    ) -> Iterator[str]:
+        """
+        Gera o extrato em CSV (separado por ";", com cabeçalho), uma linha por
+        transação, com o valor com sinal (negativo nas saídas).
+        """
+        buffer = io.StringIO()
+        escritor = csv.writer(buffer, delimiter=";", lineterminator="\n")
+        escritor.writerow(ExportadorExtrato.COLUNAS_CSV)
+
+        transacoes = iter(transacoes)
+        while True:
+            bloco = list(islice(transacoes, tamanho_bloco))
+            for _, transacao in bloco:
+                escritor.writerow((
+                    time.strftime(FORMATO_DATA_HORA, time.localtime(transacao.momento)) if transacao.momento else "",
+                    transacao.tipo.name.lower(),
+                    f"{transacao.efeito_centavos / 100:.2f}",
+                    transacao.contraparte or "",
+                    transacao.descricao
+                ))
+            if buffer.tell():
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+            if len(bloco) < tamanho_bloco:
+                return
+
+    @staticmethod
+    def gerar_ofx(
+        numero_conta: str,
+        poupanca: bool,
+        transacoes: Iterable[tuple[int, Transacao]],
+        inicio: int,
+        fim: int,
+        saldo_final: float,
+        tamanho_bloco: int = TRANSACOES_POR_BLOCO_EXPORTACAO
+    ) -> Iterator[str]:
+        """
+        Gera o extrato em OFX 1.0.2 (SGML), com o saldo ao fim do período (LEDGERBAL).
+
+        Só as operações que movimentam o saldo entram no OFX; encerramentos e
+        registros antigos em texto livre ficam de fora.
+
+        Args:
+            numero_conta (str): Número da conta (ACCTID).
+            poupanca (bool): Se a conta é poupança (ACCTTYPE SAVINGS) ou corrente (CHECKING).
+            transacoes (Iterable): (número da operação, Transacao), em ordem.
+            inicio (int): Início do período (DTSTART), em segundos desde a época Unix.
+            fim (int): Fim do período (DTEND e data do saldo).
+            saldo_final (float): Saldo da conta ao fim do período.
+            tamanho_bloco (int): Transações por trecho gerado.
+        """
+        yield (
+            f"{_CABECALHO_OFX}<OFX>\n"
+            "<SIGNONMSGSRSV1><SONRS>\n"
+            "<STATUS><CODE>0<SEVERITY>INFO</STATUS>\n"
+            f"<DTSERVER>{_data_ofx(fim)}\n"
+            "<LANGUAGE>POR\n"
+            "</SONRS></SIGNONMSGSRSV1>\n"
+            "<BANKMSGSRSV1><STMTTRNRS>\n"
+            "<TRNUID>1\n"
+            "<STATUS><CODE>0<SEVERITY>INFO</STATUS>\n"
+            "<STMTRS>\n"
+            "<CURDEF>BRL\n"
+            f"<BANKACCTFROM><BANKID>{CODIGO_BANCO_OFX}<ACCTID>{escape(str(numero_conta))}"
+            f"<ACCTTYPE>{'SAVINGS' if poupanca else 'CHECKING'}</BANKACCTFROM>\n"
+            "<BANKTRANLIST>\n"
+            f"<DTSTART>{_data_ofx(inicio)}\n"
+            f"<DTEND>{_data_ofx(fim)}\n"
+        )
+
+        transacoes = iter(transacoes)
+        while True:
+            bloco = list(islice(transacoes, tamanho_bloco))
+            partes = [
+                _transacao_ofx(numero_conta, operacao, transacao)
+                for operacao, transacao in bloco if transacao.efeito_centavos
+            ]
+            if partes:
+                yield "".join(partes)
+            if len(bloco) < tamanho_bloco:
+                break
+
+        yield (
+            "</BANKTRANLIST>\n"
+            f"<LEDGERBAL><BALAMT>{saldo_final:.2f}<DTASOF>{_data_ofx(fim)}</LEDGERBAL>\n"
+            "</STMTRS>\n"
+            "</STMTTRNRS></BANKMSGSRSV1>\n"
+            "</OFX>\n"
+        )
+
+
+def _data_ofx(momento: Optional[int]) -> str:
+    """
+    Formata um momento como data OFX (AAAAMMDDHHMMSS, no horário local).
+    """
+    return time.strftime("%Y%m%d%H%M%S", time.localtime(momento or 0))
+
+
+def _transacao_ofx(numero_conta: str, operacao: int, transacao: Transacao) -> str:
+    """
+    Formata uma transação como STMTTRN, identificada pela conta e o número da operação.
+    """
+    memo = transacao.descricao or transacao.texto()
+    return (
+        "<STMTTRN>"
+        f"<TRNTYPE>{_TIPOS_OFX.get(transacao.tipo, 'OTHER')}"
+        f"<DTPOSTED>{_data_ofx(transacao.momento)}"
+        f"<TRNAMT>{transacao.efeito_centavos / 100:.2f}"
+        f"<FITID>{numero_conta}-{operacao}"
+        f"<MEMO>{escape(memo)}"
+        "</STMTTRN>\n"
+    )
@@ -0,0 +1,154 @@
+import csv
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from typing import Optional
+
+CAMPOS_ENDERECO = ("logradouro", "bairro", "localidade", "uf")
+_MAGICO = b"CEPIDX1\0"
+_CABECALHO = struct.Struct("<8sI")  # mágico, quantidade de CEPs
+_SEPARADOR = "\x1f"
+
+
+class IndiceCepOffline:
+    """
+    Índice local de CEPs, consultado sem acesso à rede.
+
+    O arquivo é binário e mapeado em memória (mmap):
+        - cabeçalho: identificador do formato e quantidade N de CEPs
+        - N CEPs como inteiros de 32 bits, em ordem crescente (busca binária)
+        - N + 1 deslocamentos de 32 bits para o bloco de textos
+        - bloco de textos UTF-8: "logradouro␟bairro␟localidade␟uf" por CEP
+
+    Todos os inteiros são little-endian. Gerado por IndiceCepOffline.construir
+    (ver ferramentas/construir_indice_cep.py).
+    """
+
+    def __init__(self, caminho: str) -> None:
+        """
+        Abre o índice em modo somente leitura.
+
+        Raises:
+            FileNotFoundError: Se o arquivo não existir.
+            ValueError: Se o arquivo não estiver no formato esperado.
+        """
+        self.caminho = caminho
+        with open(caminho, "rb") as f:
+            tamanho = os.fstat(f.fileno()).st_size
+            if tamanho < _CABECALHO.size:
+                raise ValueError(f"Arquivo de índice de CEP vazio ou truncado: {caminho}")
+            self._mapa = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magico, quantidade = _CABECALHO.unpack_from(self._mapa, 0)
+        if magico != _MAGICO:
+            self._mapa.close()
+            raise ValueError(f"Arquivo de índice de CEP inválido: {caminho}")
+
+        inicio_ceps = _CABECALHO.size
+        inicio_deslocamentos = inicio_ceps + 4 * quantidade
+        self._inicio_textos = inicio_deslocamentos + 4 * (quantidade + 1)
+        if tamanho < self._inicio_textos:
+            self._mapa.close()
+            raise ValueError(
+                f"Arquivo de índice de CEP truncado: {caminho} ({tamanho} bytes para {quantidade} CEPs)"
+            )
+
+        self._visao = memoryview(self._mapa)
+        self._ceps = self._inteiros(self._visao[inicio_ceps:inicio_deslocamentos])
+        self._deslocamentos = self._inteiros(self._visao[inicio_deslocamentos:self._inicio_textos])
+        if self._inicio_textos + self._deslocamentos[-1] > tamanho:
+            self.fechar()
+            raise ValueError(f"Arquivo de índice de CEP truncado: {caminho} (bloco de textos incompleto)")
+
+    @staticmethod
+    def _inteiros(visao: memoryview):
+        """
+        Interpreta um trecho do arquivo como sequência de uint32.
+        Em máquinas big-endian, copia e inverte os bytes.
+        """
+        if sys.byteorder == "little":
+            return visao.cast("I")
+        valores = array("I", visao.tobytes())
+        valores.byteswap()
+        return valores
+
+    def __len__(self) -> int:
+        return len(self._ceps)
+
+    def buscar(self, cep: str) -> Optional[dict]:
+        """
+        Retorna os dados do CEP (mesmas chaves da ViaCEP), ou None se ele não estiver no índice.
+
+        Args:
+            cep (str): CEP com 8 dígitos, sem formatação.
+        """
+        alvo = int(cep)
+        posicao = bisect_left(self._ceps, alvo)
+        if posicao == len(self._ceps) or self._ceps[posicao] != alvo:
+            return None
+
+        inicio = self._inicio_textos + self._deslocamentos[posicao]
+        fim = self._inicio_textos + self._deslocamentos[posicao + 1]
+        valores = self._mapa[inicio:fim].decode("utf-8").split(_SEPARADOR)
+        return dict(zip(CAMPOS_ENDERECO, valores))
+
+    def fechar(self) -> None:
+        """
+        Libera o mapeamento do arquivo.
+        """
+        for visao in (self._ceps, self._deslocamentos, self._visao):
+            if isinstance(visao, memoryview):
+                visao.release()
+        self._mapa.close()
+
+    @staticmethod
+    def construir(caminho_csv: str, caminho_indice: str) -> int:
+        """
+        Gera o arquivo de índice a partir de um CSV com as colunas
+        cep, logradouro, bairro, localidade e uf. CEPs repetidos mantêm a última linha.
+
+        Returns:
+            int: Quantidade de CEPs no índice.
+
+        Raises:
+            ValueError: Se faltar alguma coluna ou algum CEP não tiver 8 dígitos.
+        """
+        registros = {}
+        with open(caminho_csv, newline="", encoding="utf-8") as f:
+            leitor = csv.DictReader(f)
+            faltantes = [c for c in ("cep",) + CAMPOS_ENDERECO if c not in (leitor.fieldnames or [])]
+            if faltantes:
+                raise ValueError(f"Colunas ausentes no CSV: {', '.join(faltantes)}")
+
+            for linha in leitor:
+                cep = "".join(filter(str.isdigit, linha["cep"]))
+                if len(cep) != 8:
+                    raise ValueError(f"CEP inválido na linha {leitor.line_num}: {linha['cep']}")
+                texto = _SEPARADOR.join(linha[c].replace(_SEPARADOR, " ") for c in CAMPOS_ENDERECO)
+                registros[int(cep)] = texto.encode("utf-8")
+
+        ceps = array("I", sorted(registros))
+        deslocamentos = array("I", [0])
+        textos = bytearray()
+        for cep in ceps:
+            textos += registros[cep]
+            deslocamentos.append(len(textos))
+
+        if sys.byteorder != "little":
+            ceps.byteswap()
+            deslocamentos.byteswap()
+
+        temporario = caminho_indice + ".tmp"
+        with open(temporario, "wb") as f:
+            f.write(_CABECALHO.pack(_MAGICO, len(ceps)))
+            f.write(ceps.tobytes())
+            f.write(deslocamentos.tobytes())
+            f.write(textos)
+            f.flush()
+            os.fsync(f.fileno())
+
+        os.replace(temporario, caminho_indice)
+        return len(ceps)
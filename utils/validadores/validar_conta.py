@@ -1,3 +1,4 @@
+from model.transacao import Transacao
 from utils.constantes import TAMANHO_MIN_NUMERO_CONTA
 
 class ValidarConta:
@@ -131,20 +132,20 @@ class ValidarConta:
     @staticmethod
     def _historico(historico: list) -> None:
         """
-        Valida se o histórico da conta é uma lista de strings.
+        Valida se o histórico da conta é uma lista de transações.
 
         Args:
             historico (list): Lista que representa o histórico a ser validado.
 
         Raises:
             TypeError: Se o histórico não for uma lista.
-            TypeError: Se algum item da lista não for uma string.
+            TypeError: Se algum item da lista não for uma Transacao.
         """
         if not isinstance(historico, list):
             raise TypeError("Histórico da conta deve ser uma lista.")
         for item in historico:
-            if not isinstance(item, str):
-                raise TypeError("Cada item do histórico da conta deve ser uma string.")
+            if not isinstance(item, Transacao):
+                raise TypeError("Cada item do histórico da conta deve ser uma Transacao.")
 
     @staticmethod
     def estado_da_conta(estado: bool) -> None:
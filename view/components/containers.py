@@ -1,5 +1,6 @@
 import flet as ft
 from controller.conta_controller import ContaController
+from model.transacao import TipoOperacao, Transacao
 
 
 class CartaoResumo(ft.Container):
@@ -51,37 +52,29 @@ class CartaoTransacao(ft.Container):
     Mostra descrição, e abaixo o nome, documento e número da conta envolvida.
     """
 
-    def __init__(self, texto_transacao: str):
+    def __init__(self, transacao: Transacao):
         super().__init__()
 
         self.padding = 10
-        self.bgcolor = self._cor_fundo(texto_transacao)
+        self.bgcolor = self._cor_fundo(transacao)
         self.border_radius = 8
 
-        numero_encontrado = self._extrair_numero_conta(texto_transacao)
+        numero_encontrado = transacao.contraparte
         cliente_info = ContaController.obter_info_destinatario(numero_encontrado) if numero_encontrado else "Conta não identificada"
 
-        self.content = ft.Column([
-            ft.Text(texto_transacao, size=13),
-            ft.Text(cliente_info, size=12, italic=True, color=ft.Colors.GREY)
-        ])
+        linhas = [ft.Text(transacao.formatar(), size=13)]
+        if transacao.descricao and transacao.tipo != TipoOperacao.OUTRA:
+            linhas.append(ft.Text(transacao.descricao, size=12))
+        linhas.append(ft.Text(cliente_info, size=12, italic=True, color=ft.Colors.GREY))
+        self.content = ft.Column(linhas)
 
-    def _extrair_numero_conta(self, texto: str) -> str:
+    def _cor_fundo(self, transacao: Transacao) -> str:
         """
-        Extrai o número da conta que aparece após 'conta ' no texto.
-        """
-        import re
-        match = re.search(r"conta (\d+)", texto)
-        return match.group(1) if match else None
-
-    def _cor_fundo(self, texto: str) -> str:
-        """
-        Retorna a cor de fundo baseada no conteúdo textual da transação.
+        Retorna a cor de fundo conforme o efeito da transação no saldo.
         Verde para recebimento, vermelho para envio, cinza padrão.
         """
-        texto = texto.lower()
-        if "recebida" in texto or "recebido" in texto or "entrada" in texto:
+        if transacao.efeito_centavos > 0:
             return ft.Colors.GREEN_100
-        if "enviada" in texto or "saída" in texto or "enviado" in texto or "transferência de" in texto:
+        if transacao.efeito_centavos < 0:
             return ft.Colors.RED_100
         return ft.Colors.GREY_100
@@ -1,7 +1,6 @@
 import flet as ft
 from view.components.mensagens import Notificador
-from dao.cliente_dao import ClienteDAO
-from dao.pessoa_dao import PessoaDAO
+from dao.registro_dao import RegistroDAO
 from view.components.identidade_visual import CORES, ESTILOS_TEXTO
 
 
@@ -113,8 +112,8 @@ class TelaEditarCliente:
             if nova_senha:
                 self.cliente.alterar_senha(senha_atual, nova_senha)
 
-            ClienteDAO().atualizar_objeto(self.cliente)
-            PessoaDAO().atualizar_objeto(self.cliente.pessoa)
+            RegistroDAO.clientes().atualizar_objeto(self.cliente)
+            RegistroDAO.pessoas().atualizar_objeto(self.cliente.pessoa)
 
             # Limpa os campos de senha após atualização
             self.senha_atual_field.current.value = ""
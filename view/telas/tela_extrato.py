@@ -1,5 +1,6 @@
 import flet as ft
 from controller.conta_controller import ContaController
+from model.transacao import TipoOperacao
 from view.components.mensagens import Notificador
 from view.components.containers import CartaoResumo, CartaoTransacao
 from view.components.identidade_visual import CORES, ESTILOS_TEXTO
@@ -10,16 +11,25 @@ class TelaExtrato:
     Tela responsável por exibir o extrato das contas ativas do cliente.
     """
 
+    TIPOS_EXIBIDOS = frozenset({TipoOperacao.TRANSFERENCIA_ENVIADA, TipoOperacao.TRANSFERENCIA_RECEBIDA})
+    MARGEM_CARREGAMENTO = 100  # Pixels do fim da lista em que a próxima página é carregada
+
     def __init__(self, cliente):
         self.cliente = cliente
         self.notificador = Notificador()
 
+        # Conta exibida e cursor da próxima página do extrato (None: não há mais)
+        self.numero_conta = None
+        self.cursor = None
+
         self.dropdown_ref = ft.Ref[ft.Dropdown]()
         self.lista_extrato = ft.Column(
             [],
             spacing=8,
             scroll=ft.ScrollMode.AUTO,
-            expand=True
+            expand=True,
+            on_scroll=self.carregar_ao_rolar,
+            on_scroll_interval=100
         )
 
         self.view = self.criar_view()
@@ -94,30 +104,25 @@ class TelaExtrato:
 
 
     def atualizar_extrato(self, e):
-        """Atualiza o extrato da conta selecionada."""
+        """Exibe a primeira página do extrato da conta selecionada."""
         numero = self.dropdown_ref.current.value
 
         if not numero:
             self.notificador.erro(e.page, "Selecione uma conta.")
             return
 
-        resultado, erro = ContaController.obter_extrato(numero)
+        resultado, erro = ContaController.obter_extrato_paginado(numero, tipos=self.TIPOS_EXIBIDOS)
 
         if erro:
             self.notificador.erro(e.page, erro)
             return
 
-        _, conta = resultado
-        historico = conta.get_historico()
+        _, transacoes, self.cursor = resultado
+        self.numero_conta = numero
 
         self.lista_extrato.controls.clear()
 
-        transacoes_validas = [
-            item for item in historico
-            if "Recebido" in item or "Transferência de" in item
-        ]
-
-        if not transacoes_validas:
+        if not transacoes:
             self.lista_extrato.controls.append(
                 ft.Text(
                     "Nenhuma transação encontrada.",
@@ -126,7 +131,27 @@ class TelaExtrato:
                 )
             )
         else:
-            for item in reversed(transacoes_validas[-10:]):
-                self.lista_extrato.controls.append(CartaoTransacao(item))
+            for transacao in transacoes:
+                self.lista_extrato.controls.append(CartaoTransacao(transacao))
+
+        e.page.update()
+
+    def carregar_ao_rolar(self, e: ft.OnScrollEvent):
+        """Acrescenta a próxima página do extrato quando a lista chega perto do fim."""
+        if self.cursor is None or e.pixels < e.max_scroll_extent - self.MARGEM_CARREGAMENTO:
+            return
+
+        resultado, erro = ContaController.obter_extrato_paginado(
+            self.numero_conta, cursor=self.cursor, tipos=self.TIPOS_EXIBIDOS
+        )
+
+        if erro:
+            self.cursor = None
+            self.notificador.erro(e.page, erro)
+            return
+
+        _, transacoes, self.cursor = resultado
+        for transacao in transacoes:
+            self.lista_extrato.controls.append(CartaoTransacao(transacao))
 
-        e.page.update()
\ No newline at end of file
+        e.page.update()